@@ -0,0 +1,221 @@
+"""속보 알림 (중요도가 높은 AI/양자 뉴스는 다이제스트를 기다리지 않고 바로 전송)
+
+자주 실행되는 가벼운 폴링으로 새 엔트리를 점수화하고, 기준 점수 이상이면 즉시 전송합니다.
+보낸 기사는 .state/alerted.json에 기록해 다시 보내지 않고, 정기 다이제스트에서도 제외합니다.
+다이제스트로 이미 나간 기사는 다이제스트 쪽 기록(.state/digested.json)에 남겨 뒤늦게 속보로 보내지 않습니다.
+(두 기록은 각자 한 워크플로만 저장하고, 다른 쪽은 읽기만 합니다)
+
+    python -m bot alerts                 # 한 번 폴링 (스케줄러용)
+    python -m bot alerts --loop          # 계속 실행 (기본 60초 간격)
+"""
+import json
+import os
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from config import (
+    STATE_DIR, NEWS_AI_KEYWORDS, NEWS_QUANTUM_KEYWORDS,
+    BREAKING_SCORE_THRESHOLD, BREAKING_MAX_AGE_HOURS, BREAKING_MAX_PER_POLL,
+    ALERT_LEDGER_TTL_DAYS, ALERT_POLL_INTERVAL,
+    print_message
+)
+from outbox import deliver, retry_pending
+
+ALERT_LEDGER_FILE = os.path.join(STATE_DIR, 'alerted.json')
+DIGEST_LEDGER_FILE = os.path.join(STATE_DIR, 'digested.json')
+
+# 기록 경로: 속보로 전송 / 첫 폴링 때 이미 있던 기사
+VIA_ALERT = 'alert'
+VIA_SEED = 'seed'
+
+
+def alert_key(news):
+    """같은 기사인지 판단하는 키 (AI/양자 양쪽에 매칭돼도 하나)"""
+    return news.link or news.title
+
+def _load_ledger(path):
+    """기록 {키: {'at': 기록 시각, ...}} (보존 기간이 지난 기록은 제외) - 파일이 없으면 None"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            ledger = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    cutoff = time.time() - ALERT_LEDGER_TTL_DAYS * 86400
+    return {key: record for key, record in ledger.items() if record['at'] >= cutoff}
+
+def _save_ledger(path, ledger):
+    try:
+        os.makedirs(STATE_DIR, exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(ledger, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"⚠️ 속보 기록 저장 실패: {e}")
+
+def load_alerted():
+    """이미 본 기사 {키: {'at': 기록 시각, 'via': 경로}} - 파일이 없으면 None"""
+    return _load_ledger(ALERT_LEDGER_FILE)
+
+def save_alerted(ledger):
+    """보낸 속보 기록 저장"""
+    _save_ledger(ALERT_LEDGER_FILE, ledger)
+
+def load_digested():
+    """다이제스트로 보낸 기사 {키: {'at': 기록 시각}} (없으면 빈 dict)"""
+    return _load_ledger(DIGEST_LEDGER_FILE) or {}
+
+def exclude_alerted(news_list):
+    """다이제스트용: 이미 속보로 보낸 뉴스 제외"""
+    ledger = load_alerted() or {}
+    return [news for news in news_list if ledger.get(alert_key(news), {}).get('via') != VIA_ALERT]
+
+def mark_digested(news_list):
+    """다이제스트로 보낸 뉴스 중 속보 기준을 넘는 것은 이후 속보로 다시 보내지 않도록 기록
+
+    속보 기록(alerted.json)은 속보 폴링만 저장하므로 다이제스트 쪽 기록 파일에 따로 남김
+    """
+    ledger = load_digested()
+    now = time.time()
+    for news in news_list:
+        if news.importance_score >= BREAKING_SCORE_THRESHOLD:
+            ledger.setdefault(alert_key(news), {'at': now})
+    _save_ledger(DIGEST_LEDGER_FILE, ledger)
+
+def _is_recent(published, now):
+    """발행 시각이 최근인지 (알 수 없는 형식이면 최근으로 간주)"""
+    try:
+        published_at = parsedate_to_datetime(published)
+    except (TypeError, ValueError):
+        return True
+    if published_at.tzinfo is None:
+        published_at = published_at.replace(tzinfo=timezone.utc)
+    return (now - published_at).total_seconds() <= BREAKING_MAX_AGE_HOURS * 3600
+
+def pick_breaking(news_list, ledger, now=None, digested=None):
+    """기준 점수 이상이고 아직 보내지 않은(속보·다이제스트 모두) 최근 뉴스 (기사별 하나, 점수 높은 순)"""
+    now = now or datetime.now(timezone.utc)
+    digested = digested or {}
+    candidates = {}
+    for news in news_list:
+        key = alert_key(news)
+        if news.importance_score < BREAKING_SCORE_THRESHOLD or key in ledger or key in digested:
+            continue
+        if not _is_recent(news.published, now):
+            continue
+        if key not in candidates or news.importance_score > candidates[key].importance_score:
+            candidates[key] = news
+    return sorted(candidates.values(), key=lambda x: x.importance_score, reverse=True)
+
+def create_breaking_message(news):
+    """속보 한 건 메시지"""
+    icon, label = ('⚛️', '양자') if news.category == 'Quantum' else ('🤖', 'AI')
+    message = f"🚨 <b>{label} 속보</b> {icon}\n\n"
+    message += f"<b>{news.title}</b>\n"
+    message += f"   📰 {news.source} | 🏷️ {', '.join(news.matched_keywords[:4])}\n"
+    if news.enhanced_summary and len(news.enhanced_summary) > 10:
+        message += f"   💡 {news.enhanced_summary}\n"
+    message += f"   🔗 <a href='{news.link}'>기사 보기</a>"
+    return message
+
+def _collect_candidates(feeds, circuits, skipped, snapshots):
+    """피드를 조용히 가져와 필터링 (내용이 그대로인 피드는 저장된 결과 사용)"""
+    from feed_fetcher import fetch_feed, UnchangedFeed
+    from news_bot import filter_news_by_keywords
+    from snapshot_store import save_results
+
+    categories = [("AI", NEWS_AI_KEYWORDS), ("Quantum", NEWS_QUANTUM_KEYWORDS)]
+    news_list = []
+    for site_name, feed_url, feed_categories in feeds:
+        try:
+            feed = fetch_feed(site_name, feed_url, circuits, skipped, snapshots, 'news')
+        except Exception as e:
+            skipped.append((site_name, str(e)))
+            continue
+        if feed is None:
+            continue
+
+        if isinstance(feed, UnchangedFeed):
+            results = feed.results
+        else:
+            results = []
+            for category, keywords in categories:
+                results.extend(filter_news_by_keywords(feed.entries, keywords, category, site_name))
+            save_results(snapshots, feed_url, 'news', feed.content_hash, results)
+
+        news_list.extend(news for news in results if news.category in feed_categories)
+    return news_list
+
+def poll_once(dry_run=False, feeds=None):
+    """한 번 폴링해서 새 속보 전송 - 보낸 개수 반환
+
+    기록 파일이 없는 첫 실행은 현재 피드의 기사를 모두 '본 것'으로만 기록 (밀린 기사 폭주 방지)
+    """
+    from feed_fetcher import load_circuits, save_circuits, print_skipped_feeds
+    from feed_registry import load_feeds, NEWS_CATEGORIES
+    from snapshot_store import open_snapshot_store, prune_snapshots
+
+    send = print_message if dry_run else deliver
+    if feeds is None:
+        feeds = load_feeds(NEWS_CATEGORIES)
+
+    ledger = load_alerted()
+    first_run = ledger is None
+    ledger = ledger or {}
+
+    circuits = load_circuits()
+    skipped = []
+    snapshots = open_snapshot_store()
+    try:
+        news_list = _collect_candidates(feeds, circuits, skipped, snapshots)
+        prune_snapshots(snapshots)
+    finally:
+        snapshots.close()
+    save_circuits(circuits)
+
+    breaking = pick_breaking(news_list, ledger, digested=load_digested())
+    now = time.time()
+
+    if first_run:
+        for news in news_list:
+            ledger[alert_key(news)] = {'at': now, 'via': VIA_SEED}
+        save_alerted(ledger)
+        print(f"🔔 속보 기록 초기화: 기존 기사 {len(ledger)}개를 보낸 것으로 표시 (기준 점수 이상 {len(breaking)}개)")
+        return 0
+
+    sent = 0
+    for news in breaking[:BREAKING_MAX_PER_POLL]:
+        if send(create_breaking_message(news), key=f"alert:{alert_key(news)}"):
+            ledger[alert_key(news)] = {'at': now, 'via': VIA_ALERT}
+            sent += 1
+            print(f"🚨 속보 전송: [{news.category}] {news.title[:50]} (점수 {news.importance_score})")
+        else:
+            print(f"❌ 속보 전송 실패: {news.title[:50]}")
+
+    # 실패했거나 한도를 넘은 속보는 기록하지 않아 다음 폴링에서 다시 시도
+    save_alerted(ledger)
+    waiting = len(breaking) - sent
+    print(f"🔔 {datetime.now().strftime('%H:%M:%S')} 폴링: 뉴스 {len(news_list)}개, "
+          f"속보 {sent}개 전송" + (f", 대기 {waiting}개" if waiting else ""))
+    print_skipped_feeds(skipped)
+    return sent
+
+def run(loop=False, interval=None, dry_run=False):
+    """속보 폴링 (loop면 interval초마다 계속)"""
+    interval = interval or ALERT_POLL_INTERVAL
+    while True:
+        started = time.monotonic()
+        try:
+            if loop and not dry_run:
+                retry_pending()  # 전송 장애가 풀렸으면 밀린 속보부터
+            poll_once(dry_run)
+        except Exception as e:
+            print(f"❌ 속보 폴링 오류: {e}")
+            if not loop:
+                raise
+
+        if not loop:
+            return
+        time.sleep(max(0, interval - (time.monotonic() - started)))
@@ -0,0 +1,200 @@
+"""기사 페이지 보강 (피드 요약이 비었거나 한 줄뿐인 뉴스의 요약을 기사 첫 문단으로 교체)
+
+다이제스트에 실리는 뉴스(사이트별 균형 배분 후)만 대상으로 하므로 실행당 몇 페이지만 가져옵니다.
+동시 요청 수(ENRICH_WORKERS)와 같은 사이트 요청 간격(ENRICH_HOST_DELAY)을 제한하고,
+추출한 첫 문단은 URL별로 .state/article_cache.json에 ENRICH_CACHE_TTL_DAYS일 동안 보관합니다.
+"""
+import html
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from urllib.parse import urlparse
+
+from config import (
+    STATE_DIR, FEED_USER_AGENT, FEED_CONNECT_TIMEOUT, FEED_READ_TIMEOUT,
+    ENRICH_CACHE_PATH, ENRICH_CACHE_TTL_DAYS, ENRICH_WORKERS, ENRICH_HOST_DELAY,
+    ENRICH_MAX_BYTES, ENRICH_DEADLINE, ENRICH_MIN_SUMMARY
+)
+
+# clean_and_enhance_summary가 쓸 만한 문장을 못 찾았을 때의 안내문 끝부분
+FALLBACK_SUFFIX = ' 관련 뉴스입니다.'
+
+_PARAGRAPH = re.compile(r'<p\b[^>]*>(.*?)</p\s*>', re.IGNORECASE | re.DOTALL)
+_ARTICLE = re.compile(r'<article\b[^>]*>(.*?)(?:</article\s*>|$)', re.IGNORECASE | re.DOTALL)
+_NOISE = re.compile(r'<(script|style|noscript|nav|header|footer|figure)\b.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+_META_DESCRIPTION = [
+    re.compile(rf'<meta\b[^>]*?(?:property|name)=["\']{name}["\'][^>]*?content=["\']([^"\']*)["\']', re.IGNORECASE)
+    for name in ('og:description', 'twitter:description', 'description')
+] + [
+    re.compile(rf'<meta\b[^>]*?content=["\']([^"\']*)["\'][^>]*?(?:property|name)=["\']{name}["\']', re.IGNORECASE)
+    for name in ('og:description', 'twitter:description', 'description')
+]
+
+# 같은 사이트 요청 간격을 지키기 위한 사이트별 다음 요청 가능 시각 (time.monotonic 기준)
+_host_next_slot = {}
+_host_guard = threading.Lock()
+
+
+def needs_enrichment(news):
+    """피드 요약이 없거나 너무 짧아 키워드 안내문/짧은 문장으로 대체된 뉴스인지"""
+    summary = news.enhanced_summary or ''
+    return news.link.startswith(('http://', 'https://')) and (
+        summary.endswith(FALLBACK_SUFFIX) or len(summary) < ENRICH_MIN_SUMMARY
+    )
+
+def load_cache():
+    """URL별 추출 결과 {URL: {'lead': 첫 문단, 'at': 시각}} (보존 기간이 지난 항목 제외)"""
+    try:
+        with open(ENRICH_CACHE_PATH, encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    cutoff = time.time() - ENRICH_CACHE_TTL_DAYS * 86400
+    return {url: record for url, record in cache.items() if record['at'] >= cutoff}
+
+def save_cache(cache):
+    try:
+        os.makedirs(STATE_DIR, exist_ok=True)
+        tmp_path = ENRICH_CACHE_PATH + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False)
+        os.replace(tmp_path, ENRICH_CACHE_PATH)
+    except OSError as e:
+        print(f"⚠️ 기사 캐시 저장 실패: {e}")
+
+def _clean_text(fragment):
+    text = html.unescape(re.sub(r'<[^>]+>', ' ', fragment))
+    return re.sub(r'\s+', ' ', text).strip()
+
+def _first_paragraph(fragment):
+    """80자 이상인 첫 문단 (메뉴/캡션 같은 짧은 문단은 건너뜀)"""
+    for paragraph in _PARAGRAPH.findall(fragment):
+        text = _clean_text(paragraph)
+        if len(text) >= 80:
+            return text[:600]
+    return ''
+
+def extract_lead(page):
+    """기사 HTML → 첫 문단 (본문 <article>의 첫 문단 → 메타 설명 → 페이지의 첫 문단 순, 없으면 '')"""
+    page = _NOISE.sub(' ', page)
+
+    article = _ARTICLE.search(page)
+    lead = _first_paragraph(article.group(1)) if article else ''
+    if lead:
+        return lead
+
+    for pattern in _META_DESCRIPTION:
+        match = pattern.search(page)
+        if match and len(_clean_text(match.group(1))) >= ENRICH_MIN_SUMMARY:
+            return _clean_text(match.group(1))[:600]
+
+    return _first_paragraph(page)
+
+def _reserve_slot(url):
+    """이 사이트에 요청해도 되는 시각을 예약 (잠금은 계산에만 쓰고 대기는 잠금 밖에서)"""
+    host = urlparse(url).netloc.lower()
+    with _host_guard:
+        start_at = max(time.monotonic(), _host_next_slot.get(host, 0))
+        _host_next_slot[host] = start_at + ENRICH_HOST_DELAY
+    return start_at
+
+def fetch_lead(url, deadline):
+    """기사 페이지 앞부분(ENRICH_MAX_BYTES)만 받아 첫 문단 추출 - 마감(deadline)까지 못 가져오면 None
+
+    요청 타임아웃도 남은 시간 안으로 줄여서 마감 뒤에 오래 남아 있지 않게 함
+    """
+    import requests
+
+    start_at = _reserve_slot(url)
+    if start_at >= deadline:
+        return None
+    time.sleep(max(0, start_at - time.monotonic()))
+
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        return None
+    try:
+        with requests.get(
+            url,
+            headers={'User-Agent': FEED_USER_AGENT, 'Accept': 'text/html'},
+            timeout=(min(FEED_CONNECT_TIMEOUT, remaining), min(FEED_READ_TIMEOUT, remaining)),
+            stream=True
+        ) as response:
+            if response.status_code != 200:
+                return None
+            content_type = response.headers.get('Content-Type', 'text/html')
+            if 'html' not in content_type:
+                return ''
+            # charset이 없으면 requests는 ISO-8859-1로 보므로 직접 판단 (기본 UTF-8)
+            charset = re.search(r'charset=["\']?([\w-]+)', content_type)
+            encoding = charset.group(1) if charset else 'utf-8'
+
+            chunks = []
+            size = 0
+            for chunk in response.iter_content(chunk_size=16384):
+                if time.monotonic() > deadline:
+                    return None
+                chunks.append(chunk)
+                size += len(chunk)
+                if size >= ENRICH_MAX_BYTES:
+                    break
+    except requests.RequestException:
+        return None
+
+    body = b''.join(chunks)[:ENRICH_MAX_BYTES]
+    try:
+        page = body.decode(encoding, errors='replace')
+    except LookupError:
+        page = body.decode('utf-8', errors='replace')
+    return extract_lead(page)
+
+def enrich_news(news_list, timeout=None):
+    """요약이 빈약한 뉴스의 요약을 기사 첫 문단에서 다시 뽑아 교체 (제자리 수정) - 교체한 수 반환
+
+    timeout(기본 ENRICH_DEADLINE)초 안에 못 가져온 기사는 원래 요약을 그대로 사용.
+    남은 시간이 없으면 페이지는 가져오지 않고 캐시만 적용
+    """
+    from news_bot import clean_and_enhance_summary
+
+    targets = [news for news in news_list if needs_enrichment(news)]
+    if not targets:
+        return 0
+
+    cache = load_cache()
+    missing = sorted({news.link for news in targets if news.link not in cache})
+    timeout = ENRICH_DEADLINE if timeout is None else min(timeout, ENRICH_DEADLINE)
+    fetched = 0
+    if missing and timeout > 0:
+        started = time.monotonic()
+        deadline = started + timeout
+        executor = ThreadPoolExecutor(max_workers=ENRICH_WORKERS, thread_name_prefix='article')
+        futures = {executor.submit(fetch_lead, url, deadline): url for url in missing}
+        done, not_done = wait(futures, timeout=timeout)
+        # 진행 중인 요청도 타임아웃이 마감 안으로 줄어 있으므로 곧 끝남 - 백그라운드에 남기지 않음
+        executor.shutdown(wait=True, cancel_futures=True)
+
+        for future in done:
+            lead = None if future.exception() else future.result()
+            if lead is not None:
+                # 첫 문단이 없는 페이지('')도 캐시해서 다시 가져오지 않음
+                cache[futures[future]] = {'lead': lead, 'at': time.time()}
+                fetched += 1
+        print(f"   📄 기사 페이지 {fetched}/{len(missing)}개 확인 ({time.monotonic() - started:.1f}초"
+              + (f", 마감으로 {len(not_done)}개 생략" if not_done else "") + ")")
+        save_cache(cache)
+
+    enriched = 0
+    for news in targets:
+        lead = cache.get(news.link, {}).get('lead')
+        if not lead:
+            continue
+        summary = clean_and_enhance_summary({'title': news.title, 'summary': lead}, news.matched_keywords)
+        if not summary.endswith(FALLBACK_SUFFIX):
+            news.enhanced_summary = summary
+            enriched += 1
+    if enriched:
+        print(f"   📄 기사 첫 문단으로 요약 보강: {enriched}/{len(targets)}개")
+    return enriched
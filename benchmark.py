@@ -0,0 +1,232 @@
+"""뉴스봇 성능 측정 스크립트 (합성 데이터 사용, 네트워크 없음)
+
+사용법:
+    python benchmark.py memory --items 100000
+    python benchmark.py parallel --entries 50000 --workers 1,2,4
+    python benchmark.py eps-stats --tickers 5000 --quarters 40
+"""
+import argparse
+import gc
+import os
+import random
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+from config import NEWS_AI_KEYWORDS, NEWS_QUANTUM_KEYWORDS
+
+SOURCE_NAMES = [
+    'TechCrunch', 'Yahoo Finance', 'Ars Technica', 'IEEE Spectrum', 'MIT Technology Review',
+    'Physics World', 'Science Daily Quantum', 'Quantum Computing Report', 'Nature News', 'Phys.org Quantum'
+]
+
+FILLER_WORDS = [
+    'researchers', 'announced', 'new', 'system', 'today', 'company', 'results', 'model',
+    'industry', 'report', 'team', 'faster', 'energy', 'market', 'scientists', 'device'
+]
+
+
+def make_synthetic_entries(count, seed=42):
+    """피드 파서 결과와 비슷한 합성 엔트리 생성 (HTML 요약 포함)"""
+    rng = random.Random(seed)
+    keywords = NEWS_AI_KEYWORDS + NEWS_QUANTUM_KEYWORDS
+
+    for i in range(count):
+        picked = rng.sample(keywords, rng.randint(1, 3))
+        words = rng.choices(FILLER_WORDS, k=40)
+        body = ' '.join(words[:20]) + f" {picked[0]} " + ' '.join(words[20:])
+        yield SimpleNamespace(
+            title=f"{picked[0].title()} {' '.join(words[:6])} #{i}",
+            link=f"https://example.com/news/{i}",
+            published=f"Mon, {1 + i % 28:02d} Sep 2026 {i % 24:02d}:00:00 GMT",
+            summary=f"<p><strong>{' '.join(picked)}</strong> {body}. <a href='https://example.com/{i}'>More</a></p>",
+            # 이전 news_bot처럼 피드 목록의 출처 문자열 객체를 아이템끼리 공유
+            source=SOURCE_NAMES[i % len(SOURCE_NAMES)]
+        )
+
+def _build_legacy_items(entries):
+    """이전 방식 (엔트리마다 dict, 원본 HTML 요약 보관 - 카테고리/출처 문자열은 이전 코드처럼 공유)"""
+    from news_bot import clean_and_enhance_summary
+
+    items = []
+    for entry in entries:
+        for keywords, category in ((NEWS_AI_KEYWORDS, 'AI'), (NEWS_QUANTUM_KEYWORDS, 'Quantum')):
+            full_text = f"{entry.title} {entry.summary}"
+            matched = [kw for kw in keywords if kw.lower() in full_text.lower()]
+            if not matched:
+                continue
+            items.append({
+                'title': entry.title,
+                'link': entry.link,
+                'published': entry.published,
+                'summary': entry.summary,
+                'enhanced_summary': clean_and_enhance_summary(
+                    {'title': entry.title, 'summary': entry.summary}, matched
+                ),
+                'matched_keywords': matched,
+                'category': category,
+                'source': entry.source,
+                'importance_score': len(matched)
+            })
+    return items
+
+def _build_slotted_items(entries):
+    """현재 방식 (NewsItem, 원본 HTML 제거, 키워드 ID)"""
+    from news_bot import filter_news_by_keywords
+
+    items = []
+    for entry in entries:
+        items.extend(filter_news_by_keywords([entry], NEWS_AI_KEYWORDS, 'AI', entry.source))
+        items.extend(filter_news_by_keywords([entry], NEWS_QUANTUM_KEYWORDS, 'Quantum', entry.source))
+    return items
+
+def _measure(builder, count):
+    """빌더가 만든 아이템 목록이 계속 점유하는 메모리 측정 (엔트리는 생성 즉시 버려짐)"""
+    gc.collect()
+    tracemalloc.start()
+    items = builder(make_synthetic_entries(count))
+    gc.collect()
+    retained, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(items), retained
+
+def bench_memory(args):
+    print(f"🧪 아이템 메모리 비교 (엔트리 {args.items:,}개)")
+    results = {}
+    for name, builder in (('dict (이전)', _build_legacy_items), ('NewsItem', _build_slotted_items)):
+        count, retained = _measure(builder, args.items)
+        results[name] = retained
+        print(f"   {name:12s}: 아이템 {count:,}개, {retained / 1024 / 1024:8.1f} MB "
+              f"({retained / max(count, 1):.0f} B/아이템)")
+
+    legacy, slotted = results['dict (이전)'], results['NewsItem']
+    print(f"   📉 절감: {(legacy - slotted) / 1024 / 1024:.1f} MB ({(1 - slotted / legacy) * 100:.0f}%)")
+
+def _synthetic_feeds(entry_count, feed_count):
+    """합성 엔트리를 피드 여러 개로 나눈 [(출처, 엔트리들)]"""
+    entries = list(make_synthetic_entries(entry_count))
+    per_feed = -(-entry_count // feed_count)
+    return [
+        (f"Feed {i}", entries[i * per_feed:(i + 1) * per_feed])
+        for i in range(feed_count)
+    ]
+
+def bench_parallel(args):
+    from parallel_filter import filter_news_feeds
+
+    feeds = _synthetic_feeds(args.entries, args.feeds)
+    categories = [('AI', NEWS_AI_KEYWORDS), ('Quantum', NEWS_QUANTUM_KEYWORDS)]
+    worker_counts = [int(w) for w in args.workers.split(',')]
+    print(f"🧪 병렬 필터링 (엔트리 {args.entries:,}개, 피드 {args.feeds}개, CPU {os.cpu_count()}개)")
+
+    baseline_time = None
+    baseline_result = None
+    for workers in worker_counts:
+        started = time.perf_counter()
+        result = filter_news_feeds(feeds, categories, workers)
+        elapsed = time.perf_counter() - started
+
+        # 워커 수와 관계없이 결과와 순서가 같아야 함
+        flattened = [
+            (item.source, item.category, item.title, item.keyword_ids, item.enhanced_summary)
+            for by_category in result for news_list in by_category.values() for item in news_list
+        ]
+        if baseline_result is None:
+            baseline_time, baseline_result = elapsed, flattened
+        same = "동일" if flattened == baseline_result else "❌ 결과 다름"
+
+        print(f"   워커 {workers:2d}: {elapsed:6.2f}초 | 속도 {baseline_time / elapsed:4.2f}배 "
+              f"| 아이템 {len(flattened):,}개 ({same})")
+
+def _loop_eps_stats(rows, trend_quarters):
+    """비교용: 행 단위 파이썬 반복으로 계산한 티커별 (분기 수, 상회 비율, 평균 서프라이즈, 추세)"""
+    by_ticker = {}
+    for ticker, date, estimated, actual in rows:
+        by_ticker.setdefault(ticker, []).append((date, (actual - estimated) / abs(estimated) * 100, actual > estimated))
+
+    stats = {}
+    for ticker, reports in by_ticker.items():
+        reports.sort()
+        recent = [surprise for _date, surprise, _beat in reports[-trend_quarters:]]
+        n = len(recent)
+        mean_x, mean_y = (n - 1) / 2, sum(recent) / n
+        denominator = sum((x - mean_x) ** 2 for x in range(n))
+        trend = sum((x - mean_x) * (y - mean_y) for x, y in enumerate(recent)) / denominator if denominator else 0.0
+        stats[ticker] = (
+            len(reports),
+            sum(beat for _date, _surprise, beat in reports) / len(reports),
+            sum(surprise for _date, surprise, _beat in reports) / len(reports),
+            trend
+        )
+    return stats
+
+def bench_eps_stats(args):
+    import numpy as np
+    from config import EPS_TREND_QUARTERS
+    from eps_history import stats_from_columns
+
+    rng = np.random.default_rng(42)
+    rows = args.tickers * args.quarters
+    ticker = np.repeat(np.arange(args.tickers, dtype='int32'), args.quarters)
+    date = np.tile(20150101 + np.arange(args.quarters, dtype='int32') * 300, args.tickers)
+    order = rng.permutation(rows)  # 실제 기록처럼 티커가 섞인 순서
+    eps_estimated = rng.uniform(0.5, 3.0, rows)
+    eps_actual = eps_estimated * rng.normal(1.02, 0.05, rows)
+    columns = {
+        'ticker': ticker[order],
+        'date': date[order],
+        'eps_estimated': eps_estimated[order],
+        'eps_actual': eps_actual[order],
+        'revenue_estimated': eps_estimated[order] * 1e9,
+        'revenue_actual': eps_actual[order] * 1e9,
+    }
+    tickers = [f"T{i}" for i in range(args.tickers)]
+    print(f"🧪 EPS 통계 (티커 {args.tickers:,}개 × {args.quarters}분기 = {rows:,}행)")
+
+    started = time.perf_counter()
+    vectorized = stats_from_columns(np, columns, tickers)
+    vectorized_time = time.perf_counter() - started
+
+    row_tuples = list(zip(
+        columns['ticker'].tolist(), columns['date'].tolist(),
+        columns['eps_estimated'].tolist(), columns['eps_actual'].tolist()
+    ))
+    started = time.perf_counter()
+    looped = _loop_eps_stats(row_tuples, EPS_TREND_QUARTERS)
+    loop_time = time.perf_counter() - started
+
+    same = all(
+        np.allclose(
+            [vectorized[tickers[i]][key] for key in ('quarters', 'beat_rate', 'avg_surprise', 'trend')],
+            looped[i]
+        )
+        for i in looped
+    )
+    print(f"   파이썬 반복: {loop_time * 1000:8.1f}ms")
+    print(f"   배열 연산:   {vectorized_time * 1000:8.1f}ms | 속도 {loop_time / vectorized_time:.1f}배 "
+          f"({'결과 동일' if same else '❌ 결과 다름'})")
+
+def main():
+    parser = argparse.ArgumentParser(description="뉴스봇 성능 측정")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    memory = subparsers.add_parser('memory', help="아이템 표현 방식별 메모리 사용량")
+    memory.add_argument('--items', type=int, default=100_000)
+    memory.set_defaults(func=bench_memory)
+
+    parallel = subparsers.add_parser('parallel', help="워커 수별 필터링 처리 시간")
+    parallel.add_argument('--entries', type=int, default=50_000)
+    parallel.add_argument('--feeds', type=int, default=1000)
+    parallel.add_argument('--workers', default='1,2,4')
+    parallel.set_defaults(func=bench_parallel)
+
+    eps_stats = subparsers.add_parser('eps-stats', help="티커별 EPS 통계: 배열 연산 vs 파이썬 반복")
+    eps_stats.add_argument('--tickers', type=int, default=5000)
+    eps_stats.add_argument('--quarters', type=int, default=40)
+    eps_stats.set_defaults(func=bench_eps_stats)
+
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
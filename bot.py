@@ -0,0 +1,443 @@
+"""뉴스봇/실적봇 통합 실행 진입점
+
+사용법:
+    python -m bot news                  # AI/양자 뉴스 다이제스트 전송
+    python -m bot earnings              # 실적 요약 전송
+    python -m bot upcoming              # 이번 주 실적 발표 예정 전송
+    python -m bot dry-run [news|earnings|upcoming]   # 수집/렌더링만 하고 출력
+    python -m bot render-only items.json            # 저장된 수집 결과로 메시지만 렌더링
+    python -m bot startup-check         # 서브커맨드별 시작 시간 예산 확인
+
+  속보 알림 (기준 점수 이상인 새 기사를 바로 전송, 다이제스트에서는 제외):
+    python -m bot alerts                # 한 번 폴링 (스케줄러에서 자주 실행)
+    python -m bot alerts --loop --interval 60   # 상주 실행
+
+  실적 발표 워치 (캘린더의 bmo/amc 시간대에만 해당 티커를 자주 확인):
+    python -m bot earnings-watch [--loop]
+
+  티커별 EPS/매출 기록 (실적 캘린더 조회 때마다 자동 누적):
+    python -m bot eps-history stats [AAPL MSFT ...] [--top 20]
+    python -m bot eps-history backfill --days 365   # 지난 발표를 캘린더 API로 채우기
+
+  전송 대기함 (실패한 메시지는 다음 실행 시작 때 자동 재전송):
+    python -m bot outbox [--flush]
+
+  여러 워커/노드로 나눠 수집하기 (피드는 일관된 해싱으로 샤드에 배정):
+    python -m bot collect news --shard 0/4 --output shard0.json   # 워커마다 실행
+    python -m bot merge news shard0.json shard1.json ...          # 하나의 다이제스트로 전송
+
+  피드 레지스트리 관리:
+    python -m bot registry list [--category AI] [--shard 0/4]
+    python -m bot registry import-opml feeds.opml [--category Quantum]
+    python -m bot registry export-opml feeds.opml
+    python -m bot registry shards 4     # 샤드별 피드 수와 샤드 추가 시 이동 비율
+
+  저장된 피드 원본으로 과거 다이제스트 재구성 (전송 없음):
+    python -m bot replay ARCHIVE_DIR --since 2026-01-01 --until 2026-03-31 --output replay_out/
+    python -m bot replay --since 2026-09-01      # 디렉터리 없이: 실행마다 쌓인 스냅샷 저장소 사용
+
+서브커맨드가 필요로 하는 모듈만 그때 불러오므로, 짧은 실행에서
+사용하지 않는 requests/feedparser 로딩 비용을 내지 않습니다.
+"""
+import argparse
+import os
+import sys
+import time
+
+# 서브커맨드별로 실제 실행에 필요한 모듈 (startup-check가 이 범위만 로드되는지 측정)
+COMMAND_IMPORTS = {
+    'news': ['news_bot', 'requests', 'feedparser'],
+    'earnings': ['earnings_bot', 'requests', 'feedparser'],
+    'upcoming': ['earnings_bot', 'requests'],
+    'dry-run': ['news_bot', 'earnings_bot', 'requests', 'feedparser'],
+    'render-only': ['news_bot', 'earnings_bot'],
+    'collect': ['news_bot', 'earnings_bot', 'requests', 'feedparser'],
+    'merge': ['news_bot', 'earnings_bot', 'requests'],
+    'registry': ['feed_registry'],
+    'replay': ['replay', 'news_bot', 'earnings_bot', 'feedparser'],
+    'alerts': ['alerts', 'news_bot', 'requests', 'feedparser'],
+    'earnings-watch': ['earnings_watch', 'earnings_bot', 'requests', 'feedparser'],
+    'outbox': ['outbox'],
+    'eps-history': ['eps_history', 'earnings_bot', 'numpy', 'requests'],
+}
+
+# 필요하지 않은 서브커맨드에서 로드되면 안 되는 무거운 모듈
+HEAVY_MODULES = ['requests', 'feedparser', 'numpy']
+
+
+def run_news(args):
+    import news_bot
+    news_bot.main(items_path=args.save_items, workers=args.workers)
+
+def run_earnings(args):
+    import earnings_bot
+    earnings_bot.main(items_path=args.save_items, workers=args.workers)
+
+def run_upcoming(args, dry_run=False):
+    import earnings_bot
+    from config import print_message
+    from outbox import deliver
+
+    send = print_message if dry_run else deliver
+    if send(earnings_bot.get_upcoming_earnings()):
+        print("✅ 실적 발표 예정 전송 완료!")
+    else:
+        print("❌ 전송 실패")
+
+def run_dry_run(args):
+    if args.target == 'news':
+        import news_bot
+        news_bot.main(dry_run=True, items_path=args.save_items, workers=args.workers)
+    elif args.target == 'earnings':
+        import earnings_bot
+        earnings_bot.main(dry_run=True, items_path=args.save_items, workers=args.workers)
+    else:
+        run_upcoming(args, dry_run=True)
+
+def run_render_only(args):
+    """저장된 수집 결과로 메시지만 렌더링 (네트워크 사용 안 함)"""
+    from items import load_items, NewsItem
+    from config import print_message
+
+    items = load_items(args.items)
+    news_list = [item for item in items if isinstance(item, NewsItem)]
+    earnings_list = [item for item in items if not isinstance(item, NewsItem)]
+    print(f"📂 {args.items}: 뉴스 {len(news_list)}개, 실적 뉴스 {len(earnings_list)}개")
+
+    if news_list:
+        import news_bot
+        for message in news_bot.create_news_summary(news_list):
+            if message:
+                print_message(message)
+
+    if earnings_list:
+        import earnings_bot
+        print_message(earnings_bot.create_earnings_summary(earnings_list, max_news=5))
+
+def parse_shard(text):
+    """'i/N' → (i, N)"""
+    try:
+        index, count = (int(part) for part in text.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError("샤드는 '번호/전체' 형식이어야 합니다 (예: 0/4)")
+    if not 0 <= index < count:
+        raise argparse.ArgumentTypeError(f"샤드 번호는 0 ~ {count - 1} 사이여야 합니다")
+    return index, count
+
+def run_collect(args):
+    """이 워커가 맡은 샤드의 피드만 수집해서 저장 (전송하지 않음)"""
+    from items import save_items
+    from feed_registry import load_feeds, NEWS_CATEGORIES, EARNINGS
+
+    shard_text = f"샤드 {args.shard[0]}/{args.shard[1]}" if args.shard else "전체"
+    if args.target == 'news':
+        import news_bot
+        feeds = load_feeds(NEWS_CATEGORIES, args.shard)
+        print(f"🧩 {shard_text}: 뉴스 피드 {len(feeds)}개")
+        items = news_bot.collect_filtered_news(args.workers, feeds)
+    else:
+        import earnings_bot
+        feeds = load_feeds([EARNINGS], args.shard)
+        print(f"🧩 {shard_text}: 실적 피드 {len(feeds)}개")
+        items = earnings_bot.collect_earnings_news(args.workers, feeds)
+
+    save_items(args.output, items)
+    print(f"💾 {len(items)}개 저장: {args.output}")
+
+def run_merge(args):
+    """워커별 수집 결과를 합쳐 하나의 다이제스트로 전송"""
+    from items import load_items
+
+    merged = []
+    seen = set()
+    for path in args.files:
+        for item in load_items(path):
+            # 같은 파일을 두 번 넘긴 경우 등 중복 제거 (피드는 샤드 하나에만 속함)
+            key = (getattr(item, 'category', ''), item.source, item.link or item.title)
+            if key not in seen:
+                seen.add(key)
+                merged.append(item)
+    print(f"🧩 {len(args.files)}개 샤드 결과 병합: {len(merged)}개")
+
+    if args.target == 'news':
+        import news_bot
+        news_bot.main(dry_run=args.dry_run, news_list=merged)
+    else:
+        import earnings_bot
+        earnings_bot.main(dry_run=args.dry_run, earnings_list=merged)
+
+def run_registry(args):
+    import feed_registry
+
+    conn = feed_registry.open_registry()
+    try:
+        if args.action == 'list':
+            feeds = feed_registry.list_feeds(conn, args.category, args.shard)
+            for name, url, categories in feeds:
+                print(f"   [{', '.join(categories)}] {name} - {url}")
+            print(f"📚 피드 {len(feeds)}개")
+
+        elif args.action == 'add':
+            feed_registry.add_feed(conn, args.name, args.url, args.category or feed_registry.NEWS_CATEGORIES)
+            conn.commit()
+            print(f"✅ 추가: {args.name}")
+
+        elif args.action == 'remove':
+            print("✅ 삭제 완료" if feed_registry.remove_feed(conn, args.url) else "❌ 등록되지 않은 피드")
+
+        elif args.action == 'import-opml':
+            added, skipped = feed_registry.import_opml(conn, args.path, args.category or ())
+            print(f"📥 OPML 가져오기: {added}개 추가, {skipped}개 건너뜀 (카테고리 없음)")
+
+        elif args.action == 'export-opml':
+            count = feed_registry.export_opml(conn, args.path)
+            print(f"📤 OPML 내보내기: {count}개 → {args.path}")
+
+        elif args.action == 'shards':
+            urls = [url for _name, url, _categories in feed_registry.list_feeds(conn)]
+            before = [feed_registry.shard_for(url, args.count) for url in urls]
+            after = [feed_registry.shard_for(url, args.count + 1) for url in urls]
+            for shard in range(args.count):
+                print(f"   샤드 {shard}: {before.count(shard)}개")
+            moved = sum(1 for old, new in zip(before, after) if old != new)
+            print(f"🔀 샤드 {args.count} → {args.count + 1}개: {moved}/{len(urls)}개 이동 "
+                  f"({moved / max(len(urls), 1) * 100:.1f}%, 이상적 {100 / (args.count + 1):.1f}%)")
+    finally:
+        conn.close()
+
+def parse_date(text):
+    from datetime import datetime
+    try:
+        return datetime.strptime(text, '%Y-%m-%d').date()
+    except ValueError:
+        raise argparse.ArgumentTypeError("날짜는 YYYY-MM-DD 형식이어야 합니다")
+
+def run_replay(args):
+    """아카이브(또는 스냅샷 저장소)의 피드 원본을 날짜별로 재생해 다이제스트/통계 생성"""
+    import replay
+
+    if args.archive:
+        days = replay.iter_archive(args.archive, args.since, args.until)
+    else:
+        from snapshot_store import iter_store
+        days = iter_store(args.since, args.until)
+    replay.replay(days, args.output, args.workers)
+
+def run_alerts(args):
+    """속보 폴링 (한 번 또는 --loop로 계속)"""
+    import alerts
+    alerts.run(loop=args.loop, interval=args.interval, dry_run=args.dry_run)
+
+def run_earnings_watch(args):
+    """실적 발표 시간대에 맞춘 워치 (한 번 또는 --loop로 계속)"""
+    import earnings_watch
+    earnings_watch.run(loop=args.loop, dry_run=args.dry_run)
+
+def run_outbox(args):
+    """전송 대기함 상태 출력 (--flush면 바로 전송)"""
+    import outbox
+
+    if args.flush:
+        sent_count, failed, remaining = outbox.flush()
+        print(f"📮 {sent_count}개 전송, {failed}개 실패, {remaining}개 남음")
+
+    for message in outbox.pending_messages():
+        created = time.strftime('%m/%d %H:%M', time.localtime(message['created_at']))
+        print(f"   ⏳ {created} | 시도 {message['attempts']}회 | {message['text'][:50]!r}")
+    dead = os.listdir(outbox.DEAD_DIR) if os.path.isdir(outbox.DEAD_DIR) else []
+    print(f"📮 대기 {len(outbox.pending_messages())}개, 포기 {len(dead)}개 ({outbox.DEAD_DIR})")
+
+def run_eps_history(args):
+    """티커별 과거 실적 통계 출력 / 캘린더 API로 과거 발표 채우기"""
+    import eps_history
+
+    if args.action == 'backfill':
+        from datetime import datetime, timedelta
+        import earnings_bot
+
+        # 캘린더 API는 긴 기간을 한 번에 주지 않으므로 30일씩 나눠 조회
+        today = datetime.now().date()
+        for offset in range(args.days, 0, -30):
+            earnings_bot.get_real_earnings_calendar(
+                start=today - timedelta(days=offset), days=min(30, offset), record=True
+            )
+            time.sleep(1)
+
+    stats = eps_history.compute_stats()
+    if not stats:
+        print("📭 기록된 실적이 없습니다 (numpy가 없거나 아직 캘린더를 조회하지 않음)")
+        return
+
+    tickers = args.tickers or sorted(stats, key=lambda t: stats[t]['quarters'], reverse=True)[:args.top]
+    for ticker in tickers:
+        print(f"   {ticker:6s} {eps_history.format_history(stats.get(ticker)) or '기록 없음'}")
+    print(f"📊 기록된 티커 {len(stats)}개")
+
+def _measure_startup(command, runs):
+    """새 인터프리터에서 서브커맨드 모듈을 불러오는 시간(ms, runs회 중 최솟값)과 로드된 무거운 모듈
+
+    디스크 캐시/스케줄링 때문에 튀는 측정값이 예산 판정에 섞이지 않도록 가장 빠른 값을 사용
+    """
+    import json
+    import subprocess
+
+    code = (
+        "import importlib, json, sys\n"
+        "import bot\n"
+        "missing = []\n"
+        f"for name in {COMMAND_IMPORTS[command]!r}:\n"
+        "    try:\n"
+        "        importlib.import_module(name)\n"
+        "    except ImportError:\n"
+        "        missing.append(name)\n"
+        f"heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "print(json.dumps({'missing': missing, 'heavy': heavy}))\n"
+    )
+
+    timings = []
+    report = {}
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True)
+        timings.append((time.perf_counter() - started) * 1000)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1])
+        report = json.loads(result.stdout.strip().splitlines()[-1])
+
+    return min(timings), report
+
+def run_startup_check(args):
+    """서브커맨드별 콜드 스타트 시간을 측정하고 예산과 비교"""
+    from config import STARTUP_BUDGET_MS
+
+    print(f"⏱️ 시작 시간 예산 확인 ({args.runs}회 측정 중 최솟값)")
+    failed = []
+
+    for command in COMMAND_IMPORTS:
+        budget = STARTUP_BUDGET_MS[command]
+        elapsed, report = _measure_startup(command, args.runs)
+
+        # 필요 목록에 없는 무거운 모듈이 로드됐다면 어딘가에서 즉시 import하고 있는 것
+        unexpected = [m for m in report['heavy'] if m not in COMMAND_IMPORTS[command]]
+        ok = elapsed <= budget and not unexpected
+        print(f"   {'✅' if ok else '❌'} {command:12s} {elapsed:7.1f}ms / 예산 {budget}ms"
+              + (f" | 불필요한 로드: {', '.join(unexpected)}" if unexpected else "")
+              + (f" | 설치 안 됨: {', '.join(report['missing'])}" if report['missing'] else ""))
+        if not ok:
+            failed.append(command)
+
+    if failed:
+        print(f"❌ 예산 초과: {', '.join(failed)}")
+        return 1
+    print("✅ 모든 서브커맨드가 예산 이내입니다.")
+    return 0
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m bot', description="AI/양자 뉴스봇 · 실적봇")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    news = subparsers.add_parser('news', help="AI/양자 뉴스 다이제스트 전송")
+    news.add_argument('--save-items', metavar='PATH', help="수집 결과를 JSON으로 저장")
+    news.add_argument('--workers', type=int, help="필터링 프로세스 수 (0: CPU 코어 수, 기본: BOT_WORKERS)")
+    news.set_defaults(func=run_news, sends=True)
+
+    earnings = subparsers.add_parser('earnings', help="실적 요약 전송")
+    earnings.add_argument('--save-items', metavar='PATH', help="수집 결과를 JSON으로 저장")
+    earnings.add_argument('--workers', type=int, help="필터링 프로세스 수 (0: CPU 코어 수, 기본: BOT_WORKERS)")
+    earnings.set_defaults(func=run_earnings, sends=True)
+
+    upcoming = subparsers.add_parser('upcoming', help="이번 주 실적 발표 예정 전송")
+    upcoming.set_defaults(func=run_upcoming, sends=True)
+
+    dry_run = subparsers.add_parser('dry-run', help="수집/렌더링만 하고 전송 대신 출력")
+    dry_run.add_argument('target', nargs='?', default='news', choices=['news', 'earnings', 'upcoming'])
+    dry_run.add_argument('--save-items', metavar='PATH', help="수집 결과를 JSON으로 저장")
+    dry_run.add_argument('--workers', type=int, help="필터링 프로세스 수 (0: CPU 코어 수, 기본: BOT_WORKERS)")
+    dry_run.set_defaults(func=run_dry_run)
+
+    render_only = subparsers.add_parser('render-only', help="저장된 수집 결과로 메시지만 렌더링")
+    render_only.add_argument('items', help="--save-items로 저장한 JSON 파일")
+    render_only.set_defaults(func=run_render_only)
+
+    collect = subparsers.add_parser('collect', help="샤드 하나를 수집해서 JSON으로 저장 (전송 안 함)")
+    collect.add_argument('target', choices=['news', 'earnings'])
+    collect.add_argument('--shard', type=parse_shard, help="담당 샤드 (예: 0/4)")
+    collect.add_argument('--output', required=True, metavar='PATH')
+    collect.add_argument('--workers', type=int, help="필터링 프로세스 수 (0: CPU 코어 수, 기본: BOT_WORKERS)")
+    collect.set_defaults(func=run_collect)
+
+    merge = subparsers.add_parser('merge', help="샤드별 수집 결과를 합쳐 하나의 다이제스트로 전송")
+    merge.add_argument('target', choices=['news', 'earnings'])
+    merge.add_argument('files', nargs='+', metavar='PATH')
+    merge.add_argument('--dry-run', action='store_true', help="전송 대신 출력")
+    merge.set_defaults(func=run_merge, sends=True)
+
+    registry = subparsers.add_parser('registry', help="피드 레지스트리 관리")
+    registry_actions = registry.add_subparsers(dest='action', required=True)
+    registry_list = registry_actions.add_parser('list')
+    registry_list.add_argument('--category', action='append')
+    registry_list.add_argument('--shard', type=parse_shard)
+    registry_add = registry_actions.add_parser('add')
+    registry_add.add_argument('name')
+    registry_add.add_argument('url')
+    registry_add.add_argument('--category', action='append', help="여러 번 지정 가능 (기본: AI, Quantum)")
+    registry_remove = registry_actions.add_parser('remove')
+    registry_remove.add_argument('url')
+    registry_import = registry_actions.add_parser('import-opml')
+    registry_import.add_argument('path')
+    registry_import.add_argument('--category', action='append', help="카테고리를 추론할 수 없는 피드의 기본값")
+    registry_export = registry_actions.add_parser('export-opml')
+    registry_export.add_argument('path')
+    registry_shards = registry_actions.add_parser('shards')
+    registry_shards.add_argument('count', type=int)
+    registry.set_defaults(func=run_registry)
+
+    replay_parser = subparsers.add_parser('replay', help="저장된 피드 원본으로 과거 다이제스트 재구성")
+    replay_parser.add_argument('archive', nargs='?',
+                               help="<YYYY-MM-DD>/<출처>/<HHMMSS>.xml[.gz] 구조의 디렉터리 (생략하면 스냅샷 저장소)")
+    replay_parser.add_argument('--since', type=parse_date)
+    replay_parser.add_argument('--until', type=parse_date)
+    replay_parser.add_argument('--output', metavar='DIR', help="일별 다이제스트와 stats.json 저장 위치")
+    replay_parser.add_argument('--workers', type=int, help="필터링 프로세스 수 (0: CPU 코어 수, 기본: BOT_WORKERS)")
+    replay_parser.set_defaults(func=run_replay)
+
+    alerts_parser = subparsers.add_parser('alerts', help="중요도가 높은 새 뉴스를 속보로 바로 전송")
+    alerts_parser.add_argument('--loop', action='store_true', help="종료하지 않고 계속 폴링")
+    alerts_parser.add_argument('--interval', type=int, help="--loop 폴링 간격 (초, 기본: ALERT_POLL_INTERVAL)")
+    alerts_parser.add_argument('--dry-run', action='store_true', help="전송 대신 출력")
+    alerts_parser.set_defaults(func=run_alerts, sends=True)
+
+    watch = subparsers.add_parser('earnings-watch', help="실적 발표 시간대에 해당 티커를 자주 확인해 바로 전송")
+    watch.add_argument('--loop', action='store_true', help="종료하지 않고 계속 확인")
+    watch.add_argument('--dry-run', action='store_true', help="전송 대신 출력")
+    watch.set_defaults(func=run_earnings_watch, sends=True)
+
+    eps_parser = subparsers.add_parser('eps-history', help="티커별 EPS/매출 예상치 대비 실적 통계")
+    eps_parser.add_argument('action', choices=['stats', 'backfill'])
+    eps_parser.add_argument('tickers', nargs='*', help="stats: 볼 티커 (기본: 기록이 많은 순)")
+    eps_parser.add_argument('--top', type=int, default=20)
+    eps_parser.add_argument('--days', type=int, default=365, help="backfill: 며칠 전부터 채울지")
+    eps_parser.set_defaults(func=run_eps_history)
+
+    outbox_parser = subparsers.add_parser('outbox', help="전송 대기함 상태 확인/재전송")
+    outbox_parser.add_argument('--flush', action='store_true', help="대기 중인 메시지 바로 전송")
+    outbox_parser.set_defaults(func=run_outbox)
+
+    startup_check = subparsers.add_parser('startup-check', help="서브커맨드별 시작 시간 예산 확인")
+    startup_check.add_argument('--runs', type=int, default=5)
+    startup_check.set_defaults(func=run_startup_check)
+
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    # 전송하는 서브커맨드는 이전 실행에서 못 보낸 메시지부터 처리
+    if getattr(args, 'sends', False) and not getattr(args, 'dry_run', False):
+        import outbox
+        outbox.drain()
+
+    return args.func(args) or 0
+
+if __name__ == "__main__":
+    sys.exit(main())
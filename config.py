@@ -68,11 +68,117 @@ EARNINGS_KEYWORDS = [
     'annual report', '10-K', '10-Q', 'SEC filing', 'conference call'
 ]
 
+# 피드 수집 설정 (공통)
+STATE_DIR = os.getenv('BOT_STATE_DIR', '.state')  # 실행 간 유지되는 상태 파일 위치
+FEED_USER_AGENT = 'Mozilla/5.0 (compatible; TelegramNewsBot/3.2)'
+FEED_CONNECT_TIMEOUT = 5     # 연결 타임아웃 (초)
+FEED_READ_TIMEOUT = 10       # 소켓 읽기 타임아웃 (초)
+FEED_TOTAL_TIMEOUT = 20      # 피드 하나의 전체 다운로드 제한 (초)
+FEED_SLOW_THRESHOLD = 8      # 이보다 느리면 '응답 지연'으로 실패 처리 (초)
+FEED_MAX_BYTES = 2 * 1024 * 1024  # 피드 하나에서 읽을 최대 크기 (압축 해제 후, 넘으면 그때까지 받은 엔트리만 사용)
+FEED_MAX_ENTRIES = 60        # 이만큼 엔트리를 읽으면 나머지는 받지 않음 (피드는 최신순)
+
+# 피드 원본 스냅샷 저장소 (내용이 같으면 파싱 생략, replay 입력)
+SNAPSHOT_DIR = os.path.join(STATE_DIR, 'snapshots')
+SNAPSHOT_RETENTION_DAYS = 30
+SNAPSHOT_MAX_BYTES = 100 * 1024 * 1024  # gzip 압축 후 기준
+
+# 기사 페이지 보강 (다이제스트에 실리는 뉴스 중 요약이 빈약한 것만 기사 첫 문단으로 보완)
+ENRICH_ARTICLES = os.getenv('BOT_ENRICH_ARTICLES', '0') == '1'  # 기본은 끔 (BOT_ENRICH_ARTICLES=1로 켬)
+ENRICH_CACHE_PATH = os.path.join(STATE_DIR, 'article_cache.json')
+ENRICH_CACHE_TTL_DAYS = 7
+ENRICH_WORKERS = 4              # 동시에 가져올 기사 페이지 수
+ENRICH_HOST_DELAY = 1.0         # 같은 사이트에 연달아 요청할 때 최소 간격 (초)
+ENRICH_MAX_BYTES = 256 * 1024   # 기사 페이지에서 읽을 최대 크기 (첫 문단은 앞쪽에 있음)
+ENRICH_DEADLINE = 15            # 보강 단계 전체 제한 (초, 스트리밍에서는 남은 마감 시간까지만) - 넘으면 원래 요약 사용
+ENRICH_MIN_SUMMARY = 40         # 요약이 이보다 짧거나 키워드 안내문이면 보강 대상
+
+# 피드별 서킷 브레이커 설정
+CIRCUIT_FAILURE_THRESHOLD = 2     # 연속 실패 몇 번이면 차단할지
+CIRCUIT_BASE_COOLDOWN = 30 * 60   # 첫 차단 시간 (초), 이후 2배씩 증가
+CIRCUIT_MAX_COOLDOWN = 24 * 3600  # 최대 차단 시간 (초)
+
+# 병렬 필터링 설정 (피드가 많거나 아카이브 재생 시)
+PARALLEL_WORKERS = int(os.getenv('BOT_WORKERS', '1'))  # 0이면 CPU 코어 수만큼
+PARALLEL_MIN_ENTRIES = 2000   # 엔트리가 이보다 적으면 프로세스 풀 없이 직렬 처리
+PARALLEL_BATCH_SIZE = 500     # 워커에 한 번에 넘기는 엔트리 수
+
+# 피드 레지스트리 (SQLite) / 샤딩 설정
+FEED_REGISTRY_PATH = os.path.join(STATE_DIR, 'feeds.sqlite')  # 위의 피드 목록은 기본값으로 자동 등록
+SHARD_VIRTUAL_NODES = 128  # 일관된 해싱 링에서 샤드당 가상 노드 수
+
+# 아카이브 재생 설정
+REPLAY_CHUNK_ENTRIES = 5000  # 이만큼 엔트리가 쌓이면 필터링하고 원본을 버림 (메모리 상한)
+
+# 스트리밍 다이제스트 설정 (python -m bot news)
+PIPELINE_FETCH_WORKERS = 4    # 동시에 가져올 피드 수
+PIPELINE_QUEUE_SIZE = 4       # 필터링을 기다리는 피드 수 상한 (차면 수집 스레드가 대기)
+PIPELINE_DEADLINE = 30        # 이 시간(초)이 지나면 응답한 출처만으로 다이제스트 전송, 나머지는 후속 메시지
+PIPELINE_SEND_INTERVAL = 2    # 메시지 사이 최소 간격 (초, 텔레그램 API 제한)
+
+# 속보 알림 설정 (python -m bot alerts)
+BREAKING_SCORE_THRESHOLD = 3    # 매칭 키워드가 이 개수 이상이면 다이제스트를 기다리지 않고 바로 전송
+BREAKING_MAX_AGE_HOURS = 6      # 이보다 오래된 기사는 속보로 보내지 않음
+BREAKING_MAX_PER_POLL = 3       # 한 번 폴링에서 보낼 최대 속보 수 (나머지는 다음 폴링)
+ALERT_POLL_INTERVAL = 60        # --loop 폴링 간격 (초)
+ALERT_LEDGER_TTL_DAYS = 7       # 보낸 속보 기록 보존 기간
+
+# 실적 발표 워치 설정 (python -m bot earnings-watch)
+WATCH_TIMEZONE = 'America/New_York'  # 캘린더 날짜/발표 시간대 기준
+WATCH_WINDOWS = {                    # 발표가 나오는 시간대 (미 동부, bmo/amc)
+    'bmo': ('06:00', '09:30'),
+    'amc': ('16:00', '18:30'),
+}
+WATCH_LEAD_MINUTES = 10              # 시간대 시작 몇 분 전부터 확인할지
+WATCH_ACTIVE_INTERVAL = 60           # 발표 시간대 확인 간격 (초)
+WATCH_IDLE_INTERVAL = 15 * 60        # 평소 확인 간격 (초)
+WATCH_CALENDAR_REFRESH_HOURS = 6     # 캘린더 API 재조회 주기
+
+# 티커별 EPS/매출 기록 (열 단위 NumPy 배열, 실적 캘린더 응답마다 누적)
+EPS_HISTORY_DIR = os.path.join(STATE_DIR, 'eps_history')
+EPS_TREND_QUARTERS = 4   # 서프라이즈 추세를 볼 최근 발표 수
+
+# 전송 대기함 설정 (전송 전에 디스크에 기록, 실패분은 다음 실행에서 재전송)
+OUTBOX_DIR = os.path.join(STATE_DIR, 'outbox')
+OUTBOX_BATCH_SIZE = 10         # 한 묶음으로 연달아 보낼 메시지 수
+OUTBOX_BATCH_PAUSE = 5         # 묶음 사이 대기 (초)
+OUTBOX_SEND_INTERVAL = 1       # 메시지 사이 최소 간격 (초)
+OUTBOX_MAX_ATTEMPTS = 5        # 이만큼 실패하면 dead/로 이동
+OUTBOX_MAX_AGE_HOURS = 48      # 이보다 오래 못 보낸 메시지는 포기 (지난 소식)
+OUTBOX_SENT_TTL_HOURS = 72     # 보낸 키 보존 기간 (이 동안 같은 메시지는 다시 보내지 않음)
+OUTBOX_RETRY_COOLDOWN = 600    # 연속 전송 실패 후 이 시간 동안은 기록만 하고 전송은 쉼 (초)
+
+# 시작 시간 예산 (python -m bot startup-check, 밀리초 - 인터프리터 시작 포함, 측정 흔들림을 감안해 여유 있게)
+# 가벼운 서브커맨드가 무거운 모듈을 끌어오는지는 시간과 별개로 startup-check가 따로 확인
+STARTUP_BUDGET_MS = {
+    'news': 600,
+    'earnings': 600,
+    'upcoming': 600,
+    'dry-run': 600,
+    'render-only': 250,  # 네트워크 모듈 없이 렌더링만
+    'collect': 600,
+    'merge': 600,
+    'registry': 250,
+    'replay': 600,
+    'alerts': 600,
+    'earnings-watch': 600,
+    'outbox': 250,
+    'eps-history': 600,
+}
+
 # 공통 함수들
+_telegram_session = None
+
+def _get_telegram_session():
+    """텔레그램 전송용 HTTP 세션 (첫 전송 때만 requests 로드, 이후 연결 재사용)"""
+    global _telegram_session
+    if _telegram_session is None:
+        import requests
+        _telegram_session = requests.Session()
+    return _telegram_session
+
 def send_telegram_message(message):
     """텔레그램 메시지 전송 (공통 함수)"""
-    import requests
-    
     if not BOT_TOKEN or not CHAT_ID:
         print("❌ 텔레그램 설정이 없습니다.")
         return False
@@ -86,7 +192,7 @@ def send_telegram_message(message):
     }
     
     try:
-        response = requests.post(url, data=data, timeout=30)
+        response = _get_telegram_session().post(url, data=data, timeout=30)
         if response.status_code == 200:
             print("✅ 텔레그램 메시지 전송 성공!")
             return True
@@ -96,3 +202,10 @@ def send_telegram_message(message):
     except Exception as e:
         print(f"❌ 텔레그램 전송 오류: {e}")
         return False
+
+def print_message(message, key=None):
+    """드라이런용: 텔레그램 대신 콘솔에 메시지 출력 (key는 deliver와 같은 자리에 쓰기 위한 것, 사용 안 함)"""
+    print("-" * 60)
+    print(message)
+    print("-" * 60)
+    return True
@@ -1,21 +1,27 @@
-import requests
-import feedparser
-import json
 from datetime import datetime, timedelta
 import re
 from config import (
-    EARNINGS_COMPANIES, EARNINGS_RSS_FEEDS, EARNINGS_KEYWORDS,
-    FMP_API_KEY, send_telegram_message
+    EARNINGS_COMPANIES, EARNINGS_KEYWORDS,
+    FMP_API_KEY, print_message
 )
+from items import EarningsItem, keyword_ids, save_items
+from eps_history import record_calendar, compute_stats, format_history
 
 # Financial Modeling Prep API 설정 (config.py에서 가져옴)
 
-def get_real_earnings_calendar():
-    """실제 실적 발표 일정 가져오기 (Financial Modeling Prep API)"""
+def get_real_earnings_calendar(start=None, days=7, record=False):
+    """실제 실적 발표 일정 가져오기 (Financial Modeling Prep API)
+    
+    start: 시작 날짜 (기본 오늘), days: 조회 기간 - 발표가 끝난 기업은 eps_actual 등이 채워짐
+    record: 응답을 EPS 기록(eps_history)에 누적 (워치 폴링처럼 자주 부르는 곳에서는 끔)
+    """
+    import requests
+    
     try:
-        # 오늘부터 7일간의 실적 발표 일정
-        today = datetime.now().strftime("%Y-%m-%d")
-        next_week = (datetime.now() + timedelta(days=7)).strftime("%Y-%m-%d")
+        # 기본: 오늘부터 7일간의 실적 발표 일정
+        start = start or datetime.now().date()
+        today = start.strftime("%Y-%m-%d")
+        next_week = (start + timedelta(days=days)).strftime("%Y-%m-%d")
         
         url = f"https://financialmodelingprep.com/api/v3/earning_calendar"
         params = {
@@ -31,6 +37,10 @@ def get_real_earnings_calendar():
             earnings_data = response.json()
             print(f"📊 API 응답: {len(earnings_data)}개 실적 발표 예정")
             
+            # 관심 기업 외의 티커도 예상치/실적 기록에 누적 (과거 통계용, 하루 한 번 도는 작업만)
+            if record:
+                record_calendar(earnings_data)
+            
             # 관심 기업만 필터링
             relevant_earnings = []
             for earning in earnings_data:
@@ -77,11 +87,18 @@ def get_earnings_with_fallback():
 
 def extract_earnings_from_rss():
     """RSS에서 실적 정보 추출"""
+    from feed_fetcher import fetch_feed, load_circuits, save_circuits, print_skipped_feeds
+    from feed_registry import load_feeds, EARNINGS
+
     earnings_found = []
+    circuits = load_circuits()
+    skipped_feeds = []
     
-    for source_name, feed_url in EARNINGS_RSS_FEEDS.items():
+    for source_name, feed_url, _categories in load_feeds([EARNINGS]):
         try:
-            feed = feedparser.parse(feed_url)
+            feed = fetch_feed(source_name, feed_url, circuits, skipped_feeds)
+            if feed is None:
+                continue
             entries = feed.entries if hasattr(feed, 'entries') else []
             
             for entry in entries[:10]:  # 최신 10개만 확인
@@ -113,6 +130,9 @@ def extract_earnings_from_rss():
             print(f"❌ RSS 추출 오류 ({source_name}): {e}")
             continue
     
+    save_circuits(circuits)
+    print_skipped_feeds(skipped_feeds)
+    
     return earnings_found
 
 def extract_company_ticker(text):
@@ -161,87 +181,129 @@ def extract_earnings_metrics(text):
     
     return metrics
 
-def filter_earnings_news(entries, companies, keywords):
+def match_earnings_entry(title, summary, keywords):
+    """엔트리 하나의 실적 매칭 (키워드/티커/수치/요약, 매칭 없으면 None)"""
+    full_text = f"{title} {summary}"
+    full_text_lower = full_text.lower()
+    
+    # 키워드 매칭
+    keyword_matches = [kw for kw in keywords if kw.lower() in full_text_lower]
+    if not keyword_matches:
+        return None
+    
+    # 회사 티커 매칭
+    company_matches = extract_company_ticker(full_text)
+    if not company_matches:
+        return None
+    
+    # 실적 수치 추출
+    metrics = extract_earnings_metrics(full_text)
+    
+    # HTML 태그 정리
+    clean_summary = re.sub(r'<[^>]+>', '', summary)
+    clean_summary = clean_summary.replace('&nbsp;', ' ').replace('&amp;', '&')
+    
+    # 첫 문장만 추출하여 요약으로 사용
+    first_sentence = clean_summary.split('.')[0] + '.' if clean_summary else ""
+    first_sentence = first_sentence[:150] + "..." if len(first_sentence) > 150 else first_sentence
+    
+    return company_matches, keyword_matches, tuple(metrics.items()), first_sentence
+
+def filter_earnings_news(entries, companies, keywords, source=''):
     """실적 관련 뉴스 필터링 및 정리"""
     filtered_news = []
     
     for entry in entries:
         title = entry.title if hasattr(entry, 'title') else ""
         summary = entry.summary if hasattr(entry, 'summary') else ""
-        full_text = f"{title} {summary}"
-        
-        # 키워드 매칭
-        keyword_matches = [kw for kw in keywords if kw.lower() in full_text.lower()]
-        
-        # 회사 티커 매칭
-        company_matches = extract_company_ticker(full_text)
         
-        if keyword_matches and company_matches:
-            # 실적 수치 추출
-            metrics = extract_earnings_metrics(full_text)
-            
-            # HTML 태그 정리
-            clean_summary = re.sub(r'<[^>]+>', '', summary)
-            clean_summary = clean_summary.replace('&nbsp;', ' ').replace('&amp;', '&')
-            
-            # 첫 문장만 추출하여 요약으로 사용
-            first_sentence = clean_summary.split('.')[0] + '.' if clean_summary else ""
-            
-            filtered_news.append({
-                'title': title,
-                'link': entry.link if hasattr(entry, 'link') else "",
-                'published': entry.published if hasattr(entry, 'published') else 'Unknown',
-                'summary': first_sentence[:150] + "..." if len(first_sentence) > 150 else first_sentence,
-                'companies': company_matches,
-                'keywords': keyword_matches,
-                'metrics': metrics,
-                'source': '',
-                'importance_score': len(company_matches) + len(keyword_matches)
-            })
+        match = match_earnings_entry(title, summary, keywords)
+        if match:
+            company_matches, keyword_matches, metrics, first_sentence = match
+            filtered_news.append(EarningsItem(
+                title=title,
+                link=entry.link if hasattr(entry, 'link') else "",
+                published=entry.published if hasattr(entry, 'published') else 'Unknown',
+                summary=first_sentence,
+                companies=company_matches,
+                keyword_ids=keyword_ids(keyword_matches),
+                metrics=metrics,
+                source=source
+            ))
     
     # 중요도 순으로 정렬
-    filtered_news.sort(key=lambda x: x['importance_score'], reverse=True)
+    filtered_news.sort(key=lambda x: x.importance_score, reverse=True)
     return filtered_news
 
-def collect_earnings_news():
-    """모든 소스에서 실적 뉴스 수집"""
+def collect_earnings_news(workers=None, feeds=None):
+    """모든 소스에서 실적 뉴스 수집 (feeds가 없으면 레지스트리의 실적 피드 전체)"""
+    # 수집에만 필요한 모듈 (렌더링만 하는 서브커맨드의 시작 시간에 포함되지 않도록 여기서 import)
+    from feed_fetcher import fetch_feed, load_circuits, save_circuits, print_skipped_feeds, UnchangedFeed
+    from snapshot_store import open_snapshot_store, save_results, prune_snapshots
+    from parallel_filter import filter_earnings_feeds
+    from feed_registry import load_feeds, EARNINGS
+
+    if feeds is None:
+        feeds = load_feeds([EARNINGS])
+    
     all_earnings_news = []
+    circuits = load_circuits()
+    skipped_feeds = []
+    snapshots = open_snapshot_store()
+    collected = []  # 피드 순서대로 (이름, URL, 내용 해시, 재사용 결과, 새 엔트리)
     
     print("💼 실적 뉴스 수집 시작...")
     
-    for source_name, feed_url in EARNINGS_RSS_FEEDS.items():
-        print(f"📊 {source_name} 분석 중...")
+    for source_name, feed_url, _categories in feeds:
+        print(f"📊 {source_name} 가져오는 중...")
         try:
-            feed = feedparser.parse(feed_url)
+            feed = fetch_feed(source_name, feed_url, circuits, skipped_feeds, snapshots, 'earnings')
+            if feed is None:
+                print(f"   ⏭️ {source_name}: {skipped_feeds[-1][1]}")
+                continue
+            
+            # 내용이 지난번과 같으면 파싱/필터링 없이 저장된 결과 사용
+            if isinstance(feed, UnchangedFeed):
+                print(f"   ♻️ 내용 변경 없음 (이전 결과 {len(feed.results)}개 재사용)")
+                collected.append((source_name, feed_url, feed.content_hash, feed.results, None))
+                continue
             
             if not hasattr(feed, 'entries') or not feed.entries:
                 print(f"   ⚠️ {source_name}: 뉴스가 없습니다.")
                 continue
             
-            # 실적 뉴스 필터링
-            earnings_news = filter_earnings_news(
-                feed.entries, EARNINGS_COMPANIES, EARNINGS_KEYWORDS
-            )
-            
-            # 소스 정보 추가
-            for news in earnings_news:
-                news['source'] = source_name
-            
-            print(f"   💼 실적 관련: {len(earnings_news)}개")
-            all_earnings_news.extend(earnings_news)
+            collected.append((source_name, feed_url, feed.content_hash, None, feed.entries))
             
         except Exception as e:
             print(f"   ❌ {source_name} 오류: {e}")
             continue
     
+    # 실적 뉴스 필터링 (엔트리가 많으면 프로세스 풀에서 병렬 처리)
+    fresh_feeds = [(source_name, entries) for source_name, _url, _hash, cached, entries in collected if cached is None]
+    filtered_by_feed = iter(filter_earnings_feeds(fresh_feeds, EARNINGS_KEYWORDS, workers))
+    
+    for source_name, feed_url, content_hash, cached, _entries in collected:
+        if cached is None:
+            earnings_news = next(filtered_by_feed)
+            save_results(snapshots, feed_url, 'earnings', content_hash, earnings_news)
+        else:
+            earnings_news = cached
+        print(f"   💼 {source_name} 실적 관련: {len(earnings_news)}개")
+        all_earnings_news.extend(earnings_news)
+    
+    save_circuits(circuits)
+    print_skipped_feeds(skipped_feeds)
+    prune_snapshots(snapshots)
+    snapshots.close()
+    
     return all_earnings_news
 
-def create_earnings_summary(earnings_list, max_news=6):
-    """실적 요약 메시지 생성"""
+def create_earnings_summary(earnings_list, max_news=6, as_of=None):
+    """실적 요약 메시지 생성 (as_of: 헤더에 표시할 시각, 기본은 현재)"""
     if not earnings_list:
         return "💼 오늘은 주요 기업 실적 뉴스가 없습니다."
     
-    current_time = datetime.now().strftime('%Y-%m-%d %H:%M')
+    current_time = (as_of or datetime.now()).strftime('%Y-%m-%d %H:%M')
     message = f"💼 <b>기업 실적 요약</b>\n"
     message += f"📅 {current_time} (한국시간)\n"
     message += f"🏢 {len(earnings_list)}개 실적 뉴스 중 주요 뉴스\n\n"
@@ -249,13 +311,14 @@ def create_earnings_summary(earnings_list, max_news=6):
     # 회사별로 그룹핑
     company_news = {}
     for news in earnings_list:
-        for company in news['companies']:
+        for company in news.companies:
             if company not in company_news:
                 company_news[company] = []
             company_news[company].append(news)
     
     # 상위 회사들만 표시
     top_companies = list(company_news.keys())[:max_news]
+    history = compute_stats()
     
     for i, company in enumerate(top_companies, 1):
         news_items = company_news[company]
@@ -264,20 +327,24 @@ def create_earnings_summary(earnings_list, max_news=6):
         message += f"<b>{i}. {company}</b>\n"
         
         # 실적 수치가 있으면 표시
-        if main_news['metrics']:
+        if main_news.metrics:
             metrics_text = []
-            for key, value in main_news['metrics'].items():
+            for key, value in main_news.metrics:
                 metrics_text.append(f"{key}: {value}")
             if metrics_text:
                 message += f"   📊 {' | '.join(metrics_text)}\n"
         
+        # 과거 실적 맥락 (EPS 상회 비율, 평균 서프라이즈, 추세)
+        if company in history:
+            message += f"   {format_history(history[company])}\n"
+        
         # 요약
-        if main_news['summary']:
-            message += f"   💡 {main_news['summary']}\n"
+        if main_news.summary:
+            message += f"   💡 {main_news.summary}\n"
         
         # 출처 및 링크
-        message += f"   📰 {main_news['source']}\n"
-        message += f"   🔗 <a href='{main_news['link']}'>실적 보기</a>\n\n"
+        message += f"   📰 {main_news.source}\n"
+        message += f"   🔗 <a href='{main_news.link}'>실적 보기</a>\n\n"
     
     # 통계 정보
     total_companies = len(company_news)
@@ -311,6 +378,8 @@ def get_upcoming_earnings():
     
     # API 데이터로 메시지 구성
     if source_type == "API":
+        history = compute_stats()
+        
         # 날짜별로 그룹핑
         by_date = {}
         for earning in earnings_data:
@@ -337,6 +406,9 @@ def get_upcoming_earnings():
                 if eps_est and eps_est != 'N/A':
                     message += f"\n      💰 예상 EPS: ${eps_est}"
                 
+                if symbol in history:
+                    message += f"\n      {format_history(history[symbol])}"
+                
                 message += f"\n"
             
             message += f"\n"
@@ -354,16 +426,32 @@ def get_upcoming_earnings():
     
     return message
 
-def main():
-    """메인 실행 함수"""
+def main(dry_run=False, items_path=None, workers=None, earnings_list=None):
+    """메인 실행 함수 (dry_run이면 전송 대신 출력)
+    
+    earnings_list: 이미 수집된 실적 뉴스 (샤드 결과 병합 등) - 있으면 수집 단계 생략
+    """
+    from outbox import deliver
+
+    send = print_message if dry_run else deliver
+    
     print("💼 실적봇 시작!")
     print(f"⏰ 실행 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
     try:
-        # 실적 뉴스 수집
-        earnings_list = collect_earnings_news()
+        if earnings_list is None:
+            # 정기 실행일 때만 지난 일주일 발표 결과를 EPS 기록에 누적 (드라이런/샤드 병합은 기록하지 않음)
+            if not dry_run:
+                get_real_earnings_calendar(start=datetime.now().date() - timedelta(days=7), days=7, record=True)
+            
+            # 실적 뉴스 수집
+            earnings_list = collect_earnings_news(workers)
         print(f"📊 총 수집된 실적 뉴스: {len(earnings_list)}개")
         
+        if items_path:
+            save_items(items_path, earnings_list)
+            print(f"💾 수집 결과 저장: {items_path}")
+        
         if earnings_list:
             # 실적 요약 생성
             summary = create_earnings_summary(earnings_list, max_news=5)
@@ -372,7 +460,7 @@ def main():
             summary = get_upcoming_earnings()
         
         # 텔레그램 전송
-        success = send_telegram_message(summary)
+        success = send(summary)
         
         if success:
             print("✅ 실적 요약 전송 완료!")
@@ -384,7 +472,7 @@ def main():
         print(error_msg)
         
         # 오류 발생 시 관리자에게 알림
-        send_telegram_message(f"🚨 <b>실적봇 오류 발생</b>\n\n{error_msg}")
+        send(f"🚨 <b>실적봇 오류 발생</b>\n\n{error_msg}")
 
 if __name__ == "__main__":
     main()
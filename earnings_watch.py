@@ -0,0 +1,299 @@
+"""실적 발표 워치 모드 (캘린더의 bmo/amc 시간대에 맞춰 자주 확인)
+
+평소에는 느린 간격으로 캘린더만 확인하다가, 관심 기업의 발표 시간대
+(장 시작 전 bmo / 장 마감 후 amc, 미 동부 시간)가 다가오면 해당 티커만
+FMP API와 실적 피드에서 자주 확인합니다. 실제 EPS/매출이 나오면 예상치와
+비교한 요약을 바로 보내고, 보낸 티커는 다시 확인하지 않습니다.
+
+    python -m bot earnings-watch            # 한 번 확인 (스케줄러용)
+    python -m bot earnings-watch --loop     # 계속 실행 (발표 시간대엔 짧게, 평소엔 길게 대기)
+"""
+import json
+import os
+import re
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from zoneinfo import ZoneInfo
+
+from config import (
+    STATE_DIR, EARNINGS_KEYWORDS,
+    WATCH_TIMEZONE, WATCH_WINDOWS, WATCH_LEAD_MINUTES,
+    WATCH_ACTIVE_INTERVAL, WATCH_IDLE_INTERVAL, WATCH_CALENDAR_REFRESH_HOURS,
+    print_message
+)
+from outbox import deliver, retry_pending
+
+WATCH_STATE_FILE = os.path.join(STATE_DIR, 'earnings_watch.json')
+MARKET_TZ = ZoneInfo(WATCH_TIMEZONE)
+
+TIME_LABELS = {'bmo': '장 시작 전', 'amc': '장 마감 후'}
+
+
+def load_watch_state():
+    """저장된 캘린더와 보낸 실적 기록 불러오기"""
+    try:
+        with open(WATCH_STATE_FILE, encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        state = {}
+    state.setdefault('calendar', [])
+    state.setdefault('calendar_fetched_at', 0)
+    state.setdefault('reported', {})
+    return state
+
+def save_watch_state(state):
+    """워치 상태 저장 (2주 지난 발표 기록은 정리)"""
+    cutoff = time.time() - 14 * 86400
+    state['reported'] = {key: sent_at for key, sent_at in state['reported'].items() if sent_at >= cutoff}
+    try:
+        os.makedirs(STATE_DIR, exist_ok=True)
+        tmp_path = WATCH_STATE_FILE + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, WATCH_STATE_FILE)
+    except OSError as e:
+        print(f"⚠️ 워치 상태 저장 실패: {e}")
+
+def refresh_calendar(state, now):
+    """캘린더가 오래됐으면 FMP에서 다시 가져오기 (발표 시간대 판단용, API 호출 최소화)"""
+    from earnings_bot import get_real_earnings_calendar
+
+    age = now.timestamp() - state['calendar_fetched_at']
+    if age < WATCH_CALENDAR_REFRESH_HOURS * 3600:
+        return
+    calendar = get_real_earnings_calendar(start=now.astimezone(MARKET_TZ).date())
+    if calendar or not state['calendar']:
+        state['calendar'] = calendar
+    state['calendar_fetched_at'] = now.timestamp()
+
+def report_key(row):
+    return f"{row['symbol']}:{row['date']}"
+
+def release_windows(row):
+    """발표 예상 시간대 [(시작, 끝)] - bmo/amc를 모르면 두 시간대 모두"""
+    try:
+        day = datetime.strptime(row['date'], '%Y-%m-%d').date()
+    except (KeyError, ValueError):
+        return []
+
+    slots = [row.get('time')] if row.get('time') in WATCH_WINDOWS else list(WATCH_WINDOWS)
+    windows = []
+    for slot in slots:
+        start_text, end_text = WATCH_WINDOWS[slot]
+        start = datetime.combine(day, datetime.strptime(start_text, '%H:%M').time(), MARKET_TZ)
+        end = datetime.combine(day, datetime.strptime(end_text, '%H:%M').time(), MARKET_TZ)
+        windows.append((start, end))
+    return windows
+
+def due_reports(state, now):
+    """지금 확인해야 하는 발표 (시간대 시작 WATCH_LEAD_MINUTES분 전부터 끝까지, 아직 안 보낸 것)"""
+    lead = timedelta(minutes=WATCH_LEAD_MINUTES)
+    return [
+        row for row in state['calendar']
+        if report_key(row) not in state['reported']
+        and any(start - lead <= now <= end for start, end in release_windows(row))
+    ]
+
+def next_window_start(state, now):
+    """다음 확인 시작 시각 (없으면 None)"""
+    lead = timedelta(minutes=WATCH_LEAD_MINUTES)
+    starts = [
+        start - lead
+        for row in state['calendar'] if report_key(row) not in state['reported']
+        for start, _end in release_windows(row) if start - lead > now
+    ]
+    return min(starts, default=None)
+
+def _to_number(value):
+    """API 값/기사 속 수치 → 숫자 ('$94.9 billion' 등 포함, 알 수 없으면 None)"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if not isinstance(value, str):
+        return None
+    match = re.search(r'(-?\d+(?:\.\d+)?)\s*(billion|million|[BM]\b)?', value.replace(',', ''), re.IGNORECASE)
+    if not match:
+        return None
+    number = float(match.group(1))
+    unit = (match.group(2) or '').lower()
+    if unit in ('billion', 'b'):
+        number *= 1e9
+    elif unit in ('million', 'm'):
+        number *= 1e6
+    return number
+
+def _format_money(value):
+    if abs(value) >= 1e9:
+        return f"${value / 1e9:.2f}B"
+    if abs(value) >= 1e6:
+        return f"${value / 1e6:.1f}M"
+    return f"${value:.2f}"
+
+def compare_line(label, actual, estimated):
+    """'EPS: $1.64 vs 예상 $1.60 (📈 +2.5%)' 형식 한 줄"""
+    if actual is None:
+        return f"{label}: 발표 대기" + (f" (예상 {_format_money(estimated)})" if estimated is not None else "")
+
+    line = f"{label}: {_format_money(actual)}"
+    if estimated is None:
+        return line
+
+    line += f" vs 예상 {_format_money(estimated)}"
+    if estimated:
+        surprise = (actual - estimated) / abs(estimated) * 100
+        icon = '📈' if surprise > 0 else '📉' if surprise < 0 else '🎯'
+        line += f" ({icon} {surprise:+.1f}%)"
+    return line
+
+def create_release_message(row, actual, news=None):
+    """실적 발표 한 건 메시지 (actual: {'eps': 값, 'revenue': 값})"""
+    symbol = row['symbol']
+    time_label = TIME_LABELS.get(row.get('time'), '')
+
+    message = f"⚡ <b>{symbol} 실적 발표</b>" + (f" ({time_label})" if time_label else "") + "\n"
+    message += f"📅 {datetime.now(MARKET_TZ).strftime('%Y-%m-%d %H:%M')} (미 동부)\n\n"
+    message += f"💰 {compare_line('EPS', actual.get('eps'), _to_number(row.get('eps_estimated')))}\n"
+    message += f"💵 {compare_line('매출', actual.get('revenue'), _to_number(row.get('revenue_estimated')))}\n"
+
+    if news:
+        message += f"\n📰 {news.source}: {news.title}\n"
+        message += f"🔗 <a href='{news.link}'>기사 보기</a>\n"
+
+    message += f"\n💼 <i>실적봇 v1.0 · 발표 워치</i>"
+    return message
+
+def _published_after(published, since):
+    try:
+        published_at = parsedate_to_datetime(published)
+    except (TypeError, ValueError):
+        return False
+    if published_at.tzinfo is None:
+        published_at = published_at.replace(tzinfo=timezone.utc)
+    return published_at >= since
+
+def _fetch_release_news(symbols, since):
+    """실적 피드에서 해당 티커의 최근 실적 기사 {티커: 기사} (내용이 그대로인 피드는 저장된 결과 사용)"""
+    from config import EARNINGS_COMPANIES
+    from earnings_bot import filter_earnings_news
+    from feed_fetcher import fetch_feed, load_circuits, save_circuits, UnchangedFeed
+    from feed_registry import load_feeds, EARNINGS
+    from snapshot_store import open_snapshot_store, save_results
+
+    circuits = load_circuits()
+    skipped = []
+    snapshots = open_snapshot_store()
+    found = {}
+    try:
+        for source_name, feed_url, _categories in load_feeds([EARNINGS]):
+            try:
+                feed = fetch_feed(source_name, feed_url, circuits, skipped, snapshots, 'earnings')
+            except Exception as e:
+                print(f"   ⚠️ {source_name}: {e}")
+                continue
+            if feed is None:
+                continue
+
+            if isinstance(feed, UnchangedFeed):
+                results = feed.results
+            else:
+                results = filter_earnings_news(feed.entries, EARNINGS_COMPANIES, EARNINGS_KEYWORDS, source_name)
+                save_results(snapshots, feed_url, 'earnings', feed.content_hash, results)
+
+            for news in results:
+                if not _published_after(news.published, since):
+                    continue
+                for symbol in news.companies:
+                    # 수치가 있는 기사 우선
+                    if symbol in symbols and (symbol not in found or (news.metrics and not found[symbol].metrics)):
+                        found[symbol] = news
+    finally:
+        snapshots.close()
+    save_circuits(circuits)
+    return found
+
+def check_releases(due, now):
+    """확인 대상 티커의 실제 실적 조회 - [(캘린더 행, {'eps', 'revenue'}, 기사)] (발표된 것만)"""
+    from earnings_bot import get_real_earnings_calendar
+
+    symbols = {row['symbol'] for row in due}
+    print(f"🔎 발표 확인 중: {', '.join(sorted(symbols))}")
+
+    # 1. FMP: 발표가 끝나면 당일 캘린더에 실제 값이 채워짐
+    market_day = now.astimezone(MARKET_TZ).date()
+    api_rows = {
+        (row['symbol'], row['date']): row
+        for row in get_real_earnings_calendar(start=market_day, days=0)
+        if row['symbol'] in symbols
+    }
+
+    # 2. 실적 피드: API보다 빠른 경우가 많음 (시간대 시작 이후 기사만)
+    earliest = min(start for row in due for start, _end in release_windows(row))
+    news_by_symbol = _fetch_release_news(symbols, earliest - timedelta(minutes=WATCH_LEAD_MINUTES))
+
+    released = []
+    for row in due:
+        api_row = api_rows.get((row['symbol'], row['date']), {})
+        news = news_by_symbol.get(row['symbol'])
+        news_metrics = dict(news.metrics) if news else {}
+
+        actual = {
+            'eps': _to_number(api_row.get('eps_actual')),
+            'revenue': _to_number(api_row.get('revenue_actual'))
+        }
+        if actual['eps'] is None:
+            actual['eps'] = _to_number(news_metrics.get('EPS'))
+        if actual['revenue'] is None:
+            actual['revenue'] = _to_number(news_metrics.get('Revenue'))
+
+        if actual['eps'] is not None or actual['revenue'] is not None:
+            released.append((row, actual, news))
+    return released
+
+def poll_once(dry_run=False, state=None, now=None):
+    """한 번 확인 - 다음 확인까지 기다릴 시간(초) 반환"""
+    send = print_message if dry_run else deliver
+    state = state if state is not None else load_watch_state()
+    now = now or datetime.now(timezone.utc)
+
+    refresh_calendar(state, now)
+    due = due_reports(state, now)
+
+    if not due:
+        next_start = next_window_start(state, now)
+        wait = WATCH_IDLE_INTERVAL
+        if next_start:
+            wait = min(wait, max(0, (next_start - now).total_seconds()))
+            print(f"💤 발표 시간대 아님 - 다음 확인 시작: {next_start.astimezone(MARKET_TZ).strftime('%m/%d %H:%M')} (미 동부)")
+        else:
+            print("💤 워치 대상 발표 없음")
+        save_watch_state(state)
+        return wait
+
+    for row, actual, news in check_releases(due, now):
+        # 메시지에 현재 시각이 들어가므로 발표 건 기준으로 중복 판단
+        if send(create_release_message(row, actual, news), key=f"release:{report_key(row)}"):
+            state['reported'][report_key(row)] = time.time()
+            print(f"⚡ {row['symbol']} 실적 발표 전송")
+        else:
+            print(f"❌ {row['symbol']} 실적 발표 전송 실패")
+
+    save_watch_state(state)
+    return WATCH_ACTIVE_INTERVAL
+
+def run(loop=False, dry_run=False):
+    """워치 실행 (loop면 발표 시간대엔 짧게, 평소엔 길게 대기하며 계속)"""
+    state = load_watch_state()
+    while True:
+        try:
+            if loop and not dry_run:
+                retry_pending()  # 전송 장애가 풀렸으면 밀린 발표 메시지부터
+            wait = poll_once(dry_run, state)
+        except Exception as e:
+            print(f"❌ 실적 워치 오류: {e}")
+            if not loop:
+                raise
+            wait = WATCH_ACTIVE_INTERVAL
+
+        if not loop:
+            return
+        time.sleep(wait)
@@ -0,0 +1,262 @@
+"""티커/분기별 EPS·매출 예상치와 실적 기록 (열 단위 NumPy 배열, 메모리 매핑)
+
+    <EPS_HISTORY_DIR>/current               - 지금 쓰는 세대 디렉터리 이름
+    <EPS_HISTORY_DIR>/<세대>/<열 이름>.npy  - 열마다 배열 하나 (행 = 티커의 실적 발표 한 번)
+    <EPS_HISTORY_DIR>/<세대>/tickers.json   - 티커 ID → 티커 문자열
+
+실적 캘린더 API 응답 중 발표가 끝난 행의 예상치/실적 쌍을 쌓아 두고, 티커별 EPS 상회 비율,
+평균 서프라이즈, 최근 추세를 배열 연산 몇 번으로 한꺼번에 계산합니다.
+기록은 모든 열을 새 세대 디렉터리에 쓴 뒤 current만 바꿔서 열 길이가 어긋나지 않게 합니다.
+numpy가 없으면 기록/통계 없이 조용히 건너뜁니다.
+"""
+import fcntl
+import json
+import os
+import shutil
+import time
+
+from config import EPS_HISTORY_DIR, EPS_TREND_QUARTERS
+
+CURRENT_FILE = os.path.join(EPS_HISTORY_DIR, 'current')
+LOCK_FILE = os.path.join(EPS_HISTORY_DIR, '.lock')
+
+# 열 이름 → dtype (날짜는 YYYYMMDD 정수, 값이 없으면 NaN)
+COLUMNS = {
+    'ticker': 'int32',
+    'date': 'int32',
+    'eps_estimated': 'float64',
+    'eps_actual': 'float64',
+    'revenue_estimated': 'float64',
+    'revenue_actual': 'float64',
+}
+
+_stats_cache = None
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+def _current_dir():
+    """지금 세대 디렉터리 (기록이 없으면 None)"""
+    try:
+        with open(CURRENT_FILE, encoding='utf-8') as f:
+            return os.path.join(EPS_HISTORY_DIR, f.read().strip())
+    except OSError:
+        return None
+
+def load_history(np=None):
+    """저장된 열(읽기 전용 메모리 매핑)과 티커 목록 - ({열 이름: 배열}, [티커])
+
+    기록이 없거나 열 길이가 서로 다르면 빈 배열
+    """
+    np = np or _numpy()
+    empty = {name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS.items()}
+    directory = _current_dir()
+    if directory is None:
+        return empty, []
+
+    try:
+        with open(os.path.join(directory, 'tickers.json'), encoding='utf-8') as f:
+            tickers = json.load(f)
+        columns = {
+            name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode='r')
+            for name in COLUMNS
+        }
+    except (OSError, ValueError) as e:
+        print(f"⚠️ EPS 기록 읽기 실패: {e}")
+        return empty, []
+
+    if len({len(column) for column in columns.values()}) != 1:
+        print(f"⚠️ EPS 기록의 열 길이가 서로 다름 - 무시 ({directory})")
+        return empty, []
+    return columns, tickers
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float('nan')
+
+def _write_generation(np, columns, tickers):
+    """모든 열을 새 세대 디렉터리에 쓰고 current를 한 번에 교체 (이전 세대는 삭제)"""
+    name = f"gen-{time.time_ns()}"
+    directory = os.path.join(EPS_HISTORY_DIR, name)
+    os.makedirs(directory)
+    for column_name, column in columns.items():
+        np.save(os.path.join(directory, f"{column_name}.npy"), column)
+    with open(os.path.join(directory, 'tickers.json'), 'w', encoding='utf-8') as f:
+        json.dump(tickers, f)
+
+    tmp_path = CURRENT_FILE + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(name)
+    os.replace(tmp_path, CURRENT_FILE)
+
+    # 이전 세대 정리 (이미 메모리 매핑으로 연 쪽은 파일이 지워져도 계속 읽을 수 있음)
+    for entry in os.listdir(EPS_HISTORY_DIR):
+        if entry.startswith('gen-') and entry != name:
+            shutil.rmtree(os.path.join(EPS_HISTORY_DIR, entry), ignore_errors=True)
+
+def record_calendar(rows):
+    """실적 캘린더 행 중 발표가 끝난 것을 기록 (같은 티커/발표일은 새 값으로 교체) - 바뀐 경우 기록한 행 수 반환
+
+    rows: FMP earning_calendar 응답 그대로 (symbol, date, epsEstimated, eps, revenueEstimated, revenue)
+    하루 한 번 도는 실적봇/백필에서만 호출 (기록 전체를 다시 쓰므로 자주 부르지 않음)
+    """
+    global _stats_cache
+    np = _numpy()
+    if np is None or not rows:
+        return 0
+
+    # 아직 발표 전인 행(실적 값 없음)은 통계에 쓰이지 않으므로 건너뜀
+    rows = [row for row in rows if row.get('eps') is not None or row.get('revenue') is not None]
+    if not rows:
+        return 0
+
+    os.makedirs(EPS_HISTORY_DIR, exist_ok=True)
+    with open(LOCK_FILE, 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)  # 동시에 실행된 기록끼리 서로 덮어쓰지 않도록
+
+        old, tickers = load_history(np)
+        tickers = list(tickers)
+        ticker_ids = {ticker: i for i, ticker in enumerate(tickers)}
+        new = {name: [] for name in COLUMNS}
+        for row in rows:
+            symbol = row.get('symbol')
+            try:
+                date = int(str(row.get('date', '')).replace('-', ''))
+            except ValueError:
+                continue
+            if not symbol:
+                continue
+            if symbol not in ticker_ids:
+                ticker_ids[symbol] = len(tickers)
+                tickers.append(symbol)
+            new['ticker'].append(ticker_ids[symbol])
+            new['date'].append(date)
+            new['eps_estimated'].append(_to_float(row.get('epsEstimated')))
+            new['eps_actual'].append(_to_float(row.get('eps')))
+            new['revenue_estimated'].append(_to_float(row.get('revenueEstimated')))
+            new['revenue_actual'].append(_to_float(row.get('revenue')))
+
+        merged = {
+            name: np.concatenate([np.asarray(old[name]), np.asarray(new[name], dtype=dtype)])
+            for name, dtype in COLUMNS.items()
+        }
+
+        # (티커, 날짜)가 같으면 나중 값 유지: 뒤집어서 첫 등장 위치를 고른 뒤 원래 순서로
+        keys = merged['ticker'].astype('int64') * 100_000_000 + merged['date']
+        _unique, last_first = np.unique(keys[::-1], return_index=True)
+        keep = np.sort(len(keys) - 1 - last_first)
+        merged = {name: column[keep] for name, column in merged.items()}
+
+        old_rows = len(old['ticker'])
+        changed = len(keep) != old_rows or not all(
+            np.array_equal(merged[name], old[name], equal_nan=name not in ('ticker', 'date'))
+            for name in COLUMNS
+        )
+        if not changed:
+            return 0
+
+        del old  # 메모리 매핑을 닫은 뒤 세대 교체
+        _write_generation(np, merged, tickers)
+
+    _stats_cache = None
+    return len(rows)
+
+def compute_stats(np=None):
+    """티커별 통계 {티커: {'quarters', 'beat_rate', 'avg_surprise', 'revenue_beat_rate', 'trend'}}
+
+    - quarters: 예상치와 실적이 모두 있는 EPS 발표 수
+    - beat_rate / revenue_beat_rate: 실적이 예상치를 넘은 비율 (0~1)
+    - avg_surprise: 평균 EPS 서프라이즈 (%)
+    - trend: 최근 EPS_TREND_QUARTERS번 서프라이즈의 분기당 변화 (%p, 기울기)
+    """
+    global _stats_cache
+    np = np or _numpy()
+    if np is None:
+        return {}
+    if _stats_cache is None:
+        columns, tickers = load_history(np)
+        _stats_cache = stats_from_columns(np, columns, tickers)
+    return _stats_cache
+
+def stats_from_columns(np, columns, tickers):
+    """열 배열 → 티커별 통계 (compute_stats 참고, 티커 수와 관계없이 배열 연산 몇 번)"""
+    n_tickers = len(tickers)
+    if not n_tickers or not len(columns['ticker']):
+        return {}
+
+    ticker = np.asarray(columns['ticker'])
+    date = np.asarray(columns['date'])
+    eps_est = np.asarray(columns['eps_estimated'])
+    eps_act = np.asarray(columns['eps_actual'])
+    rev_est = np.asarray(columns['revenue_estimated'])
+    rev_act = np.asarray(columns['revenue_actual'])
+
+    # EPS: 예상치/실적이 모두 있는 행만
+    has_eps = np.isfinite(eps_est) & np.isfinite(eps_act)
+    eps_ticker = ticker[has_eps]
+    quarters = np.bincount(eps_ticker, minlength=n_tickers)
+    beats = np.bincount(eps_ticker, weights=eps_act[has_eps] > eps_est[has_eps], minlength=n_tickers)
+
+    est = eps_est[has_eps]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        surprise = np.where(est != 0, (eps_act[has_eps] - est) / np.abs(est) * 100, 0.0)
+    surprise_sum = np.bincount(eps_ticker, weights=surprise, minlength=n_tickers)
+
+    # 매출 상회 비율
+    has_rev = np.isfinite(rev_est) & np.isfinite(rev_act)
+    rev_quarters = np.bincount(ticker[has_rev], minlength=n_tickers)
+    rev_beats = np.bincount(ticker[has_rev], weights=rev_act[has_rev] > rev_est[has_rev], minlength=n_tickers)
+
+    # 추세: 티커별 최근 N개 서프라이즈의 최소제곱 기울기 (x = 최근순 위치를 뒤집은 0..N-1)
+    order = np.lexsort((date[has_eps], eps_ticker))
+    sorted_ticker = eps_ticker[order]
+    sorted_surprise = surprise[order]
+    ends = np.cumsum(quarters)
+    position_from_end = ends[sorted_ticker] - 1 - np.arange(len(order))
+    recent = position_from_end < EPS_TREND_QUARTERS
+    window = np.minimum(quarters, EPS_TREND_QUARTERS)
+    x = (window[sorted_ticker] - 1 - position_from_end)[recent].astype('float64')
+    y = sorted_surprise[recent]
+    t = sorted_ticker[recent]
+    n = window.astype('float64')
+    sum_x = np.bincount(t, weights=x, minlength=n_tickers)
+    sum_y = np.bincount(t, weights=y, minlength=n_tickers)
+    sum_xy = np.bincount(t, weights=x * y, minlength=n_tickers)
+    sum_xx = np.bincount(t, weights=x * x, minlength=n_tickers)
+    denominator = n * sum_xx - sum_x ** 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        trend = np.where(denominator > 0, (n * sum_xy - sum_x * sum_y) / denominator, 0.0)
+        beat_rate = beats / quarters
+        avg_surprise = surprise_sum / quarters
+        revenue_beat_rate = np.where(rev_quarters > 0, rev_beats / rev_quarters, np.nan)
+
+    stats = {}
+    for ticker_id in np.flatnonzero(quarters):
+        stats[tickers[ticker_id]] = {
+            'quarters': int(quarters[ticker_id]),
+            'beat_rate': float(beat_rate[ticker_id]),
+            'avg_surprise': float(avg_surprise[ticker_id]),
+            'revenue_beat_rate': None if np.isnan(revenue_beat_rate[ticker_id]) else float(revenue_beat_rate[ticker_id]),
+            'trend': float(trend[ticker_id]),
+        }
+    return stats
+
+def format_history(stats):
+    """메시지용 한 줄: '📊 과거 8분기 EPS 상회 75% · 평균 서프라이즈 +4.2% · 매출 상회 62% · 추세 ↗'"""
+    if not stats:
+        return ""
+    trend = stats['trend']
+    arrow = '↗' if trend > 1 else '↘' if trend < -1 else '→'
+    line = f"📊 과거 {stats['quarters']}분기 EPS 상회 {stats['beat_rate'] * 100:.0f}%"
+    line += f" · 평균 서프라이즈 {stats['avg_surprise']:+.1f}%"
+    if stats['revenue_beat_rate'] is not None:
+        line += f" · 매출 상회 {stats['revenue_beat_rate'] * 100:.0f}%"
+    line += f" · 추세 {arrow}"
+    return line
@@ -0,0 +1,287 @@
+import json
+import os
+import re
+import time
+import zlib
+from config import (
+    STATE_DIR, FEED_USER_AGENT,
+    FEED_CONNECT_TIMEOUT, FEED_READ_TIMEOUT, FEED_TOTAL_TIMEOUT, FEED_SLOW_THRESHOLD,
+    FEED_MAX_BYTES, FEED_MAX_ENTRIES,
+    CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_BASE_COOLDOWN, CIRCUIT_MAX_COOLDOWN
+)
+
+CIRCUIT_STATE_FILE = os.path.join(STATE_DIR, 'feed_circuits.json')
+
+# 서킷 상태: closed(정상) → open(차단) → half_open(시험 요청 1회) → closed/open
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+# RSS는 item, Atom은 entry
+ENTRY_TAGS = ('item', 'entry')
+CHUNK_SIZE = 16384
+_ENTRY_END = re.compile(rb'</(?:[\w.-]+:)?(?:item|entry)\s*>')
+
+
+class FeedFetchError(Exception):
+    """피드 다운로드/파싱 실패 (사유 메시지 포함)"""
+
+
+class UnchangedFeed:
+    """내용이 지난번과 같아 파싱을 생략한 피드 - 저장된 필터링 결과를 그대로 사용"""
+
+    def __init__(self, content_hash, results):
+        self.content_hash = content_hash
+        self.results = results
+
+
+def load_circuits():
+    """저장된 피드별 서킷 상태 불러오기"""
+    try:
+        with open(CIRCUIT_STATE_FILE, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_circuits(circuits):
+    """피드별 서킷 상태 저장 (다음 실행에서 사용)"""
+    try:
+        os.makedirs(STATE_DIR, exist_ok=True)
+        tmp_path = CIRCUIT_STATE_FILE + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(circuits, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, CIRCUIT_STATE_FILE)
+    except OSError as e:
+        print(f"⚠️ 서킷 상태 저장 실패: {e}")
+
+def _new_circuit():
+    return {
+        'state': CLOSED,
+        'failures': 0,      # 연속 실패 횟수
+        'trips': 0,         # 연속 차단 횟수 (쿨다운 지수 증가용)
+        'opened_at': 0,
+        'cooldown': 0,
+        'last_error': '',
+        'last_elapsed': 0
+    }
+
+def _record_success(circuit, elapsed):
+    circuit.update(state=CLOSED, failures=0, trips=0, opened_at=0, cooldown=0,
+                   last_error='', last_elapsed=round(elapsed, 2))
+
+def _record_failure(circuit, reason, elapsed):
+    """실패 기록 - 시험 요청 실패 또는 연속 실패 누적 시 지수 쿨다운으로 차단"""
+    circuit['failures'] += 1
+    circuit['last_error'] = reason
+    circuit['last_elapsed'] = round(elapsed, 2)
+
+    if circuit['state'] == HALF_OPEN or circuit['failures'] >= CIRCUIT_FAILURE_THRESHOLD:
+        cooldown = min(CIRCUIT_BASE_COOLDOWN * (2 ** circuit['trips']), CIRCUIT_MAX_COOLDOWN)
+        circuit.update(state=OPEN, opened_at=time.time(), cooldown=cooldown)
+        circuit['trips'] += 1
+
+class _EntryCounter:
+    """받은 본문을 XML 파서에 조금씩 넣어 끝난 엔트리(item/entry) 수를 셈
+
+    XML로 읽을 수 없는 본문(HTML 엔티티 등)이면 세기를 멈추고 크기 제한만 적용 (파싱은 feedparser가 처리)
+    """
+
+    def __init__(self):
+        from xml.etree.ElementTree import XMLPullParser
+
+        self.parser = XMLPullParser(events=('start', 'end'))
+        self.open_tags = []    # 지금 열려 있는 요소 (로컬 이름)
+        self.ancestors = []    # 마지막 엔트리가 끝났을 때 열려 있던 요소
+        self.entries = 0
+        self.broken = False
+
+    def feed(self, data):
+        from xml.etree.ElementTree import ParseError
+
+        if self.broken:
+            return
+        try:
+            self.parser.feed(data)
+            for event, element in self.parser.read_events():
+                name = element.tag.rsplit('}', 1)[-1]
+                if event == 'start':
+                    self.open_tags.append(name)
+                    continue
+                self.open_tags.pop()
+                if name in ENTRY_TAGS:
+                    self.entries += 1
+                    self.ancestors = list(self.open_tags)
+                    element.clear()  # 센 엔트리는 메모리에 두지 않음
+        except ParseError:
+            self.broken = True
+
+def _close_after_last_entry(payload, ancestors):
+    """마지막으로 끝난 엔트리 뒤를 잘라내고 열린 요소(channel, rss 등)를 닫은 본문"""
+    ends = list(_ENTRY_END.finditer(payload))
+    if not ends:
+        return payload
+    head = payload[:ends[-1].end()]
+    closing = b''
+    for name in reversed(ancestors):
+        # 접두사가 붙은 이름(rdf:RDF 등)은 여는 태그에서 그대로 가져옴
+        match = re.search(rb'<((?:[\w.-]+:)?' + re.escape(name.encode()) + rb')[\s/>]', head)
+        closing += b'</' + (match.group(1) if match else name.encode()) + b'>'
+    return head + closing
+
+def _decompressor(encoding, first_chunk):
+    """Content-Encoding에 맞는 압축 해제기 (deflate는 zlib 헤더가 있는 것과 없는 것이 섞여 있음)"""
+    if encoding == 'gzip':
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    has_zlib_header = (
+        len(first_chunk) >= 2 and first_chunk[0] & 0x0F == 8
+        and (first_chunk[0] * 256 + first_chunk[1]) % 31 == 0
+    )
+    return zlib.decompressobj(zlib.MAX_WBITS if has_zlib_header else -zlib.MAX_WBITS)
+
+def _inflate(raw_chunks, encoding):
+    """압축된 조각을 풀어서 CHUNK_SIZE 이하 조각으로 반환 (한 조각이 한꺼번에 크게 풀리지 않도록)"""
+    decompressor = None
+    for data in raw_chunks:
+        decompressor = decompressor or _decompressor(encoding, data)
+        while data:
+            piece = decompressor.decompress(data, CHUNK_SIZE)
+            data = decompressor.unconsumed_tail
+            if piece:
+                yield piece
+    if decompressor:
+        yield decompressor.flush()
+
+def _download(feed_url):
+    """피드 본문을 조금씩 받아 압축을 풀면서 읽기 - (본문, 소요 시간, 크기 제한으로 잘렸는지)
+
+    전체 시간 제한(소켓 타임아웃만으로는 느린 응답을 막지 못함)과 함께, 압축 해제 후
+    FEED_MAX_BYTES를 넘거나 엔트리를 FEED_MAX_ENTRIES개 읽으면 연결을 끊고
+    그때까지 끝난 엔트리만 남긴 본문을 반환
+    """
+    import requests
+    from urllib3.exceptions import HTTPError as TransportError, TimeoutError as TransportTimeout
+    
+    started = time.monotonic()
+    counter = _EntryCounter()
+    chunks = []
+    size = 0
+    over_size = False
+
+    try:
+        with requests.get(
+            feed_url,
+            headers={'User-Agent': FEED_USER_AGENT, 'Accept-Encoding': 'gzip, deflate'},
+            timeout=(FEED_CONNECT_TIMEOUT, FEED_READ_TIMEOUT),
+            stream=True
+        ) as response:
+            if response.status_code != 200:
+                raise FeedFetchError(f"HTTP {response.status_code}")
+
+            encoding = response.headers.get('Content-Encoding', '').strip().lower()
+            if encoding not in ('', 'identity', 'gzip', 'deflate'):
+                raise FeedFetchError(f"지원하지 않는 압축 ({encoding})")
+
+            # 압축은 직접 조금씩 풀어서 압축 폭탄도 크기 제한 안에서 멈추게 함
+            chunks_in = response.raw.stream(CHUNK_SIZE, decode_content=False)
+            if encoding in ('gzip', 'deflate'):
+                chunks_in = _inflate(chunks_in, encoding)
+
+            for chunk in chunks_in:
+                if time.monotonic() - started > FEED_TOTAL_TIMEOUT:
+                    raise FeedFetchError(f"시간 초과 ({FEED_TOTAL_TIMEOUT}초)")
+
+                if size + len(chunk) > FEED_MAX_BYTES:
+                    chunk = chunk[:FEED_MAX_BYTES - size]
+                    over_size = True
+                chunks.append(chunk)
+                size += len(chunk)
+                counter.feed(chunk)
+                if over_size or counter.entries >= FEED_MAX_ENTRIES:
+                    break
+    except zlib.error:
+        raise FeedFetchError("압축 해제 실패")
+    except requests.Timeout:
+        raise FeedFetchError("시간 초과 (응답 없음)")
+    except requests.RequestException as e:
+        raise FeedFetchError(f"연결 오류: {e.__class__.__name__}")
+    # raw.stream()은 requests의 예외 변환을 거치지 않으므로 본문 도중의 오류는 직접 변환
+    except TransportTimeout:
+        raise FeedFetchError("시간 초과 (본문 수신 중 응답 없음)")
+    except (TransportError, OSError) as e:
+        raise FeedFetchError(f"연결 오류: {e.__class__.__name__}")
+
+    payload = b''.join(chunks)
+    if over_size or counter.entries >= FEED_MAX_ENTRIES:
+        if over_size and not counter.entries and not counter.broken:
+            raise FeedFetchError(f"크기 제한 초과 ({FEED_MAX_BYTES // 1024}KB 안에 엔트리 없음)")
+        if counter.entries:
+            payload = _close_after_last_entry(payload, counter.ancestors)
+
+    return payload, time.monotonic() - started, over_size
+
+def fetch_feed(site_name, feed_url, circuits, skipped, snapshots=None, kind=None):
+    """서킷 브레이커를 거쳐 피드 가져오기
+
+    차단 중이거나 실패한 피드는 (사이트, 사유)를 skipped에 추가하고 None 반환.
+    snapshots(스냅샷 저장소)가 있으면 원본을 저장하고, kind('news'/'earnings') 결과가
+    같은 내용으로 이미 저장돼 있으면 파싱 없이 UnchangedFeed 반환.
+    파싱한 피드에는 content_hash 속성이 붙음 (save_results용).
+    """
+    import feedparser
+    from snapshot_store import store_payload, cached_results
+    
+    circuit = circuits.setdefault(feed_url, _new_circuit())
+
+    if circuit['state'] == OPEN:
+        remaining = circuit['opened_at'] + circuit['cooldown'] - time.time()
+        if remaining > 0:
+            reason = f"차단 중 ({circuit['last_error']}, {int(remaining // 60) + 1}분 후 재시도)"
+            skipped.append((site_name, reason))
+            return None
+        # 쿨다운이 끝나면 시험 요청 1회 허용
+        circuit['state'] = HALF_OPEN
+        print(f"   🔁 {site_name}: 차단 해제 시험 요청")
+
+    started = time.monotonic()
+    try:
+        payload, elapsed, over_size = _download(feed_url)
+        if over_size:
+            print(f"   ✂️ {site_name}: {FEED_MAX_BYTES // 1024}KB까지만 읽음")
+        
+        content_hash = None
+        if snapshots is not None:
+            content_hash = store_payload(snapshots, site_name, feed_url, payload)
+            results = cached_results(snapshots, feed_url, kind, content_hash) if kind else None
+            if results is not None:
+                _record_timing(circuit, site_name, elapsed)
+                return UnchangedFeed(content_hash, results)
+        
+        feed = feedparser.parse(payload)
+        if feed.bozo and not feed.entries:
+            raise FeedFetchError("파싱 실패")
+        feed['content_hash'] = content_hash
+    except FeedFetchError as e:
+        elapsed = time.monotonic() - started
+        _record_failure(circuit, str(e), elapsed)
+        skipped.append((site_name, str(e)))
+        return None
+
+    _record_timing(circuit, site_name, elapsed)
+    return feed
+
+def _record_timing(circuit, site_name, elapsed):
+    """성공한 요청 기록 - 너무 느리면 내용은 쓰되 실패로 누적해서 계속 느리면 건너뜀"""
+    if elapsed > FEED_SLOW_THRESHOLD:
+        print(f"   🐢 {site_name}: 응답 지연 ({elapsed:.1f}초)")
+        _record_failure(circuit, f"응답 지연 ({elapsed:.1f}초)", elapsed)
+    else:
+        _record_success(circuit, elapsed)
+
+def print_skipped_feeds(skipped):
+    """건너뛴 피드와 사유 출력 (실행 요약용)"""
+    if not skipped:
+        return
+
+    print(f"\n⏭️ 건너뛴 피드: {len(skipped)}개")
+    for site_name, reason in skipped:
+        print(f"   {site_name}: {reason}")
@@ -0,0 +1,198 @@
+import hashlib
+import os
+import re
+import sqlite3
+import xml.etree.ElementTree as ET
+from bisect import bisect_right
+from functools import lru_cache
+
+from config import (
+    FEED_REGISTRY_PATH, SHARD_VIRTUAL_NODES,
+    NEWS_RSS_FEEDS, EARNINGS_RSS_FEEDS
+)
+
+# 봇이 사용하는 카테고리
+AI = 'AI'
+QUANTUM = 'Quantum'
+EARNINGS = 'Earnings'
+NEWS_CATEGORIES = (AI, QUANTUM)
+
+# OPML 폴더/카테고리 이름 → 봇 카테고리
+_CATEGORY_HINTS = [
+    (re.compile(r'\bquantum', re.IGNORECASE), QUANTUM),
+    (re.compile(r'\bearnings?\b|\bfinanc', re.IGNORECASE), EARNINGS),
+    (re.compile(r'\bai\b|artificial intelligence|machine learning', re.IGNORECASE), AI),
+]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS feeds (
+    url TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    enabled INTEGER NOT NULL DEFAULT 1
+);
+CREATE TABLE IF NOT EXISTS feed_categories (
+    url TEXT NOT NULL REFERENCES feeds(url) ON DELETE CASCADE,
+    category TEXT NOT NULL,
+    PRIMARY KEY (url, category)
+);
+CREATE INDEX IF NOT EXISTS feed_categories_by_category ON feed_categories(category);
+"""
+
+
+def open_registry(path=None):
+    """피드 레지스트리(SQLite) 열기 - config.py의 기본 피드 중 처음 보는 것은 자동 등록
+
+    삭제한 피드는 enabled = 0으로 남아 있어 기본 피드라도 다시 등록되지 않음
+    """
+    path = path or FEED_REGISTRY_PATH
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.executescript(_SCHEMA)
+
+    # 기본 피드 동기화 (이미 있거나 삭제된 피드는 그대로 둠)
+    for name, url in NEWS_RSS_FEEDS.items():
+        add_feed(conn, name, url, NEWS_CATEGORIES, replace=False)
+    for name, url in EARNINGS_RSS_FEEDS.items():
+        add_feed(conn, name, url, [EARNINGS], replace=False)
+    conn.commit()
+    return conn
+
+def add_feed(conn, name, url, categories, replace=True):
+    """피드 추가 (replace=False면 기존/삭제된 피드의 이름/카테고리를 바꾸지 않음)
+
+    replace=True면 삭제된 피드도 다시 켜고 카테고리를 주어진 것으로 교체
+    """
+    exists = conn.execute("SELECT 1 FROM feeds WHERE url = ?", (url,)).fetchone()
+    if exists and not replace:
+        return False
+
+    conn.execute(
+        "INSERT INTO feeds (url, name) VALUES (?, ?) "
+        "ON CONFLICT(url) DO UPDATE SET name = excluded.name, enabled = 1",
+        (url, name)
+    )
+    conn.execute("DELETE FROM feed_categories WHERE url = ?", (url,))
+    conn.executemany(
+        "INSERT OR IGNORE INTO feed_categories (url, category) VALUES (?, ?)",
+        [(url, category) for category in categories]
+    )
+    return True
+
+def remove_feed(conn, url):
+    """피드 삭제 (기본 피드가 다시 등록되지 않도록 행은 남기고 enabled = 0)"""
+    removed = conn.execute("UPDATE feeds SET enabled = 0 WHERE url = ? AND enabled = 1", (url,)).rowcount
+    conn.commit()
+    return removed > 0
+
+def list_feeds(conn, categories=None, shard=None):
+    """피드 목록 [(이름, URL, 카테고리 튜플)] - 카테고리/샤드로 거를 수 있음
+
+    shard: (샤드 번호, 전체 샤드 수)
+    """
+    rows = conn.execute(
+        "SELECT f.name, f.url, group_concat(c.category) FROM feeds f "
+        "LEFT JOIN feed_categories c ON c.url = f.url "
+        "WHERE f.enabled = 1 GROUP BY f.url ORDER BY f.rowid"
+    ).fetchall()
+
+    feeds = []
+    for name, url, category_text in rows:
+        feed_categories = tuple(sorted(category_text.split(','))) if category_text else ()
+        if categories and not set(feed_categories) & set(categories):
+            continue
+        if shard and shard_for(url, shard[1]) != shard[0]:
+            continue
+        feeds.append((name, url, feed_categories))
+    return feeds
+
+def load_feeds(categories, shard=None):
+    """레지스트리를 열어 카테고리에 해당하는 피드 목록 불러오기"""
+    conn = open_registry()
+    try:
+        return list_feeds(conn, categories, shard)
+    finally:
+        conn.close()
+
+def _hash(key):
+    return int.from_bytes(hashlib.md5(key.encode('utf-8')).digest()[:8], 'big')
+
+@lru_cache(maxsize=8)
+def _ring(shard_count):
+    """샤드마다 가상 노드를 여러 개 둔 해시 링 (정렬된 위치, 해당 샤드)"""
+    points = sorted(
+        (_hash(f"shard-{shard}#{vnode}"), shard)
+        for shard in range(shard_count)
+        for vnode in range(SHARD_VIRTUAL_NODES)
+    )
+    return [position for position, _shard in points], [shard for _position, shard in points]
+
+def shard_for(url, shard_count):
+    """일관된 해싱으로 피드를 담당할 샤드 번호 결정
+
+    샤드를 N개에서 N+1개로 늘려도 새 샤드로 옮겨가는 피드는 약 1/(N+1)뿐
+    """
+    if shard_count <= 1:
+        return 0
+    positions, shards = _ring(shard_count)
+    return shards[bisect_right(positions, _hash(url)) % len(positions)]
+
+def _categories_from_label(label):
+    return [category for pattern, category in _CATEGORY_HINTS if pattern.search(label or '')]
+
+def import_opml(conn, path, default_categories=()):
+    """OPML 파일의 피드를 레지스트리에 추가 - (추가 수, 건너뜀 수)
+
+    카테고리는 outline의 category 속성이나 상위 폴더 이름에서 추론
+    """
+    root = ET.parse(path).getroot()
+    body = root.find('body')
+    added = skipped = 0
+
+    def walk(element, inherited):
+        nonlocal added, skipped
+        for outline in element.findall('outline'):
+            label = outline.get('text') or outline.get('title') or ''
+            url = outline.get('xmlUrl')
+
+            if not url:
+                # 폴더: 이름에서 추론한 카테고리를 하위 피드에 물려줌
+                walk(outline, inherited + _categories_from_label(label))
+                continue
+
+            categories = set(inherited)
+            for tag in (outline.get('category') or '').replace('/', ',').split(','):
+                categories.update(_categories_from_label(tag))
+            categories = categories or set(default_categories)
+
+            if not categories:
+                skipped += 1
+                continue
+            add_feed(conn, label or url, url, sorted(categories))
+            added += 1
+
+    walk(body if body is not None else root, [])
+    conn.commit()
+    return added, skipped
+
+def export_opml(conn, path):
+    """레지스트리를 OPML 파일로 내보내기 (첫 번째 카테고리별 폴더)"""
+    opml = ET.Element('opml', version='2.0')
+    head = ET.SubElement(opml, 'head')
+    ET.SubElement(head, 'title').text = 'Telegram News Bot feeds'
+    body = ET.SubElement(opml, 'body')
+
+    folders = {}
+    feeds = list_feeds(conn)
+    for name, url, categories in feeds:
+        folder_name = categories[0] if categories else 'Uncategorized'
+        if folder_name not in folders:
+            folders[folder_name] = ET.SubElement(body, 'outline', text=folder_name, title=folder_name)
+        ET.SubElement(folders[folder_name], 'outline', type='rss', text=name, title=name,
+                      xmlUrl=url, category=','.join(categories))
+
+    ET.indent(opml)
+    ET.ElementTree(opml).write(path, encoding='utf-8', xml_declaration=True)
+    return len(feeds)
@@ -0,0 +1,134 @@
+import json
+import sys
+from dataclasses import dataclass
+
+# 키워드 문자열은 전역 테이블에 한 번만 저장하고, 아이템에는 작은 정수 ID만 보관
+_KEYWORD_TABLE = []
+_KEYWORD_IDS = {}
+
+
+def keyword_id(keyword):
+    """키워드 문자열 → 정수 ID (처음 보는 키워드는 테이블에 등록)"""
+    kid = _KEYWORD_IDS.get(keyword)
+    if kid is None:
+        kid = len(_KEYWORD_TABLE)
+        _KEYWORD_TABLE.append(sys.intern(keyword))
+        _KEYWORD_IDS[keyword] = kid
+    return kid
+
+def keyword_ids(keywords):
+    """키워드 목록 → 정수 ID 튜플 (순서 유지)"""
+    return tuple(keyword_id(kw) for kw in keywords)
+
+def keyword_names(ids):
+    """정수 ID 튜플 → 키워드 문자열 목록"""
+    return [_KEYWORD_TABLE[kid] for kid in ids]
+
+
+@dataclass(slots=True)
+class NewsItem:
+    """필터링된 뉴스 한 건 (원본 HTML 요약은 보관하지 않음)"""
+    title: str
+    link: str
+    published: str
+    enhanced_summary: str
+    keyword_ids: tuple
+    category: str
+    source: str = ''
+
+    def __post_init__(self):
+        # 반복되는 출처/카테고리 문자열은 하나의 객체를 공유
+        self.category = sys.intern(self.category)
+        self.source = sys.intern(self.source)
+
+    @property
+    def matched_keywords(self):
+        return keyword_names(self.keyword_ids)
+
+    @property
+    def importance_score(self):
+        return len(self.keyword_ids)
+
+
+@dataclass(slots=True)
+class EarningsItem:
+    """필터링된 실적 뉴스 한 건 (요약은 정리된 첫 문장만 보관)"""
+    title: str
+    link: str
+    published: str
+    summary: str
+    companies: tuple
+    keyword_ids: tuple
+    metrics: tuple  # (항목, 값) 쌍
+    source: str = ''
+
+    def __post_init__(self):
+        self.companies = tuple(sys.intern(c) for c in self.companies)
+        self.source = sys.intern(self.source)
+
+    @property
+    def keywords(self):
+        return keyword_names(self.keyword_ids)
+
+    @property
+    def importance_score(self):
+        return len(self.companies) + len(self.keyword_ids)
+
+
+def item_to_dict(item):
+    """아이템 → JSON 저장용 dict (키워드는 ID가 아닌 문자열로 저장)"""
+    if isinstance(item, NewsItem):
+        return {
+            'kind': 'news',
+            'title': item.title,
+            'link': item.link,
+            'published': item.published,
+            'enhanced_summary': item.enhanced_summary,
+            'matched_keywords': item.matched_keywords,
+            'category': item.category,
+            'source': item.source
+        }
+    return {
+        'kind': 'earnings',
+        'title': item.title,
+        'link': item.link,
+        'published': item.published,
+        'summary': item.summary,
+        'companies': list(item.companies),
+        'keywords': item.keywords,
+        'metrics': [list(pair) for pair in item.metrics],
+        'source': item.source
+    }
+
+def item_from_dict(data):
+    """JSON dict → 아이템"""
+    if data['kind'] == 'news':
+        return NewsItem(
+            title=data['title'],
+            link=data['link'],
+            published=data['published'],
+            enhanced_summary=data['enhanced_summary'],
+            keyword_ids=keyword_ids(data['matched_keywords']),
+            category=data['category'],
+            source=data['source']
+        )
+    return EarningsItem(
+        title=data['title'],
+        link=data['link'],
+        published=data['published'],
+        summary=data['summary'],
+        companies=tuple(data['companies']),
+        keyword_ids=keyword_ids(data['keywords']),
+        metrics=tuple(tuple(pair) for pair in data['metrics']),
+        source=data['source']
+    )
+
+def save_items(path, items):
+    """수집된 아이템을 JSON 파일로 저장 (render-only 등에서 재사용)"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump([item_to_dict(item) for item in items], f, ensure_ascii=False)
+
+def load_items(path):
+    """JSON 파일에서 아이템 불러오기"""
+    with open(path, encoding='utf-8') as f:
+        return [item_from_dict(data) for data in json.load(f)]
@@ -1,91 +1,13 @@
-import requests
-import feedparser
-import json
 import re
 import time
 from datetime import datetime
 from config import (
-    NEWS_RSS_FEEDS as RSS_FEEDS,
     NEWS_AI_KEYWORDS as AI_KEYWORDS,
     NEWS_QUANTUM_KEYWORDS as QUANTUM_KEYWORDS,
-    send_telegram_message
+    ENRICH_ARTICLES,
+    print_message
 )
-
-def check_keywords_in_text(text, keywords):
-    """개선된 키워드 매칭 - 단어 경계 고려"""
-    if not text:
-        return False
-    
-    text_lower = text.lower()
-    
-    for keyword in keywords:
-        keyword_lower = keyword.lower()
-        
-        # 단일 단어인 경우 단어 경계 체크
-        if ' ' not in keyword_lower:
-            # 단어 경계에서만 매칭 (예: "AI"가 "said"에 매칭되지 않도록)
-            pattern = r'\b' + re.escape(keyword_lower) + r'\b'
-            if re.search(pattern, text_lower):
-                return True
-        else:
-            # 구문의 경우 그대로 체크
-            if keyword_lower in text_lower:
-                return True
-    
-    return False
-
-def filter_news_by_keywords(entries, keywords, category_name):
-    """향상된 키워드 필터링 - 품질 개선"""
-    filtered_news = []
-    
-    for entry in entries:
-        title = entry.title if hasattr(entry, 'title') else ""
-        summary = entry.summary if hasattr(entry, 'summary') else ""
-        full_text = f"{title} {summary}"
-        
-        # 개선된 키워드 매칭
-        if not check_keywords_in_text(full_text, keywords):
-            continue
-            
-        # 매칭된 키워드들 수집
-        matched_keywords = []
-        full_text_lower = full_text.lower()
-        
-        for keyword in keywords:
-            keyword_lower = keyword.lower()
-            
-            if ' ' not in keyword_lower:
-                # 단어 경계 체크
-                pattern = r'\b' + re.escape(keyword_lower) + r'\b'
-                if re.search(pattern, full_text_lower):
-                    matched_keywords.append(keyword)
-            else:
-                # 구문 체크
-                if keyword_lower in full_text_lower:
-                    matched_keywords.append(keyword)
-        
-        if matched_keywords:
-            # 향상된 요약 생성
-            enhanced_summary = clean_and_enhance_summary(
-                {'title': title, 'summary': summary}, 
-                matched_keywords
-            )
-            
-            filtered_news.append({
-                'title': title,
-                'link': entry.link if hasattr(entry, 'link') else "",
-                'published': entry.published if hasattr(entry, 'published') else 'Unknown',
-                'summary': summary,
-                'enhanced_summary': enhanced_summary,
-                'matched_keywords': matched_keywords,
-                'category': category_name,
-                'source': '',
-                'importance_score': len(matched_keywords)
-            })
-    
-    # 중요도 순으로 정렬
-    filtered_news.sort(key=lambda x: x['importance_score'], reverse=True)
-    return filtered_news
+from items import NewsItem, keyword_ids, save_items
 
 def extract_key_sentences(text, keywords):
     """키워드가 포함된 문장 우선 추출"""
@@ -153,42 +75,45 @@ def clean_and_enhance_summary(news_item, relevant_keywords):
     # 요약이 없거나 짧으면 키워드 기반 설명
     return f"{', '.join(relevant_keywords[:2])} 관련 뉴스입니다."
 
-def filter_news_by_keywords(entries, keywords, category_name):
+def match_news_entry(title, summary, keywords):
+    """엔트리 하나의 키워드 매칭 + 향상된 요약 (매칭 없으면 None)"""
+    full_text_lower = f"{title} {summary}".lower()
+    
+    # 키워드 매칭 확인
+    matched_keywords = [kw for kw in keywords if kw.lower() in full_text_lower]
+    if not matched_keywords:
+        return None
+    
+    # 향상된 요약 생성 (원본 HTML 요약은 여기서만 사용하고 버림)
+    enhanced_summary = clean_and_enhance_summary(
+        {'title': title, 'summary': summary}, 
+        matched_keywords
+    )
+    return matched_keywords, enhanced_summary
+
+def filter_news_by_keywords(entries, keywords, category_name, source=''):
     """키워드로 뉴스 필터링 (향상된 버전)"""
     filtered_news = []
     
     for entry in entries:
         title = entry.title if hasattr(entry, 'title') else ""
         summary = entry.summary if hasattr(entry, 'summary') else ""
-        full_text = f"{title} {summary}"
         
-        # 키워드 매칭 확인
-        matched_keywords = []
-        for keyword in keywords:
-            if keyword.lower() in full_text.lower():
-                matched_keywords.append(keyword)
-        
-        if matched_keywords:
-            # 향상된 요약 생성
-            enhanced_summary = clean_and_enhance_summary(
-                {'title': title, 'summary': summary}, 
-                matched_keywords
-            )
-            
-            filtered_news.append({
-                'title': title,
-                'link': entry.link if hasattr(entry, 'link') else "",
-                'published': entry.published if hasattr(entry, 'published') else 'Unknown',
-                'summary': summary,
-                'enhanced_summary': enhanced_summary,  # 새로운 필드
-                'matched_keywords': matched_keywords,
-                'category': category_name,
-                'source': '',
-                'importance_score': len(matched_keywords)  # 키워드 개수로 중요도 점수
-            })
+        match = match_news_entry(title, summary, keywords)
+        if match:
+            matched_keywords, enhanced_summary = match
+            filtered_news.append(NewsItem(
+                title=title,
+                link=entry.link if hasattr(entry, 'link') else "",
+                published=entry.published if hasattr(entry, 'published') else 'Unknown',
+                enhanced_summary=enhanced_summary,
+                keyword_ids=keyword_ids(matched_keywords),
+                category=category_name,
+                source=source
+            ))
     
     # 중요도 순으로 정렬 (키워드가 많이 매칭된 뉴스 우선)
-    filtered_news.sort(key=lambda x: x['importance_score'], reverse=True)
+    filtered_news.sort(key=lambda x: x.importance_score, reverse=True)
     return filtered_news
 
 def smart_truncate(text, length):
@@ -212,67 +137,101 @@ def smart_truncate(text, length):
     else:
         return truncated + "..."
 
-def collect_filtered_news():
-    """모든 사이트에서 뉴스 수집 및 필터링 (멀티소스 버전)"""
+def collect_filtered_news(workers=None, feeds=None):
+    """모든 사이트에서 뉴스 수집 및 필터링 (멀티소스 버전)
+    
+    feeds: [(이름, URL, 카테고리)] - 없으면 레지스트리의 AI/양자 피드 전체
+    """
+    # 수집에만 필요한 모듈 (렌더링만 하는 서브커맨드의 시작 시간에 포함되지 않도록 여기서 import)
+    from feed_fetcher import fetch_feed, load_circuits, save_circuits, print_skipped_feeds, UnchangedFeed
+    from snapshot_store import open_snapshot_store, save_results, prune_snapshots
+    from parallel_filter import filter_news_feeds
+    from feed_registry import load_feeds, NEWS_CATEGORIES
+
+    if feeds is None:
+        feeds = load_feeds(NEWS_CATEGORIES)
+    
     all_filtered_news = []
+    circuits = load_circuits()
+    skipped_feeds = []
+    snapshots = open_snapshot_store()
+    collected = []  # 피드 순서대로 (이름, URL, 카테고리, 내용 해시, 재사용 결과, 새 엔트리)
     
     print("🔍 멀티소스 뉴스 수집 시작...")
     print("="*60)
     
-    for site_name, feed_url in RSS_FEEDS.items():
-        print(f"\n📰 {site_name} 분석 중...")
+    # 1단계: 피드 가져오기
+    for site_name, feed_url, categories in feeds:
+        print(f"\n📰 {site_name} 가져오는 중...")
         try:
-            # RSS 피드 파싱
-            feed = feedparser.parse(feed_url)
+            # RSS 피드 가져오기 (타임아웃 + 서킷 브레이커)
+            feed = fetch_feed(site_name, feed_url, circuits, skipped_feeds, snapshots, 'news')
+            if feed is None:
+                print(f"   ⏭️ {site_name}: {skipped_feeds[-1][1]}")
+                continue
+            
+            # 내용이 지난번과 같으면 파싱/필터링 없이 저장된 결과 사용
+            if isinstance(feed, UnchangedFeed):
+                print(f"   ♻️ 내용 변경 없음 (이전 결과 {len(feed.results)}개 재사용)")
+                collected.append((site_name, feed_url, categories, feed.content_hash, feed.results, None))
+                continue
             
             if not hasattr(feed, 'entries') or not feed.entries:
                 print(f"   ❌ {site_name}: 뉴스가 없습니다.")
                 continue
             
             print(f"   📊 전체 뉴스: {len(feed.entries)}개")
-            
-            # AI 키워드로 필터링
-            ai_news = filter_news_by_keywords(feed.entries, AI_KEYWORDS, "AI")
-            for news in ai_news:
-                news['source'] = site_name
-            
-            # 양자 키워드로 필터링  
-            quantum_news = filter_news_by_keywords(feed.entries, QUANTUM_KEYWORDS, "Quantum")
-            for news in quantum_news:
-                news['source'] = site_name
-            
-            print(f"   🤖 AI 관련: {len(ai_news)}개")
-            print(f"   ⚛️ 양자 관련: {len(quantum_news)}개")
-            
-            # 양자 전문 사이트는 특별히 표시
-            if 'quantum' in site_name.lower() or 'physics' in site_name.lower():
-                if quantum_news:
-                    print(f"   🎯 양자 전문 사이트 매칭: {len(quantum_news)}개")
-                    for news in quantum_news[:2]:
-                        keywords = news.get('matched_keywords', [])
-                        print(f"      ⚛️ {news['title'][:40]}... → {keywords[:2]}")
-            
-            # 매칭된 키워드 상세 정보 (간략화)
-            if ai_news and len(ai_news) <= 3:
-                for news in ai_news[:1]:
-                    keywords = news.get('matched_keywords', [])
-                    print(f"   🎯 AI: {news['title'][:40]}... → {keywords[:2]}")
-            
-            # 매칭 안 된 경우 (양자 전문 사이트만)
-            if (len(ai_news) == 0 and len(quantum_news) == 0 and 
-                ('quantum' in site_name.lower() or 'physics' in site_name.lower())):
-                print(f"   ❌ 양자 전문 사이트 매칭 실패. 최근 제목:")
-                for i, entry in enumerate(feed.entries[:2], 1):
-                    title = entry.title if hasattr(entry, 'title') else "제목 없음"
-                    print(f"      {i}. {title[:50]}...")
-            
-            all_filtered_news.extend(ai_news)
-            all_filtered_news.extend(quantum_news)
+            collected.append((site_name, feed_url, categories, feed.content_hash, None, feed.entries))
             
         except Exception as e:
             print(f"   💥 {site_name} 오류: {e}")
             continue
     
+    # 2단계: AI/양자 키워드로 필터링 (엔트리가 많으면 프로세스 풀에서 병렬 처리)
+    categories = [("AI", AI_KEYWORDS), ("Quantum", QUANTUM_KEYWORDS)]
+    fresh_feeds = [(site_name, entries) for site_name, _url, _cats, _hash, cached, entries in collected if cached is None]
+    filtered_by_feed = iter(filter_news_feeds(fresh_feeds, categories, workers))
+    
+    for site_name, feed_url, feed_categories, content_hash, cached, entries in collected:
+        if cached is None:
+            filtered = next(filtered_by_feed)
+            save_results(snapshots, feed_url, 'news', content_hash, filtered["AI"] + filtered["Quantum"])
+        else:
+            filtered = {category: [n for n in cached if n.category == category] for category, _keywords in categories}
+        
+        # 레지스트리에서 해당 카테고리로 등록된 피드만 반영
+        ai_news = filtered["AI"] if "AI" in feed_categories else []
+        quantum_news = filtered["Quantum"] if "Quantum" in feed_categories else []
+        
+        print(f"\n📰 {site_name} 분석 결과")
+        print(f"   🤖 AI 관련: {len(ai_news)}개")
+        print(f"   ⚛️ 양자 관련: {len(quantum_news)}개")
+        
+        # 양자 전문 사이트는 특별히 표시
+        if 'quantum' in site_name.lower() or 'physics' in site_name.lower():
+            if quantum_news:
+                print(f"   🎯 양자 전문 사이트 매칭: {len(quantum_news)}개")
+                for news in quantum_news[:2]:
+                    keywords = news.matched_keywords
+                    print(f"      ⚛️ {news.title[:40]}... → {keywords[:2]}")
+        
+        # 매칭된 키워드 상세 정보 (간략화)
+        if ai_news and len(ai_news) <= 3:
+            for news in ai_news[:1]:
+                keywords = news.matched_keywords
+                print(f"   🎯 AI: {news.title[:40]}... → {keywords[:2]}")
+        
+        # 매칭 안 된 경우 (양자 전문 사이트만)
+        if (len(ai_news) == 0 and len(quantum_news) == 0 and 
+            ('quantum' in site_name.lower() or 'physics' in site_name.lower())):
+            print(f"   ❌ 양자 전문 사이트 매칭 실패. 최근 제목:")
+            for i, entry in enumerate((entries or [])[:2], 1):
+                title = entry.title if hasattr(entry, 'title') else "제목 없음"
+                print(f"      {i}. {title[:50]}...")
+        
+        all_filtered_news.extend(ai_news)
+        all_filtered_news.extend(quantum_news)
+    
     print("\n" + "="*60)
     print(f"🎯 총 수집 결과: {len(all_filtered_news)}개 뉴스")
     
@@ -282,8 +241,8 @@ def collect_filtered_news():
     quantum_stats = {}
     
     for news in all_filtered_news:
-        source = news.get('source', 'Unknown')
-        category = news.get('category', 'Unknown')
+        source = news.source or 'Unknown'
+        category = news.category
         
         site_stats[source] = site_stats.get(source, 0) + 1
         
@@ -307,6 +266,11 @@ def collect_filtered_news():
             total = site_stats.get(site, 0)
             print(f"   {site}: 양자 {q_count}개 / 전체 {total}개")
     
+    save_circuits(circuits)
+    print_skipped_feeds(skipped_feeds)
+    prune_snapshots(snapshots)
+    snapshots.close()
+    
     return all_filtered_news
 
 def balance_news_by_source_advanced(news_list, max_count, max_per_source=2):
@@ -317,14 +281,14 @@ def balance_news_by_source_advanced(news_list, max_count, max_per_source=2):
     # 사이트별로 뉴스 그룹핑
     news_by_source = {}
     for news in news_list:
-        source = news['source']
+        source = news.source
         if source not in news_by_source:
             news_by_source[source] = []
         news_by_source[source].append(news)
     
     # 각 사이트의 뉴스를 중요도순으로 정렬
     for source in news_by_source:
-        news_by_source[source].sort(key=lambda x: x['importance_score'], reverse=True)
+        news_by_source[source].sort(key=lambda x: x.importance_score, reverse=True)
     
     balanced = []
     source_count = {source: 0 for source in news_by_source}
@@ -356,164 +320,239 @@ def balance_news_by_source_advanced(news_list, max_count, max_per_source=2):
     
     return balanced
 
-def create_ai_news_summary(ai_news):
-    """AI 뉴스 전용 메시지 생성"""
+# 다이제스트 한 통에 싣는 뉴스 수 (사이트별 최대 2개)
+DIGEST_SIZES = {'AI': 12, 'Quantum': 6}
+FOLLOWUP_SIZE = 6
+
+def select_digest_news(news_list, category, followup=False):
+    """다이제스트(또는 후속 메시지)에 실제로 실리는 뉴스"""
+    max_count = FOLLOWUP_SIZE if followup else DIGEST_SIZES[category]
+    return balance_news_by_source_advanced(news_list, max_count=max_count, max_per_source=2)
+
+def format_news_entry(i, news):
+    """다이제스트의 뉴스 한 건 (제목, 출처/키워드, 요약, 링크)"""
+    # 제목 전체 표시 (자르지 않음)
+    entry = f"<b>{i}. {news.title}</b>\n"
+    entry += f"   📰 {news.source}"
+    
+    # 매칭된 키워드 표시
+    if news.keyword_ids:
+        keywords = news.matched_keywords[:3]
+        entry += f" | 🏷️ {', '.join(keywords)}"
+    
+    entry += f"\n"
+    
+    # 향상된 요약(첫 문장) 표시
+    enhanced_summary = news.enhanced_summary
+    if enhanced_summary and len(enhanced_summary) > 10:
+        entry += f"   💡 {enhanced_summary}\n"
+    
+    entry += f"   🔗 <a href='{news.link}'>기사 보기</a>\n\n"
+    return entry
+
+def enrich_shown_news(news_show, timeout=None):
+    """다이제스트에 실릴 뉴스 중 요약이 빈약한 것을 기사 페이지 첫 문단으로 보강 (timeout: 최대 대기 초)"""
+    from article_enricher import enrich_news
+    try:
+        enrich_news(news_show, timeout)
+    except Exception as e:
+        print(f"⚠️ 기사 보강 실패 (피드 요약 사용): {e}")
+
+def create_ai_news_summary(ai_news, as_of=None, enrich=False):
+    """AI 뉴스 전용 메시지 생성 (as_of: 헤더에 표시할 시각, 기본은 현재 / enrich: 기사 페이지로 요약 보강)"""
     if not ai_news:
         return None
     
-    ai_show = balance_news_by_source_advanced(ai_news, max_count=12, max_per_source=2)
+    ai_show = select_digest_news(ai_news, 'AI')
+    if enrich:
+        enrich_shown_news(ai_show)
     
-    current_time = datetime.now().strftime('%m/%d %H:%M')
+    current_time = (as_of or datetime.now()).strftime('%m/%d %H:%M')
     message = f"🤖 <b>AI 뉴스 요약</b> ({current_time})\n"
     message += f"📊 총 {len(ai_news)}개 중 {len(ai_show)}개 선별 (사이트별 균형)\n\n"
     
     # 사이트별 통계
     ai_sources = {}
     for news in ai_show:
-        source = news['source']
+        source = news.source
         ai_sources[source] = ai_sources.get(source, 0) + 1
     
     source_info = ", ".join([f"{source} {count}개" for source, count in ai_sources.items()])
     message += f"📰 출처: {source_info}\n\n"
     
     for i, news in enumerate(ai_show, 1):
-        # 제목 전체 표시 (자르지 않음)
-        title = news['title']
-        
-        message += f"<b>{i}. {title}</b>\n"
-        message += f"   📰 {news['source']}"
-        
-        # 매칭된 키워드 표시
-        if news.get('matched_keywords'):
-            keywords = news['matched_keywords'][:3]
-            message += f" | 🏷️ {', '.join(keywords)}"
-        
-        message += f"\n"
-        
-        # 향상된 요약(첫 문장) 표시
-        enhanced_summary = news.get('enhanced_summary', '')
-        if enhanced_summary and len(enhanced_summary) > 10:
-            message += f"   💡 {enhanced_summary}\n"
-        
-        message += f"   🔗 <a href='{news['link']}'>기사 보기</a>\n\n"
+        message += format_news_entry(i, news)
     
     message += f"🔄 다음 업데이트: 12시간 후 | 🤖 AI뉴스봇 v3.2"
     
     return message
 
-def create_quantum_news_summary(quantum_news):
-    """양자 뉴스 전용 메시지 생성"""
+def create_quantum_news_summary(quantum_news, as_of=None, enrich=False):
+    """양자 뉴스 전용 메시지 생성 (as_of: 헤더에 표시할 시각, 기본은 현재 / enrich: 기사 페이지로 요약 보강)"""
     if not quantum_news:
         return None
     
-    quantum_show = balance_news_by_source_advanced(quantum_news, max_count=6, max_per_source=2)
+    quantum_show = select_digest_news(quantum_news, 'Quantum')
+    if enrich:
+        enrich_shown_news(quantum_show)
     
-    current_time = datetime.now().strftime('%m/%d %H:%M')
+    current_time = (as_of or datetime.now()).strftime('%m/%d %H:%M')
     message = f"⚛️ <b>양자 뉴스 요약</b> ({current_time})\n"
     message += f"📊 총 {len(quantum_news)}개 중 {len(quantum_show)}개 선별 (사이트별 균형)\n\n"
     
     # 사이트별 통계
     quantum_sources = {}
     for news in quantum_show:
-        source = news['source']
+        source = news.source
         quantum_sources[source] = quantum_sources.get(source, 0) + 1
     
     source_info = ", ".join([f"{source} {count}개" for source, count in quantum_sources.items()])
     message += f"📰 출처: {source_info}\n\n"
     
     for i, news in enumerate(quantum_show, 1):
-        # 제목 전체 표시 (자르지 않음)
-        title = news['title']
-        
-        message += f"<b>{i}. {title}</b>\n"
-        message += f"   📰 {news['source']}"
-        
-        # 매칭된 키워드 표시
-        if news.get('matched_keywords'):
-            keywords = news['matched_keywords'][:3]
-            message += f" | 🏷️ {', '.join(keywords)}"
-        
-        message += f"\n"
-        
-        # 향상된 요약(첫 문장) 표시
-        enhanced_summary = news.get('enhanced_summary', '')
-        if enhanced_summary and len(enhanced_summary) > 10:
-            message += f"   💡 {enhanced_summary}\n"
-        
-        message += f"   🔗 <a href='{news['link']}'>기사 보기</a>\n\n"
+        message += format_news_entry(i, news)
     
     message += f"🔄 다음 업데이트: 12시간 후 | ⚛️ 양자뉴스봇 v3.2"
     
     return message
 
-def create_news_summary(news_list, max_news=18):
+def create_followup_summary(news_list, category, late_sources, as_of=None, enrich=False):
+    """다이제스트를 보낸 뒤 늦게 응답한 출처의 뉴스로 후속 메시지 생성"""
+    if not news_list:
+        return None
+    
+    icon, label, bot_name = ('⚛️', '양자', '양자뉴스봇') if category == 'Quantum' else ('🤖', 'AI', 'AI뉴스봇')
+    news_show = select_digest_news(news_list, category, followup=True)
+    if enrich:
+        enrich_shown_news(news_show)
+    
+    current_time = (as_of or datetime.now()).strftime('%m/%d %H:%M')
+    message = f"{icon} <b>{label} 뉴스 추가</b> ({current_time})\n"
+    message += f"⏰ 늦게 응답한 출처: {', '.join(late_sources)}\n"
+    message += f"📊 총 {len(news_list)}개 중 {len(news_show)}개 선별\n\n"
+    
+    for i, news in enumerate(news_show, 1):
+        message += format_news_entry(i, news)
+    
+    message += f"🔄 앞선 다이제스트의 후속 | {icon} {bot_name} v3.2"
+    
+    return message
+
+def create_news_summary(news_list, max_news=18, as_of=None, enrich=False):
     """뉴스 요약 메시지 생성 - 두 개 메시지 방식"""
     if not news_list:
         return "📰 오늘은 AI/양자 관련 뉴스가 없습니다.", None
     
     # 카테고리별로 분류
-    ai_news = [n for n in news_list if n['category'] == 'AI']
-    quantum_news = [n for n in news_list if n['category'] == 'Quantum']
+    ai_news = [n for n in news_list if n.category == 'AI']
+    quantum_news = [n for n in news_list if n.category == 'Quantum']
     
     # 각각 별도 메시지 생성
-    ai_message = create_ai_news_summary(ai_news)
-    quantum_message = create_quantum_news_summary(quantum_news)
+    ai_message = create_ai_news_summary(ai_news, as_of, enrich)
+    quantum_message = create_quantum_news_summary(quantum_news, as_of, enrich)
     
     return ai_message, quantum_message
 
-def main():
-    """메인 실행 함수 - 두 개 메시지 전송"""
+def send_news_digest(news_list, send, dry_run=False):
+    """수집이 끝난 뉴스로 AI/양자 메시지를 만들어 순차 전송 - (성공 수, 전체 메시지 수, 전송된 메시지에 실린 뉴스)"""
+    # 카테고리별 분석
+    ai_news = [n for n in news_list if n.category == 'AI']
+    quantum_news = [n for n in news_list if n.category == 'Quantum']
+    print(f"   🤖 AI 뉴스: {len(ai_news)}개")
+    print(f"   ⚛️ 양자 뉴스: {len(quantum_news)}개")
+    
+    # 메시지 생성 (두 개 별도)
+    ai_message, quantum_message = create_news_summary(news_list, enrich=ENRICH_ARTICLES)
+    
+    # 메시지 길이 확인
+    if ai_message:
+        print(f"📝 AI 메시지 길이: {len(ai_message)}자")
+    if quantum_message:
+        print(f"📝 양자 메시지 길이: {len(quantum_message)}자")
+    
+    # 텔레그램 전송 (순차적)
+    success_count = 0
+    shown = []
+    
+    if ai_message:
+        print("📤 AI 뉴스 메시지 전송 중...")
+        if send(ai_message):
+            print("✅ AI 뉴스 전송 성공!")
+            success_count += 1
+            shown.extend(select_digest_news(ai_news, 'AI'))
+        else:
+            print("❌ AI 뉴스 전송 실패")
+    
+    # 잠깐 대기 (텔레그램 API 제한 고려)
+    if not dry_run:
+        time.sleep(2)
+    
+    if quantum_message:
+        print("📤 양자 뉴스 메시지 전송 중...")
+        if send(quantum_message):
+            print("✅ 양자 뉴스 전송 성공!")
+            success_count += 1
+            shown.extend(select_digest_news(quantum_news, 'Quantum'))
+        else:
+            print("❌ 양자 뉴스 전송 실패")
+    
+    total_messages = (1 if ai_message else 0) + (1 if quantum_message else 0)
+    return success_count, total_messages, shown
+
+def main(dry_run=False, items_path=None, workers=None, news_list=None):
+    """메인 실행 함수 - 카테고리별 메시지 전송 (dry_run이면 전송 대신 출력)
+    
+    news_list: 이미 수집된 뉴스 (샤드 결과 병합 등) - 있으면 수집 단계 생략
+    수집부터 할 때는 스트리밍 파이프라인으로 카테고리 다이제스트를 준비되는 대로 전송
+    (workers가 2 이상이면 전체 수집 후 프로세스 풀로 필터링하는 일괄 방식)
+    """
+    from outbox import deliver
+    from parallel_filter import resolve_workers
+    from feed_registry import load_feeds, NEWS_CATEGORIES
+    from alerts import exclude_alerted, mark_digested
+
+    send = print_message if dry_run else deliver
+    
     print("🚀 분할 메시지 뉴스봇 v3.2 시작!")
     print(f"⏰ 실행 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"🌐 총 {len(RSS_FEEDS)}개 사이트 모니터링")
     print(f"📱 AI 뉴스와 양자 뉴스를 별도 메시지로 전송")
     
     try:
-        # 1. 뉴스 수집
-        news_list = collect_filtered_news()
-        print(f"📊 총 수집된 뉴스: {len(news_list)}개")
-        
-        # 2. 카테고리별 분석
-        ai_count = len([n for n in news_list if n['category'] == 'AI'])
-        quantum_count = len([n for n in news_list if n['category'] == 'Quantum'])
-        print(f"   🤖 AI 뉴스: {ai_count}개")
-        print(f"   ⚛️ 양자 뉴스: {quantum_count}개")
-        
-        # 3. 메시지 생성 (두 개 별도)
-        ai_message, quantum_message = create_news_summary(news_list)
-        
-        # 4. 메시지 길이 확인
-        if ai_message:
-            print(f"📝 AI 메시지 길이: {len(ai_message)}자")
-        if quantum_message:
-            print(f"📝 양자 메시지 길이: {len(quantum_message)}자")
-        
-        # 5. 텔레그램 전송 (순차적)
-        success_count = 0
-        
-        if ai_message:
-            print("📤 AI 뉴스 메시지 전송 중...")
-            if send_telegram_message(ai_message):
-                print("✅ AI 뉴스 전송 성공!")
-                success_count += 1
-            else:
-                print("❌ AI 뉴스 전송 실패")
-        
-        # 잠깐 대기 (텔레그램 API 제한 고려)
-        time.sleep(2)
+        if news_list is None and resolve_workers(workers) <= 1:
+            # 1~5. 수집 → 필터링 → 렌더링 → 전송을 출처가 응답하는 대로 진행
+            from news_pipeline import run_pipeline
+            feeds = load_feeds(NEWS_CATEGORIES)
+            print(f"🌐 총 {len(feeds)}개 사이트 모니터링 (스트리밍)")
+            news_list, shown, success_count, total_messages = run_pipeline(feeds, send, dry_run)
+            print(f"📊 총 전송 대상 뉴스: {len(news_list)}개")
+        else:
+            # 1. 뉴스 수집
+            if news_list is None:
+                feeds = load_feeds(NEWS_CATEGORIES)
+                print(f"🌐 총 {len(feeds)}개 사이트 모니터링")
+                news_list = collect_filtered_news(workers, feeds)
+            print(f"📊 총 수집된 뉴스: {len(news_list)}개")
+            
+            # 이미 속보로 보낸 뉴스는 다이제스트에서 제외
+            pending = exclude_alerted(news_list)
+            if len(pending) < len(news_list):
+                print(f"🚨 속보로 이미 보낸 뉴스 {len(news_list) - len(pending)}개 제외")
+            news_list = pending
+            
+            # 2~5. 메시지 생성 및 전송
+            success_count, total_messages, shown = send_news_digest(news_list, send, dry_run)
         
-        if quantum_message:
-            print("📤 양자 뉴스 메시지 전송 중...")
-            if send_telegram_message(quantum_message):
-                print("✅ 양자 뉴스 전송 성공!")
-                success_count += 1
-            else:
-                print("❌ 양자 뉴스 전송 실패")
+        if items_path:
+            save_items(items_path, news_list)
+            print(f"💾 수집 결과 저장: {items_path}")
         
         # 6. 결과 요약
-        total_messages = (1 if ai_message else 0) + (1 if quantum_message else 0)
         print(f"🎯 전송 결과: {success_count}/{total_messages}개 메시지 성공")
         
+        # 다이제스트에 실제로 실린 뉴스만 (균형 배분에서 빠진 뉴스는 속보 후보로 남김)
+        if shown and not dry_run:
+            mark_digested(shown)
+        
         if success_count == 0:
             print("❌ 모든 메시지 전송 실패")
         elif success_count == total_messages:
@@ -526,7 +565,7 @@ def main():
         print(error_msg)
         
         # 오류 발생 시 관리자에게 알림
-        send_telegram_message(f"🚨 <b>뉴스봇 오류 발생</b>\n\n{error_msg}")
+        send(f"🚨 <b>뉴스봇 오류 발생</b>\n\n{error_msg}")
 
 if __name__ == "__main__":
     main()
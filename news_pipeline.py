@@ -0,0 +1,247 @@
+"""뉴스 다이제스트 스트리밍 파이프라인
+
+    수집(스레드) → 필터링 → 카테고리별 순위/렌더링 → 전송
+
+피드는 여러 스레드가 동시에 가져와 크기가 제한된 큐로 넘기고, 필터링이 밀리면
+수집 스레드가 큐 앞에서 기다립니다. 각 단계는 제너레이터라서 피드 하나가
+응답하는 대로 다음 단계로 흘러갑니다.
+
+카테고리 다이제스트는 그 카테고리의 출처가 모두 응답했거나 마감(PIPELINE_DEADLINE)이
+지나면 바로 전송하고, 마감 뒤에 응답한 출처의 뉴스는 마지막에 후속 메시지로 보냅니다.
+"""
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config import (
+    NEWS_AI_KEYWORDS, NEWS_QUANTUM_KEYWORDS, ENRICH_ARTICLES,
+    PIPELINE_FETCH_WORKERS, PIPELINE_QUEUE_SIZE, PIPELINE_DEADLINE, PIPELINE_SEND_INTERVAL
+)
+
+CATEGORIES = [("AI", NEWS_AI_KEYWORDS), ("Quantum", NEWS_QUANTUM_KEYWORDS)]
+CATEGORY_LABELS = {"AI": "🤖 AI", "Quantum": "⚛️ 양자"}
+
+
+def _fetch_one(site_name, feed_url, categories, circuits, skipped, results):
+    """수집 스레드: 피드 하나를 가져와 결과 큐에 넣음 (큐가 가득 차면 빌 때까지 대기)"""
+    from feed_fetcher import fetch_feed
+    from snapshot_store import open_snapshot_store
+
+    started = time.monotonic()
+    feed = snapshots = None
+    try:
+        snapshots = open_snapshot_store()  # SQLite 연결은 스레드마다 따로
+        feed = fetch_feed(site_name, feed_url, circuits, skipped, snapshots, 'news')
+    except Exception as e:
+        skipped.append((site_name, str(e)))
+    finally:
+        if snapshots is not None:
+            snapshots.close()
+        # 소비 쪽은 피드마다 결과 하나를 기다리므로 실패해도 반드시 넣음
+        results.put((site_name, feed_url, categories, feed, time.monotonic() - started))
+
+def fetch_stream(feeds, circuits, skipped, deadline):
+    """피드를 동시에 가져와 응답한 순서대로 (이름, URL, 카테고리, 피드, 소요 시간) 반환
+
+    실패한 피드는 피드 자리에 None. 마감 시각까지 다 오지 않으면 그 시점에 None을 한 번 끼워 넣음
+    """
+    results = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    executor = ThreadPoolExecutor(max_workers=PIPELINE_FETCH_WORKERS, thread_name_prefix='feed')
+    futures = [
+        executor.submit(_fetch_one, site_name, feed_url, categories, circuits, skipped, results)
+        for site_name, feed_url, categories in feeds
+    ]
+
+    try:
+        deadline_passed = False
+        received = 0
+        while received < len(futures):
+            remaining = deadline - time.monotonic()
+            if not deadline_passed and remaining <= 0:
+                deadline_passed = True
+                yield None
+            try:
+                item = results.get(timeout=1.0 if deadline_passed else min(remaining, 1.0))
+            except queue.Empty:
+                # 작업이 모두 끝났는데 결과가 없으면 더 기다리지 않음
+                if all(future.done() for future in futures) and results.empty():
+                    break
+                continue
+            received += 1
+            yield item
+    finally:
+        # 중간에 멈춘 경우에도 큐 앞에서 막힌 스레드가 끝날 수 있도록 비움
+        executor.shutdown(wait=False, cancel_futures=True)
+        while not all(future.done() for future in futures):
+            try:
+                results.get(timeout=0.1)
+            except queue.Empty:
+                pass
+
+def filter_stream(fetched, snapshots):
+    """응답한 피드마다 (이름, URL, 카테고리, 뉴스 목록) 반환 - 마감 알림(None)은 그대로 전달
+
+    내용이 지난번과 같은 피드는 저장된 결과 사용, 이미 속보로 보낸 뉴스는 제외
+    """
+    from feed_fetcher import UnchangedFeed
+    from news_bot import filter_news_by_keywords
+    from snapshot_store import save_results
+    from alerts import exclude_alerted
+
+    for event in fetched:
+        if event is None:
+            yield None
+            continue
+
+        site_name, feed_url, feed_categories, feed, elapsed = event
+        if feed is None:
+            print(f"   ⏭️ {site_name}: 건너뜀 ({elapsed:.1f}초)")
+            yield site_name, feed_url, feed_categories, []
+            continue
+
+        if isinstance(feed, UnchangedFeed):
+            news_list = feed.results
+        elif not getattr(feed, 'entries', None):
+            news_list = []
+        else:
+            news_list = []
+            for category, keywords in CATEGORIES:
+                news_list.extend(filter_news_by_keywords(feed.entries, keywords, category, site_name))
+            save_results(snapshots, feed_url, 'news', feed.content_hash, news_list)
+
+        # 레지스트리에서 해당 카테고리로 등록된 피드만 반영
+        news_list = exclude_alerted([news for news in news_list if news.category in feed_categories])
+        counts = ', '.join(
+            f"{CATEGORY_LABELS[category]} {sum(1 for n in news_list if n.category == category)}개"
+            for category, _keywords in CATEGORIES if category in feed_categories
+        )
+        print(f"   📰 {site_name}: {counts} ({elapsed:.1f}초"
+              f"{', 변경 없음' if isinstance(feed, UnchangedFeed) else ''})")
+        yield site_name, feed_url, feed_categories, news_list
+
+def digest_stream(filtered, feeds):
+    """카테고리별 전송 단위를 준비되는 대로 반환
+
+    ('digest', 카테고리, 뉴스, 미응답 출처) - 출처가 모두 응답했거나 마감이 지났을 때
+    ('followup', 카테고리, 뉴스, 늦게 응답한 출처) - 모든 피드가 끝난 뒤, 늦은 뉴스가 있을 때만
+    """
+    names = {feed_url: site_name for site_name, feed_url, _categories in feeds}
+    pending = {
+        category: {feed_url for _name, feed_url, categories in feeds if category in categories}
+        for category, _keywords in CATEGORIES
+    }
+    collected = {category: [] for category, _keywords in CATEGORIES}
+    late = {category: [] for category, _keywords in CATEGORIES}
+    late_sources = {category: [] for category, _keywords in CATEGORIES}
+    sent = set()
+
+    for event in filtered:
+        if event is None:
+            # 마감: 아직 보내지 않은 카테고리는 응답한 출처만으로 전송
+            for category, _keywords in CATEGORIES:
+                if category not in sent:
+                    sent.add(category)
+                    yield 'digest', category, collected[category], sorted(names[url] for url in pending[category])
+            continue
+
+        site_name, feed_url, feed_categories, news_list = event
+        for category, _keywords in CATEGORIES:
+            if category not in feed_categories:
+                continue
+            pending[category].discard(feed_url)
+            category_news = [news for news in news_list if news.category == category]
+            if category in sent:
+                if category_news:
+                    late[category].extend(category_news)
+                    late_sources[category].append(site_name)
+            else:
+                collected[category].extend(category_news)
+
+        for category, _keywords in CATEGORIES:
+            if category not in sent and not pending[category]:
+                sent.add(category)
+                yield 'digest', category, collected[category], []
+
+    for category, _keywords in CATEGORIES:
+        if category not in sent:
+            yield 'digest', category, collected[category], []
+        if late[category]:
+            yield 'followup', category, late[category], late_sources[category]
+
+def render(kind, category, news_list, sources):
+    """전송 단위 → 메시지 (보낼 내용이 없으면 None)"""
+    from news_bot import create_ai_news_summary, create_quantum_news_summary, create_followup_summary
+
+    if kind == 'followup':
+        return create_followup_summary(news_list, category, sources)
+    if category == 'AI':
+        return create_ai_news_summary(news_list)
+    return create_quantum_news_summary(news_list)
+
+def run_pipeline(feeds, send, dry_run=False):
+    """수집부터 전송까지 스트리밍 실행 - (전송 대상 뉴스, 전송된 메시지에 실린 뉴스, 성공 메시지 수, 전체 메시지 수)"""
+    from feed_fetcher import load_circuits, save_circuits, print_skipped_feeds
+    from snapshot_store import open_snapshot_store, prune_snapshots
+    from news_bot import select_digest_news, create_news_summary, enrich_shown_news
+
+    started = time.monotonic()
+    circuits = load_circuits()
+    skipped = []
+    snapshots = open_snapshot_store()
+    delivered = []
+    shown = []
+    success_count = total_messages = 0
+    last_sent = None
+
+    print(f"🔍 스트리밍 수집 시작 (동시 {PIPELINE_FETCH_WORKERS}개, 마감 {PIPELINE_DEADLINE}초)")
+    print("="*60)
+
+    try:
+        fetched = fetch_stream(feeds, circuits, skipped, started + PIPELINE_DEADLINE)
+        for kind, category, news_list, sources in digest_stream(filter_stream(fetched, snapshots), feeds):
+            label = CATEGORY_LABELS[category]
+            if kind == 'digest' and sources:
+                print(f"⏰ 마감: {label} 다이제스트 먼저 전송 (미응답 {len(sources)}곳: {', '.join(sources)})")
+
+            if ENRICH_ARTICLES:
+                # 보강은 남은 마감 시간 안에서만 (마감 뒤에는 캐시에 있는 것만 적용)
+                enrich_shown_news(
+                    select_digest_news(news_list, category, kind == 'followup'),
+                    timeout=started + PIPELINE_DEADLINE - time.monotonic()
+                )
+            message = render(kind, category, news_list, sources)
+            if not message:
+                continue
+            delivered.extend(news_list)
+            total_messages += 1
+
+            # 텔레그램 API 제한 고려 (직전 전송과 간격 유지)
+            if not dry_run and last_sent is not None:
+                time.sleep(max(0, PIPELINE_SEND_INTERVAL - (time.monotonic() - last_sent)))
+
+            name = f"{label} {'후속' if kind == 'followup' else '다이제스트'}"
+            print(f"📤 {name} 전송 중... ({len(news_list)}개, 시작 후 {time.monotonic() - started:.1f}초, {len(message)}자)")
+            if send(message):
+                print(f"✅ {name} 전송 성공!")
+                success_count += 1
+                shown.extend(select_digest_news(news_list, category, kind == 'followup'))
+            else:
+                print(f"❌ {name} 전송 실패")
+            last_sent = time.monotonic()
+
+        if not total_messages:
+            # 어느 카테고리에도 뉴스가 없으면 기본 안내 메시지
+            total_messages = 1
+            message, _ = create_news_summary([])
+            print("📭 보낼 뉴스 없음 - 기본 안내 메시지 전송")
+            if send(message):
+                success_count += 1
+    finally:
+        save_circuits(circuits)
+        prune_snapshots(snapshots)
+        snapshots.close()
+
+    print("="*60)
+    print(f"⏱️ 전체 소요: {time.monotonic() - started:.1f}초")
+    print_skipped_feeds(skipped)
+    return delivered, shown, success_count, total_messages
@@ -0,0 +1,198 @@
+"""텔레그램 전송 대기함 (디스크에 먼저 기록하고 묶음으로 전송)
+
+렌더링된 메시지는 보내기 전에 .state/outbox/pending/에 파일로 남기고,
+전송에 성공하면 멱등 키(채팅 ID + 내용의 sha256)를 sent.json에 기록한 뒤 지웁니다.
+전송에 실패한 메시지는 다음 실행 시작 때 다시 보내고, 이미 보낸 키는 다시 보내지 않습니다.
+
+    <OUTBOX_DIR>/pending/<키>.json   - 보낼 메시지
+    <OUTBOX_DIR>/dead/<키>.json      - 재시도 한도/보존 기간을 넘겨 포기한 메시지
+    <OUTBOX_DIR>/sent.json           - 보낸 키와 시각 (OUTBOX_SENT_TTL_HOURS 동안 유지)
+"""
+import fcntl
+import hashlib
+import json
+import os
+import time
+
+from config import (
+    CHAT_ID, OUTBOX_DIR, OUTBOX_BATCH_SIZE, OUTBOX_BATCH_PAUSE, OUTBOX_SEND_INTERVAL,
+    OUTBOX_MAX_ATTEMPTS, OUTBOX_MAX_AGE_HOURS, OUTBOX_SENT_TTL_HOURS, OUTBOX_RETRY_COOLDOWN,
+    send_telegram_message
+)
+
+PENDING_DIR = os.path.join(OUTBOX_DIR, 'pending')
+DEAD_DIR = os.path.join(OUTBOX_DIR, 'dead')
+SENT_FILE = os.path.join(OUTBOX_DIR, 'sent.json')
+LOCK_FILE = os.path.join(OUTBOX_DIR, '.lock')
+
+# 이 횟수만큼 연달아 실패하면 텔레그램 쪽 문제로 보고 이번 전송은 중단
+MAX_CONSECUTIVE_FAILURES = 2
+
+# 연속 실패로 중단된 뒤 OUTBOX_RETRY_COOLDOWN초 동안은 deliver()가 기록만 하고 전송은 미룸
+# (한 번의 장애 동안 같은 메시지의 재시도 횟수를 소진하지 않도록, time.monotonic 기준)
+_paused_until = 0
+
+
+def message_key(text, chat_id=None):
+    """멱등 키: 같은 채팅에 같은 내용은 한 번만 전송"""
+    return hashlib.sha256(f"{chat_id or CHAT_ID}\0{text}".encode('utf-8')).hexdigest()
+
+def _write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def load_sent():
+    """보낸 키 {키: 보낸 시각} (보존 기간이 지난 기록은 제외)"""
+    try:
+        with open(SENT_FILE, encoding='utf-8') as f:
+            sent = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    cutoff = time.time() - OUTBOX_SENT_TTL_HOURS * 3600
+    return {key: sent_at for key, sent_at in sent.items() if sent_at >= cutoff}
+
+def enqueue(text, key=None):
+    """메시지를 대기함에 기록하고 키 반환 (이미 보냈거나 대기 중이면 그대로 둠)
+
+    key: 같은 메시지인지 판단할 기준 (기본: 내용) - 시각 등이 들어가 렌더링할 때마다
+    내용이 바뀌는 메시지는 '속보 기사', '실적 발표 건'처럼 바뀌지 않는 값을 넘김
+    """
+    key = message_key(key or text)
+    path = os.path.join(PENDING_DIR, f"{key}.json")
+    if key in load_sent() or os.path.exists(path):
+        return key
+
+    _write_json(path, {
+        'key': key,
+        'text': text,
+        'created_at': time.time(),
+        'attempts': 0,
+        'last_error': ''
+    })
+    return key
+
+def pending_messages():
+    """대기 중인 메시지 (먼저 들어온 순)"""
+    try:
+        names = [name for name in os.listdir(PENDING_DIR) if name.endswith('.json')]
+    except FileNotFoundError:
+        return []
+
+    messages = []
+    for name in names:
+        try:
+            with open(os.path.join(PENDING_DIR, name), encoding='utf-8') as f:
+                messages.append(json.load(f))
+        except (OSError, ValueError) as e:
+            print(f"⚠️ 대기 메시지 읽기 실패 ({name}): {e}")
+    messages.sort(key=lambda message: message['created_at'])
+    return messages
+
+def _retire(message, reason):
+    """더 이상 재시도하지 않을 메시지를 dead/로 이동"""
+    message['last_error'] = reason
+    _write_json(os.path.join(DEAD_DIR, f"{message['key']}.json"), message)
+    os.remove(os.path.join(PENDING_DIR, f"{message['key']}.json"))
+    print(f"🪦 전송 포기: {message['text'][:40]!r}... ({reason})")
+
+def flush(send=None):
+    """대기 중인 메시지를 묶음 단위로 전송 - (보낸 수, 실패 수, 남은 수)
+
+    다른 프로세스가 전송 중이면 건너뜀 (같은 메시지를 동시에 보내지 않도록)
+    """
+    global _paused_until
+    send = send or send_telegram_message
+    os.makedirs(OUTBOX_DIR, exist_ok=True)
+
+    with open(LOCK_FILE, 'w') as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            print("📮 다른 실행이 대기함을 전송 중 - 건너뜀")
+            return 0, 0, len(pending_messages())
+
+        sent = load_sent()
+        sent_count = failed = consecutive_failures = 0
+        batch_count = 0
+        now = time.time()
+
+        for message in pending_messages():
+            path = os.path.join(PENDING_DIR, f"{message['key']}.json")
+            if message['key'] in sent:
+                os.remove(path)  # 보낸 뒤 지우기 전에 중단됐던 메시지
+                continue
+            if now - message['created_at'] > OUTBOX_MAX_AGE_HOURS * 3600:
+                _retire(message, f"{OUTBOX_MAX_AGE_HOURS}시간 넘게 전송 실패")
+                continue
+
+            # 묶음 사이에는 조금 더 쉬고, 메시지 사이에는 최소 간격 유지
+            if batch_count == OUTBOX_BATCH_SIZE:
+                time.sleep(OUTBOX_BATCH_PAUSE)
+                batch_count = 0
+            elif sent_count or failed:
+                time.sleep(OUTBOX_SEND_INTERVAL)
+            batch_count += 1
+
+            message['attempts'] += 1
+            if send(message['text']):
+                # 키를 먼저 기록하고 파일을 지움 (중간에 멈춰도 다시 보내지 않음)
+                sent[message['key']] = time.time()
+                _write_json(SENT_FILE, sent)
+                os.remove(path)
+                sent_count += 1
+                consecutive_failures = 0
+                continue
+
+            failed += 1
+            consecutive_failures += 1
+            if message['attempts'] >= OUTBOX_MAX_ATTEMPTS:
+                _retire(message, f"{message['attempts']}회 전송 실패")
+            else:
+                message['last_error'] = f"{message['attempts']}회 실패"
+                _write_json(path, message)
+            if consecutive_failures >= MAX_CONSECUTIVE_FAILURES:
+                print(f"📮 연속 전송 실패 - 나머지는 {OUTBOX_RETRY_COOLDOWN // 60}분 뒤 또는 다음 실행에서 재시도")
+                _paused_until = time.monotonic() + OUTBOX_RETRY_COOLDOWN
+                break
+
+        # 보존 기간이 지난 키 정리
+        _write_json(SENT_FILE, sent)
+
+    return sent_count, failed, len(pending_messages())
+
+def drain():
+    """이전 실행에서 못 보낸 메시지 전송 (실행 시작 시)"""
+    backlog = pending_messages()
+    if not backlog:
+        return
+    print(f"📮 이전 실행에서 못 보낸 메시지 {len(backlog)}개 전송 중...")
+    sent_count, failed, remaining = flush()
+    print(f"📮 대기함: {sent_count}개 전송, {failed}개 실패, {remaining}개 남음")
+
+def delivery_paused():
+    """연속 전송 실패 후 쉬는 중인지"""
+    return time.monotonic() < _paused_until
+
+def retry_pending():
+    """상주 실행(--loop)용: 쉬는 중이 아니고 대기 중인 메시지가 있으면 전송"""
+    backlog = pending_messages()
+    if delivery_paused() or not backlog:
+        return
+    print(f"📮 대기 중인 메시지 {len(backlog)}개 재전송 중...")
+    sent_count, failed, remaining = flush()
+    print(f"📮 대기함: {sent_count}개 전송, {failed}개 실패, {remaining}개 남음")
+
+def deliver(text, key=None):
+    """대기함을 거쳐 전송 - 이 메시지가 (지금 또는 이전에) 전송됐으면 True
+
+    send_telegram_message와 같은 자리에 쓰는 전송 함수 (key는 enqueue 참고)
+    """
+    key = enqueue(text, key)
+    if delivery_paused():
+        print("📮 전송 장애로 대기함에만 기록 (잠시 뒤 재전송)")
+        return False
+    flush()
+    return key in load_sent()
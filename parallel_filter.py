@@ -0,0 +1,157 @@
+import os
+from bisect import bisect_right
+
+from config import EARNINGS_COMPANIES, PARALLEL_WORKERS, PARALLEL_MIN_ENTRIES, PARALLEL_BATCH_SIZE
+from items import NewsItem, EarningsItem, keyword_ids
+
+# 워커 프로세스에 한 번만 전달되는 카테고리별 키워드 (작업마다 다시 보내지 않음)
+_worker_categories = None
+_worker_earnings_keywords = None
+
+
+def resolve_workers(workers=None):
+    """워커 수 결정 (None이면 설정값, 0이면 CPU 코어 수)"""
+    if workers is None:
+        workers = PARALLEL_WORKERS
+    return workers if workers > 0 else (os.cpu_count() or 1)
+
+def _entry_fields(entry):
+    """피드 엔트리 → (제목, 요약, 링크, 발행일) 문자열 튜플"""
+    return (
+        entry.title if hasattr(entry, 'title') else "",
+        entry.summary if hasattr(entry, 'summary') else "",
+        entry.link if hasattr(entry, 'link') else "",
+        entry.published if hasattr(entry, 'published') else 'Unknown'
+    )
+
+def _init_worker(categories, earnings_keywords):
+    global _worker_categories, _worker_earnings_keywords
+    _worker_categories = categories
+    _worker_earnings_keywords = earnings_keywords
+
+def _filter_news_batch(rows):
+    """워커: (제목, 요약) 묶음 → (행 번호, 카테고리 번호, 매칭 키워드, 향상된 요약) 목록"""
+    from news_bot import match_news_entry
+
+    matches = []
+    for row_index, (title, summary) in enumerate(rows):
+        for category_index, (_category, keywords) in enumerate(_worker_categories):
+            match = match_news_entry(title, summary, keywords)
+            if match:
+                matches.append((row_index, category_index) + match)
+    return matches
+
+def _filter_earnings_batch(rows):
+    """워커: (제목, 요약) 묶음 → (행 번호, 티커, 키워드, 수치, 요약) 목록"""
+    from earnings_bot import match_earnings_entry
+
+    matches = []
+    for row_index, (title, summary) in enumerate(rows):
+        match = match_earnings_entry(title, summary, _worker_earnings_keywords)
+        if match:
+            matches.append((row_index,) + match)
+    return matches
+
+def _run_batches(batch_func, rows, workers, categories=(), earnings_keywords=()):
+    """행을 고정 크기 묶음으로 나눠 프로세스 풀에서 처리 (결과는 행 순서대로)"""
+    from concurrent.futures import ProcessPoolExecutor  # multiprocessing 로딩은 병렬 처리 때만
+    
+    batches = [
+        [(title, summary) for title, summary, _link, _published in rows[start:start + PARALLEL_BATCH_SIZE]]
+        for start in range(0, len(rows), PARALLEL_BATCH_SIZE)
+    ]
+
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(batches)),
+        initializer=_init_worker,
+        initargs=(categories, earnings_keywords)
+    ) as executor:
+        for batch_number, matches in enumerate(executor.map(batch_func, batches)):
+            offset = batch_number * PARALLEL_BATCH_SIZE
+            for match in matches:
+                yield (offset + match[0],) + match[1:]
+
+def _flatten(feeds):
+    """[(출처, 엔트리들)] → 전체 행 목록, 피드별 시작 위치"""
+    rows = []
+    offsets = []
+    for _source, entries in feeds:
+        offsets.append(len(rows))
+        rows.extend(_entry_fields(entry) for entry in entries)
+    return rows, offsets
+
+def filter_news_feeds(feeds, categories, workers=None):
+    """여러 피드의 엔트리를 카테고리별 키워드로 필터링
+
+    feeds: [(출처, 엔트리들)], categories: [(카테고리, 키워드 목록)]
+    반환: 피드 순서대로 {카테고리: [NewsItem, ...]} - 직렬 실행과 같은 결과/순서
+    """
+    from news_bot import filter_news_by_keywords
+
+    workers = resolve_workers(workers)
+    total = sum(len(entries) for _source, entries in feeds)
+
+    if workers <= 1 or total < PARALLEL_MIN_ENTRIES:
+        return [
+            {category: filter_news_by_keywords(entries, keywords, category, source)
+             for category, keywords in categories}
+            for source, entries in feeds
+        ]
+
+    print(f"⚙️ 병렬 필터링: 엔트리 {total}개, 워커 {workers}개")
+    rows, offsets = _flatten(feeds)
+    results = [{category: [] for category, _keywords in categories} for _feed in feeds]
+
+    for row_index, category_index, matched_keywords, enhanced_summary in _run_batches(
+            _filter_news_batch, rows, workers, categories=categories):
+        feed_index = bisect_right(offsets, row_index) - 1
+        title, _summary, link, published = rows[row_index]
+        category = categories[category_index][0]
+        results[feed_index][category].append(NewsItem(
+            title=title,
+            link=link,
+            published=published,
+            enhanced_summary=enhanced_summary,
+            keyword_ids=keyword_ids(matched_keywords),
+            category=category,
+            source=feeds[feed_index][0]
+        ))
+
+    # 직렬 버전과 동일하게 중요도 순 정렬 (안정 정렬이라 동점은 원래 순서 유지)
+    for by_category in results:
+        for news_list in by_category.values():
+            news_list.sort(key=lambda x: x.importance_score, reverse=True)
+    return results
+
+def filter_earnings_feeds(feeds, keywords, workers=None):
+    """여러 피드의 엔트리에서 실적 뉴스 필터링 - 피드 순서대로 [EarningsItem, ...] 목록"""
+    from earnings_bot import filter_earnings_news
+
+    workers = resolve_workers(workers)
+    total = sum(len(entries) for _source, entries in feeds)
+
+    if workers <= 1 or total < PARALLEL_MIN_ENTRIES:
+        return [filter_earnings_news(entries, EARNINGS_COMPANIES, keywords, source) for source, entries in feeds]
+
+    print(f"⚙️ 병렬 실적 필터링: 엔트리 {total}개, 워커 {workers}개")
+    rows, offsets = _flatten(feeds)
+    results = [[] for _feed in feeds]
+
+    for row_index, companies, keyword_matches, metrics, summary in _run_batches(
+            _filter_earnings_batch, rows, workers, earnings_keywords=keywords):
+        feed_index = bisect_right(offsets, row_index) - 1
+        title, _summary, link, published = rows[row_index]
+        results[feed_index].append(EarningsItem(
+            title=title,
+            link=link,
+            published=published,
+            summary=summary,
+            companies=companies,
+            keyword_ids=keyword_ids(keyword_matches),
+            metrics=metrics,
+            source=feeds[feed_index][0]
+        ))
+
+    for earnings_list in results:
+        earnings_list.sort(key=lambda x: x.importance_score, reverse=True)
+    return results
@@ -0,0 +1,187 @@
+"""저장된 피드 원본으로 과거 다이제스트 재구성 (전송 없음)
+
+아카이브 디렉터리 구조:
+    <archive>/<YYYY-MM-DD>/<출처 이름>/<HHMMSS>.xml[.gz]
+
+하루 단위로 스냅샷을 하나씩 읽어 필터링하므로, 메모리는 기간 전체가 아니라
+하루치 매칭 결과에만 비례합니다.
+"""
+import gzip
+import json
+import os
+from collections import Counter
+from datetime import datetime
+
+from config import REPLAY_CHUNK_ENTRIES, NEWS_AI_KEYWORDS, NEWS_QUANTUM_KEYWORDS, EARNINGS_KEYWORDS
+from feed_registry import load_feeds, NEWS_CATEGORIES, EARNINGS
+from parallel_filter import filter_news_feeds, filter_earnings_feeds
+
+
+def _parse_day(name):
+    try:
+        return datetime.strptime(name, '%Y-%m-%d').date()
+    except ValueError:
+        return None
+
+def _parse_time(day, filename):
+    """'HHMMSS.xml[.gz]' → 해당 날짜의 시각 (형식이 다르면 자정)"""
+    try:
+        return datetime.combine(day, datetime.strptime(filename[:6], '%H%M%S').time())
+    except ValueError:
+        return datetime.combine(day, datetime.min.time())
+
+def iter_archive(archive_dir, since=None, until=None):
+    """날짜 범위의 스냅샷을 하루씩 [(시각, 출처, 원본 읽기 함수)] 목록으로 반환"""
+    days = sorted(
+        (day, name) for name in os.listdir(archive_dir)
+        if (day := _parse_day(name)) and (not since or day >= since) and (not until or day <= until)
+    )
+
+    for day, day_name in days:
+        day_dir = os.path.join(archive_dir, day_name)
+        snapshots = []
+        for source in sorted(os.listdir(day_dir)):
+            source_dir = os.path.join(day_dir, source)
+            if not os.path.isdir(source_dir):
+                continue
+            for filename in os.listdir(source_dir):
+                path = os.path.join(source_dir, filename)
+                snapshots.append((_parse_time(day, filename), source, lambda path=path: _read_file(path)))
+        snapshots.sort(key=lambda snapshot: (snapshot[0], snapshot[1]))
+        yield day, snapshots
+
+def _read_file(path):
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rb') as f:
+        return f.read()
+
+def _new_stats():
+    return {
+        'days': 0, 'snapshots': 0, 'entries': 0, 'errors': 0,
+        'matched': Counter(), 'by_source': Counter(), 'keywords': Counter(), 'per_day': []
+    }
+
+def _filter_chunk(chunk, feed_categories, workers, news_by_key, earnings_by_key):
+    """스냅샷 묶음을 필터링해서 하루치 결과에 중복 없이 추가"""
+    news_feeds = [(source, entries) for source, entries in chunk if set(feed_categories(source)) & set(NEWS_CATEGORIES)]
+    earnings_feeds = [(source, entries) for source, entries in chunk if EARNINGS in feed_categories(source)]
+
+    categories = [("AI", NEWS_AI_KEYWORDS), ("Quantum", NEWS_QUANTUM_KEYWORDS)]
+    for (source, _entries), filtered in zip(news_feeds, filter_news_feeds(news_feeds, categories, workers)):
+        for category in feed_categories(source):
+            for news in filtered.get(category, []):
+                news_by_key.setdefault((category, source, news.link or news.title), news)
+
+    for (source, _entries), earnings_news in zip(earnings_feeds, filter_earnings_feeds(earnings_feeds, EARNINGS_KEYWORDS, workers)):
+        for news in earnings_news:
+            earnings_by_key.setdefault((source, news.link or news.title), news)
+
+def replay_day(day, snapshots, feed_categories, workers=None, stats=None):
+    """하루치 스냅샷을 필터 → 순위 → 렌더링 (메시지 목록, 뉴스, 실적 뉴스)"""
+    import feedparser
+    from news_bot import create_news_summary
+    from earnings_bot import create_earnings_summary
+
+    stats = stats if stats is not None else _new_stats()
+    news_by_key = {}
+    earnings_by_key = {}
+    chunk = []
+    chunk_entries = 0
+
+    for _fetched_at, source, read_payload in snapshots:
+        try:
+            feed = feedparser.parse(read_payload())
+        except Exception as e:
+            print(f"   ⚠️ {day} {source} 읽기 실패: {e}")
+            stats['errors'] += 1
+            continue
+
+        stats['snapshots'] += 1
+        stats['entries'] += len(feed.entries)
+        chunk.append((source, feed.entries))
+        chunk_entries += len(feed.entries)
+
+        # 엔트리가 일정량 쌓이면 바로 필터링하고 원본은 버림
+        if chunk_entries >= REPLAY_CHUNK_ENTRIES:
+            _filter_chunk(chunk, feed_categories, workers, news_by_key, earnings_by_key)
+            chunk = []
+            chunk_entries = 0
+
+    if chunk:
+        _filter_chunk(chunk, feed_categories, workers, news_by_key, earnings_by_key)
+
+    news_list = list(news_by_key.values())
+    earnings_list = sorted(earnings_by_key.values(), key=lambda x: x.importance_score, reverse=True)
+
+    # 해당 날짜의 다이제스트 시각으로 렌더링
+    as_of = datetime.combine(day, datetime.max.time().replace(microsecond=0))
+    messages = [message for message in create_news_summary(news_list, as_of=as_of) if message]
+    if earnings_list:
+        messages.append(create_earnings_summary(earnings_list, max_news=5, as_of=as_of))
+
+    return messages, news_list, earnings_list
+
+def _record_day(stats, day, news_list, earnings_list):
+    counts = Counter(news.category for news in news_list)
+    counts['Earnings'] = len(earnings_list)
+    stats['days'] += 1
+    stats['matched'].update(counts)
+    stats['per_day'].append({'day': day.isoformat(), **counts})
+
+    for news in news_list:
+        stats['by_source'][news.source] += 1
+        stats['keywords'].update(news.matched_keywords)
+    for news in earnings_list:
+        stats['by_source'][news.source] += 1
+        stats['keywords'].update(news.keywords)
+
+def replay(days, output_dir=None, workers=None):
+    """iter_archive 등이 만든 (날짜, 스냅샷 목록)을 차례로 재생 - 전체 통계 반환"""
+    registry = {name: categories for name, _url, categories in load_feeds(None)}
+    unknown_sources = set()
+
+    def feed_categories(source):
+        # 레지스트리에 없는 출처는 AI/양자 뉴스 피드로 취급
+        if source not in registry and source not in unknown_sources:
+            unknown_sources.add(source)
+            print(f"   ℹ️ 레지스트리에 없는 출처: {source} (AI/양자 피드로 처리)")
+        return registry.get(source, NEWS_CATEGORIES)
+
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    stats = _new_stats()
+    print("⏪ 아카이브 재생 시작")
+
+    for day, snapshots in days:
+        messages, news_list, earnings_list = replay_day(day, snapshots, feed_categories, workers, stats)
+        _record_day(stats, day, news_list, earnings_list)
+        print(f"   📅 {day}: 스냅샷 {len(snapshots)}개 → 뉴스 {len(news_list)}개, "
+              f"실적 {len(earnings_list)}개, 메시지 {len(messages)}개")
+
+        if output_dir:
+            with open(os.path.join(output_dir, f"{day.isoformat()}.txt"), 'w', encoding='utf-8') as f:
+                f.write(("\n" + "-" * 60 + "\n\n").join(messages) if messages else "(다이제스트 없음)\n")
+
+    summary = {
+        'days': stats['days'],
+        'snapshots': stats['snapshots'],
+        'entries': stats['entries'],
+        'errors': stats['errors'],
+        'matched': dict(stats['matched']),
+        'by_source': dict(stats['by_source'].most_common()),
+        'top_keywords': dict(stats['keywords'].most_common(30)),
+        'per_day': stats['per_day']
+    }
+
+    print(f"\n📊 재생 결과: {summary['days']}일, 스냅샷 {summary['snapshots']}개, 엔트리 {summary['entries']}개")
+    print(f"   매칭: {', '.join(f'{k} {v}개' for k, v in summary['matched'].items()) or '없음'}")
+    if summary['top_keywords']:
+        print(f"   상위 키워드: {', '.join(list(summary['top_keywords'])[:10])}")
+
+    if output_dir:
+        with open(os.path.join(output_dir, 'stats.json'), 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        print(f"💾 일별 다이제스트/통계 저장: {output_dir}")
+
+    return summary
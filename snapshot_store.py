@@ -0,0 +1,177 @@
+"""피드 원본 스냅샷 저장소 (내용 해시 기반, gzip 압축)
+
+    <SNAPSHOT_DIR>/objects/<해시 앞 2자리>/<sha256>.gz   - 원본 (같은 내용은 한 번만 저장)
+    <SNAPSHOT_DIR>/index.sqlite                           - 가져온 기록, 피드별 마지막 필터링 결과
+
+같은 URL에서 이전과 똑같은 내용이 오면 파싱/필터링 없이 저장된 결과를 재사용하고,
+쌓인 스냅샷은 아카이브 재생(replay)의 입력으로도 쓰입니다.
+"""
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from datetime import datetime, timedelta
+
+from config import (
+    SNAPSHOT_DIR, SNAPSHOT_RETENTION_DAYS, SNAPSHOT_MAX_BYTES,
+    NEWS_AI_KEYWORDS, NEWS_QUANTUM_KEYWORDS, EARNINGS_KEYWORDS, EARNINGS_COMPANIES
+)
+from items import item_to_dict, item_from_dict
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS objects (
+    hash TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    stored_size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS fetches (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL,
+    source TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    hash TEXT NOT NULL REFERENCES objects(hash)
+);
+CREATE INDEX IF NOT EXISTS fetches_by_time ON fetches(fetched_at);
+CREATE TABLE IF NOT EXISTS results (
+    url TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    items TEXT NOT NULL,
+    filter_key TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (url, kind)
+);
+"""
+
+# 필터링/점수 계산 코드를 바꾸면 올릴 것 (저장된 결과를 모두 무효화)
+FILTER_VERSION = 1
+
+# 결과 종류별로 필터링에 쓰는 설정 (바뀌면 저장된 결과를 쓰지 않음)
+_FILTER_INPUTS = {
+    'news': (NEWS_AI_KEYWORDS, NEWS_QUANTUM_KEYWORDS),
+    'earnings': (EARNINGS_KEYWORDS, EARNINGS_COMPANIES),
+}
+
+
+def open_snapshot_store():
+    """스냅샷 저장소 열기"""
+    os.makedirs(os.path.join(SNAPSHOT_DIR, 'objects'), exist_ok=True)
+    conn = sqlite3.connect(os.path.join(SNAPSHOT_DIR, 'index.sqlite'))
+    conn.executescript(_SCHEMA)
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(results)")]
+    if 'filter_key' not in columns:
+        conn.execute("ALTER TABLE results ADD COLUMN filter_key TEXT NOT NULL DEFAULT ''")
+    return conn
+
+def filter_key(kind):
+    """필터링 결과를 만든 조건의 지문 (키워드 목록 + FILTER_VERSION)"""
+    inputs = json.dumps([FILTER_VERSION, kind, _FILTER_INPUTS.get(kind)], ensure_ascii=False)
+    return hashlib.sha256(inputs.encode('utf-8')).hexdigest()[:16]
+
+def _object_path(content_hash):
+    return os.path.join(SNAPSHOT_DIR, 'objects', content_hash[:2], f"{content_hash}.gz")
+
+def store_payload(conn, source, url, payload, fetched_at=None):
+    """가져온 원본을 기록하고 내용 해시 반환 (같은 내용의 원본은 다시 쓰지 않음)"""
+    content_hash = hashlib.sha256(payload).hexdigest()
+
+    if not conn.execute("SELECT 1 FROM objects WHERE hash = ?", (content_hash,)).fetchone():
+        path = _object_path(content_hash)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        compressed = gzip.compress(payload, compresslevel=6)
+        with open(path + '.tmp', 'wb') as f:
+            f.write(compressed)
+        os.replace(path + '.tmp', path)
+        conn.execute("INSERT INTO objects (hash, size, stored_size) VALUES (?, ?, ?)",
+                     (content_hash, len(payload), len(compressed)))
+
+    conn.execute("INSERT INTO fetches (url, source, fetched_at, hash) VALUES (?, ?, ?, ?)",
+                 (url, source, fetched_at or time.time(), content_hash))
+    conn.commit()
+    return content_hash
+
+def load_payload(content_hash):
+    """해시로 원본 읽기"""
+    with gzip.open(_object_path(content_hash), 'rb') as f:
+        return f.read()
+
+def cached_results(conn, url, kind, content_hash):
+    """같은 내용, 같은 필터링 조건으로 만든 결과가 있으면 아이템 목록, 없으면 None"""
+    row = conn.execute(
+        "SELECT hash, filter_key, items FROM results WHERE url = ? AND kind = ?", (url, kind)
+    ).fetchone()
+    if not row or row[0] != content_hash or row[1] != filter_key(kind):
+        return None
+    return [item_from_dict(data) for data in json.loads(row[2])]
+
+def save_results(conn, url, kind, content_hash, items):
+    """피드의 필터링 결과를 내용 해시와 함께 저장 (다음 실행의 재사용용)"""
+    conn.execute(
+        "INSERT OR REPLACE INTO results (url, kind, hash, items, filter_key) VALUES (?, ?, ?, ?, ?)",
+        (url, kind, content_hash, json.dumps([item_to_dict(item) for item in items], ensure_ascii=False),
+         filter_key(kind))
+    )
+    conn.commit()
+
+def prune_snapshots(conn):
+    """보존 기간이 지났거나 용량 상한을 넘는 오래된 스냅샷 삭제 - 삭제한 원본 수 반환"""
+    cutoff = time.time() - SNAPSHOT_RETENTION_DAYS * 86400
+    conn.execute("DELETE FROM fetches WHERE fetched_at < ?", (cutoff,))
+
+    # 용량 상한: 참조 중인 원본 크기 합이 넘치면 가장 오래된 기록부터 삭제
+    total = conn.execute(
+        "SELECT COALESCE(SUM(stored_size), 0) FROM objects WHERE hash IN (SELECT hash FROM fetches)"
+    ).fetchone()[0]
+    while total > SNAPSHOT_MAX_BYTES:
+        oldest = conn.execute("SELECT MIN(fetched_at) FROM fetches").fetchone()[0]
+        if oldest is None:
+            break
+        conn.execute("DELETE FROM fetches WHERE fetched_at <= ?", (oldest + 3600,))
+        total = conn.execute(
+            "SELECT COALESCE(SUM(stored_size), 0) FROM objects WHERE hash IN (SELECT hash FROM fetches)"
+        ).fetchone()[0]
+
+    # 어떤 기록도 참조하지 않는 원본 삭제 (마지막 필터링 결과가 가리키는 원본은 유지)
+    orphans = [row[0] for row in conn.execute(
+        "SELECT hash FROM objects WHERE hash NOT IN (SELECT hash FROM fetches) "
+        "AND hash NOT IN (SELECT hash FROM results)"
+    )]
+    for content_hash in orphans:
+        try:
+            os.remove(_object_path(content_hash))
+        except FileNotFoundError:
+            pass
+    conn.executemany("DELETE FROM objects WHERE hash = ?", [(h,) for h in orphans])
+    conn.commit()
+    return len(orphans)
+
+def iter_store(since=None, until=None):
+    """저장소의 스냅샷을 하루씩 [(시각, 출처, 원본 읽기 함수)] 목록으로 반환 (replay 입력)
+
+    같은 날 같은 피드의 동일한 내용은 한 번만 포함
+    """
+    conn = open_snapshot_store()
+    try:
+        start = datetime.combine(since, datetime.min.time()).timestamp() if since else 0
+        end = datetime.combine(until + timedelta(days=1), datetime.min.time()).timestamp() if until else time.time() + 1
+        days = [row[0] for row in conn.execute(
+            "SELECT DISTINCT date(fetched_at, 'unixepoch', 'localtime') FROM fetches "
+            "WHERE fetched_at >= ? AND fetched_at < ? ORDER BY 1", (start, end)
+        )]
+
+        for day_text in days:
+            day = datetime.strptime(day_text, '%Y-%m-%d').date()
+            day_start = datetime.combine(day, datetime.min.time())
+            rows = conn.execute(
+                "SELECT MIN(fetched_at), source, hash FROM fetches "
+                "WHERE fetched_at >= ? AND fetched_at < ? "
+                "GROUP BY url, hash ORDER BY 1, source",
+                (day_start.timestamp(), (day_start + timedelta(days=1)).timestamp())
+            ).fetchall()
+            yield day, [
+                (datetime.fromtimestamp(fetched_at), source, lambda content_hash=content_hash: load_payload(content_hash))
+                for fetched_at, source, content_hash in rows
+            ]
+    finally:
+        conn.close()
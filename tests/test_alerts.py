@@ -0,0 +1,58 @@
+"""속보와 다이제스트 사이의 중복 방지 (다이제스트로 나간 기사는 속보로 다시 보내지 않음)
+
+    python -m unittest discover tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('BOT_STATE_DIR', tempfile.mkdtemp(prefix='bot-state-'))
+
+import alerts
+from config import BREAKING_SCORE_THRESHOLD
+from items import NewsItem, keyword_ids
+
+
+def _news(link, score=BREAKING_SCORE_THRESHOLD):
+    keywords = [f"keyword-{i}" for i in range(score)]
+    return NewsItem(
+        title=f"News {link}", link=link, published='', enhanced_summary='',
+        keyword_ids=keyword_ids(keywords), category='AI', source='Test'
+    )
+
+
+class DigestLedgerTest(unittest.TestCase):
+    def setUp(self):
+        state_dir = tempfile.mkdtemp(prefix='bot-state-')
+        for name, value in (
+            ('STATE_DIR', state_dir),
+            ('ALERT_LEDGER_FILE', os.path.join(state_dir, 'alerted.json')),
+            ('DIGEST_LEDGER_FILE', os.path.join(state_dir, 'digested.json')),
+        ):
+            patcher = mock.patch.object(alerts, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_digested_item_is_not_picked_as_breaking(self):
+        shown, fresh = _news('https://example.com/shown'), _news('https://example.com/fresh')
+        alerts.mark_digested([shown])
+
+        breaking = alerts.pick_breaking([shown, fresh], {}, digested=alerts.load_digested())
+        self.assertEqual([news.link for news in breaking], [fresh.link])
+
+    def test_digest_marks_do_not_need_the_alert_ledger(self):
+        # 다이제스트 워크플로에는 속보 기록이 없을 수 있음 - 그래도 다이제스트 기록은 남아야 함
+        alerts.mark_digested([_news('https://example.com/a')])
+        self.assertIsNone(alerts.load_alerted())
+        self.assertIn('https://example.com/a', alerts.load_digested())
+
+    def test_low_score_items_are_not_recorded(self):
+        alerts.mark_digested([_news('https://example.com/low', score=BREAKING_SCORE_THRESHOLD - 1)])
+        self.assertEqual(alerts.load_digested(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
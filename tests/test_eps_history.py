@@ -0,0 +1,126 @@
+"""EPS 기록: 배열 연산 통계(상회 비율, 평균 서프라이즈, 추세)와 (티커, 발표일) 중복 제거
+
+    python -m unittest discover tests
+"""
+import importlib.util
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('BOT_STATE_DIR', tempfile.mkdtemp(prefix='bot-state-'))
+
+import eps_history
+
+HAS_NUMPY = importlib.util.find_spec('numpy') is not None
+
+NAN = float('nan')
+
+
+def _columns(np, rows):
+    """[(티커 ID, 날짜, EPS 예상, EPS 실적, 매출 예상, 매출 실적)] → 열 배열"""
+    return {
+        name: np.array([row[i] for row in rows], dtype=dtype)
+        for i, (name, dtype) in enumerate(eps_history.COLUMNS.items())
+    }
+
+def _row(symbol, date, eps_estimated, eps, revenue_estimated=None, revenue=None):
+    return {
+        'symbol': symbol, 'date': date, 'epsEstimated': eps_estimated, 'eps': eps,
+        'revenueEstimated': revenue_estimated, 'revenue': revenue,
+    }
+
+
+@unittest.skipUnless(HAS_NUMPY, "numpy 필요")
+class StatsFromColumnsTest(unittest.TestCase):
+    def setUp(self):
+        import numpy
+        self.np = numpy
+        patcher = mock.patch.object(eps_history, 'EPS_TREND_QUARTERS', 4)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_beat_rate_surprise_and_trend(self):
+        # 날짜 순서가 섞여 있어도 추세는 발표일 순으로 계산
+        columns = _columns(self.np, [
+            (0, 20240701, 2.0, 2.5, NAN, NAN),     # +25%
+            (0, 20230101, 1.0, 3.0, NAN, NAN),     # +200% (추세 범위 밖)
+            (1, 20240101, 0.5, 0.5, NAN, NAN),     # 0%
+            (0, 20240101, 1.0, 1.1, 100.0, 110.0), # +10%
+            (0, 20241001, 1.0, 1.4, NAN, NAN),     # +40%
+            (0, 20240401, 1.0, 0.9, 100.0, 120.0), # -10%
+            (2, 20240101, NAN, NAN, 50.0, 40.0),   # 매출만 있는 티커
+        ])
+        stats = eps_history.stats_from_columns(self.np, columns, ['AAA', 'BBB', 'CCC'])
+
+        self.assertEqual(set(stats), {'AAA', 'BBB'})
+        aaa = stats['AAA']
+        self.assertEqual(aaa['quarters'], 5)
+        self.assertAlmostEqual(aaa['beat_rate'], 0.8)
+        self.assertAlmostEqual(aaa['avg_surprise'], (200 + 25 + 10 + 40 - 10) / 5)
+        self.assertAlmostEqual(aaa['revenue_beat_rate'], 1.0)
+        # 최근 4번 서프라이즈 10, -10, 25, 40의 최소제곱 기울기
+        self.assertAlmostEqual(aaa['trend'], 12.5)
+
+        bbb = stats['BBB']
+        self.assertEqual(bbb['quarters'], 1)
+        self.assertEqual(bbb['beat_rate'], 0.0)
+        self.assertEqual(bbb['avg_surprise'], 0.0)
+        self.assertIsNone(bbb['revenue_beat_rate'])
+        self.assertEqual(bbb['trend'], 0.0)
+
+    def test_empty_history(self):
+        columns = _columns(self.np, [])
+        self.assertEqual(eps_history.stats_from_columns(self.np, columns, []), {})
+
+
+@unittest.skipUnless(HAS_NUMPY, "numpy 필요")
+class RecordCalendarTest(unittest.TestCase):
+    def setUp(self):
+        history_dir = tempfile.mkdtemp(prefix='eps-history-')
+        for name, value in (
+            ('EPS_HISTORY_DIR', history_dir),
+            ('CURRENT_FILE', os.path.join(history_dir, 'current')),
+            ('LOCK_FILE', os.path.join(history_dir, '.lock')),
+            ('_stats_cache', None),
+        ):
+            patcher = mock.patch.object(eps_history, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _rows(self):
+        columns, tickers = eps_history.load_history()
+        return sorted(
+            (tickers[t], int(d), float(a))
+            for t, d, a in zip(columns['ticker'], columns['date'], columns['eps_actual'])
+        )
+
+    def test_keeps_last_row_per_ticker_and_date(self):
+        eps_history.record_calendar([
+            _row('AAA', '2024-01-01', 1.0, 1.1),
+            _row('BBB', '2024-01-01', 2.0, 2.2),
+        ])
+        # 같은 호출 안에서도, 이전 기록과도 (티커, 발표일)이 같으면 나중 값만 남음
+        eps_history.record_calendar([
+            _row('AAA', '2024-01-01', 1.0, 1.2),
+            _row('AAA', '2024-01-01', 1.0, 1.3),
+            _row('AAA', '2024-04-01', 1.0, 0.9),
+        ])
+        self.assertEqual(self._rows(), [
+            ('AAA', 20240101, 1.3),
+            ('AAA', 20240401, 0.9),
+            ('BBB', 20240101, 2.2),
+        ])
+
+    def test_unchanged_and_unreported_rows_are_not_rewritten(self):
+        rows = [_row('AAA', '2024-01-01', 1.0, 1.1)]
+        self.assertEqual(eps_history.record_calendar(rows), 1)
+        self.assertEqual(eps_history.record_calendar(rows), 0)
+        self.assertEqual(eps_history.record_calendar([_row('CCC', '2024-07-01', 1.0, None)]), 0)
+        self.assertEqual(self._rows(), [('AAA', 20240101, 1.1)])
+
+
+if __name__ == '__main__':
+    unittest.main()
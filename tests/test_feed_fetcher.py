@@ -0,0 +1,84 @@
+"""feed_fetcher 본문 수신 중 오류 처리 (로컬 소켓 서버로 재현)
+
+    python -m unittest discover tests
+"""
+import importlib.util
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('BOT_STATE_DIR', tempfile.mkdtemp(prefix='bot-state-'))
+
+HAS_DEPS = all(importlib.util.find_spec(name) for name in ('requests', 'feedparser'))
+
+RSS_HEAD = b'<?xml version="1.0"?><rss version="2.0"><channel><title>T</title><item><title>AI news</title>'
+
+
+class _StallingServer:
+    """헤더와 본문 일부만 보낸 뒤 멈추거나(stall) 연결을 끊는(reset) 1회용 HTTP 서버"""
+
+    def __init__(self, mode):
+        self.mode = mode
+        self.sock = socket.socket()
+        self.sock.bind(('127.0.0.1', 0))
+        self.sock.listen(1)
+        self.url = f"http://127.0.0.1:{self.sock.getsockname()[1]}/feed"
+        self.release = threading.Event()
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+        self.thread.start()
+
+    def _serve(self):
+        conn, _addr = self.sock.accept()
+        with conn:
+            conn.recv(65536)
+            conn.sendall(
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/rss+xml\r\n"
+                b"Content-Length: 100000\r\n\r\n" + RSS_HEAD
+            )
+            if self.mode == 'stall':
+                self.release.wait(10)
+
+    def close(self):
+        self.release.set()
+        self.thread.join(5)
+        self.sock.close()
+
+
+@unittest.skipUnless(HAS_DEPS, "requests/feedparser 필요")
+class BodyErrorTest(unittest.TestCase):
+    def _fetch(self, mode):
+        import feed_fetcher
+
+        server = _StallingServer(mode)
+        circuits, skipped = {}, []
+        try:
+            with mock.patch.object(feed_fetcher, 'FEED_READ_TIMEOUT', 0.5):
+                started = time.monotonic()
+                feed = feed_fetcher.fetch_feed('Test', server.url, circuits, skipped)
+                elapsed = time.monotonic() - started
+        finally:
+            server.close()
+        return feed, circuits[server.url], skipped, elapsed
+
+    def test_stall_after_headers_is_recorded_as_failure(self):
+        feed, circuit, skipped, elapsed = self._fetch('stall')
+        self.assertIsNone(feed)
+        self.assertEqual(circuit['failures'], 1)
+        self.assertIn('시간 초과', skipped[0][1])
+        self.assertLess(elapsed, 5)
+
+    def test_connection_reset_mid_body_is_recorded_as_failure(self):
+        feed, circuit, skipped, _elapsed = self._fetch('reset')
+        self.assertIsNone(feed)
+        self.assertEqual(circuit['failures'], 1)
+        self.assertIn('연결 오류', skipped[0][1])
+
+
+if __name__ == '__main__':
+    unittest.main()
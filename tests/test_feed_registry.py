@@ -0,0 +1,70 @@
+"""피드 레지스트리: 샤드를 늘릴 때 옮겨가는 피드 비율과 삭제한 기본 피드의 재등록 방지
+
+    python -m unittest discover tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('BOT_STATE_DIR', tempfile.mkdtemp(prefix='bot-state-'))
+
+import feed_registry
+from config import NEWS_RSS_FEEDS
+
+
+class ShardForTest(unittest.TestCase):
+    URLS = [f"https://feed{i}.example.com/rss" for i in range(2000)]
+
+    def test_adding_a_shard_moves_about_one_in_n_plus_one(self):
+        for shard_count in (2, 4, 8):
+            before = {url: feed_registry.shard_for(url, shard_count) for url in self.URLS}
+            after = {url: feed_registry.shard_for(url, shard_count + 1) for url in self.URLS}
+            moved = [url for url in self.URLS if before[url] != after[url]]
+
+            expected = len(self.URLS) / (shard_count + 1)
+            self.assertLess(abs(len(moved) - expected), expected * 0.35, (shard_count, len(moved)))
+            # 옮겨가는 피드는 모두 새로 생긴 샤드로 (기존 샤드끼리는 섞이지 않음)
+            self.assertEqual({after[url] for url in moved}, {shard_count})
+
+    def test_single_shard(self):
+        self.assertEqual(feed_registry.shard_for(self.URLS[0], 1), 0)
+
+
+class RemoveFeedTest(unittest.TestCase):
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(prefix='registry-'), 'feeds.sqlite')
+        self.name, self.url = next(iter(NEWS_RSS_FEEDS.items()))
+
+    def _urls(self):
+        conn = feed_registry.open_registry(self.path)
+        try:
+            return {url: categories for _name, url, categories in feed_registry.list_feeds(conn)}
+        finally:
+            conn.close()
+
+    def test_removed_default_feed_stays_removed_after_resync(self):
+        self.assertIn(self.url, self._urls())
+
+        conn = feed_registry.open_registry(self.path)
+        self.assertTrue(feed_registry.remove_feed(conn, self.url))
+        self.assertFalse(feed_registry.remove_feed(conn, self.url))
+        conn.close()
+
+        # 다시 열면 기본 피드를 동기화하지만 삭제한 피드는 되살리지 않음
+        self.assertNotIn(self.url, self._urls())
+        self.assertNotIn(self.url, self._urls())
+
+    def test_add_with_replace_reenables_with_new_categories(self):
+        conn = feed_registry.open_registry(self.path)
+        feed_registry.remove_feed(conn, self.url)
+        feed_registry.add_feed(conn, self.name, self.url, [feed_registry.QUANTUM])
+        conn.commit()
+        conn.close()
+
+        self.assertEqual(self._urls()[self.url], (feed_registry.QUANTUM,))
+
+
+if __name__ == '__main__':
+    unittest.main()
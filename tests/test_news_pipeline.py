@@ -0,0 +1,110 @@
+"""스트리밍 파이프라인의 마감 처리 (빠른 출처는 마감에 다이제스트로, 늦은 출처는 후속 메시지로)
+
+    python -m unittest discover tests
+"""
+import os
+import sys
+import tempfile
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('BOT_STATE_DIR', tempfile.mkdtemp(prefix='bot-state-'))
+
+import feed_fetcher
+import news_pipeline
+
+DEADLINE = 0.5
+
+FEEDS = [
+    ('Fast', 'https://fast.example.com/rss', ['AI']),
+    ('Slow', 'https://slow.example.com/rss', ['AI']),
+]
+
+
+def _feed(title, delay=0.0):
+    """delay초 뒤에 엔트리 하나짜리 피드를 돌려주는 fetch_feed 대역의 응답"""
+    time.sleep(delay)
+    entry = SimpleNamespace(
+        title=title, link=f"https://example.com/{title.replace(' ', '-')}",
+        published='', summary=f"{title} - a short report on the latest release from the lab."
+    )
+    return SimpleNamespace(entries=[entry], content_hash=f"hash-{title}")
+
+
+class PipelineDeadlineTest(unittest.TestCase):
+    def setUp(self):
+        for target, name, value in (
+            (news_pipeline, 'PIPELINE_DEADLINE', DEADLINE),
+            (news_pipeline, 'PIPELINE_SEND_INTERVAL', 0),
+            (news_pipeline, 'ENRICH_ARTICLES', False),
+        ):
+            patcher = mock.patch.object(target, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _run(self, responses):
+        """responses: {URL: (제목, 지연)} - (전송 시각, 메시지) 목록과 run_pipeline 반환값"""
+        def fake_fetch(site_name, feed_url, circuits, skipped, snapshots=None, kind=None):
+            title, delay = responses[feed_url]
+            return _feed(title, delay)
+
+        messages = []
+        started = time.monotonic()
+
+        def send(message, key=None):
+            messages.append((time.monotonic() - started, message))
+            return True
+
+        with mock.patch.object(feed_fetcher, 'fetch_feed', fake_fetch):
+            result = news_pipeline.run_pipeline(FEEDS, send)
+        return messages, result
+
+    def test_late_source_arrives_as_followup(self):
+        messages, (delivered, shown, success, total) = self._run({
+            'https://fast.example.com/rss': ("OpenAI fast news", 0.0),
+            'https://slow.example.com/rss': ("OpenAI slow news", DEADLINE * 3),
+        })
+
+        self.assertEqual((success, total), (2, 2))
+        (digest_at, digest), (followup_at, followup) = messages
+
+        # 첫 다이제스트는 느린 출처를 기다리지 않고 마감에 맞춰 전송
+        self.assertGreaterEqual(digest_at, DEADLINE - 0.05)
+        self.assertLess(digest_at, DEADLINE * 3)
+        self.assertIn("OpenAI fast news", digest)
+        self.assertNotIn("OpenAI slow news", digest)
+
+        # 늦게 응답한 출처는 후속 메시지로
+        self.assertGreaterEqual(followup_at, DEADLINE * 3)
+        self.assertIn("OpenAI slow news", followup)
+        self.assertNotIn("OpenAI fast news", followup)
+        self.assertEqual(sorted(news.title for news in shown), ["OpenAI fast news", "OpenAI slow news"])
+
+    def test_digest_goes_out_before_deadline_when_all_sources_respond(self):
+        messages, (_delivered, _shown, success, total) = self._run({
+            'https://fast.example.com/rss': ("OpenAI fast news", 0.0),
+            'https://slow.example.com/rss': ("OpenAI second news", 0.1),
+        })
+
+        self.assertEqual((success, total), (1, 1))
+        ((digest_at, digest),) = messages
+        self.assertLess(digest_at, DEADLINE)
+        self.assertIn("OpenAI fast news", digest)
+        self.assertIn("OpenAI second news", digest)
+
+    def test_no_news_sends_fallback_message(self):
+        messages, (delivered, shown, success, total) = self._run({
+            'https://fast.example.com/rss': ("Weather report", 0.0),
+            'https://slow.example.com/rss': ("Sports report", 0.0),
+        })
+
+        self.assertEqual((success, total), (1, 1))
+        self.assertEqual((delivered, shown), ([], []))
+        self.assertIn("뉴스가 없습니다", messages[0][1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+"""전송 대기함의 중복 전송 방지와 장애 후 재전송 (가짜 send로 확인)
+
+    python -m unittest discover tests
+"""
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('BOT_STATE_DIR', tempfile.mkdtemp(prefix='bot-state-'))
+
+import outbox
+
+
+class FakeSend:
+    """보낸 메시지를 기록하는 send 대역 (results 순서대로 성공/실패 반환, 다 쓰면 성공)"""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.sent = []
+
+    def __call__(self, text):
+        self.sent.append(text)
+        return self.results.pop(0) if self.results else True
+
+
+class OutboxTest(unittest.TestCase):
+    def setUp(self):
+        outbox_dir = tempfile.mkdtemp(prefix='outbox-')
+        for name, value in (
+            ('OUTBOX_DIR', outbox_dir),
+            ('PENDING_DIR', os.path.join(outbox_dir, 'pending')),
+            ('DEAD_DIR', os.path.join(outbox_dir, 'dead')),
+            ('SENT_FILE', os.path.join(outbox_dir, 'sent.json')),
+            ('LOCK_FILE', os.path.join(outbox_dir, '.lock')),
+            ('OUTBOX_SEND_INTERVAL', 0),
+            ('OUTBOX_BATCH_PAUSE', 0),
+            ('_paused_until', 0),
+        ):
+            patcher = mock.patch.object(outbox, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _use_send(self, fake):
+        patcher = mock.patch.object(outbox, 'send_telegram_message', fake)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return fake
+
+    def test_same_key_is_sent_once(self):
+        fake = self._use_send(FakeSend())
+        # 렌더링 시각 등으로 내용이 달라도 키가 같으면 같은 메시지
+        self.assertTrue(outbox.deliver("속보 (10:00)", key='alert:a'))
+        self.assertTrue(outbox.deliver("속보 (10:05)", key='alert:a'))
+        self.assertEqual(fake.sent, ["속보 (10:00)"])
+
+    def test_same_key_enqueued_twice_is_sent_once(self):
+        outbox.enqueue("첫 번째", key='release:x')
+        outbox.enqueue("두 번째", key='release:x')
+        fake = FakeSend()
+        self.assertEqual(outbox.flush(fake), (1, 0, 0))
+        self.assertEqual(fake.sent, ["첫 번째"])
+
+    def test_crash_after_recording_sent_does_not_resend(self):
+        outbox.enqueue("메시지")
+        first = FakeSend()
+        # sent.json을 쓴 뒤 대기 파일을 지우기 전에 중단된 상황
+        with mock.patch.object(outbox.os, 'remove', side_effect=RuntimeError("crash")):
+            with self.assertRaises(RuntimeError):
+                outbox.flush(first)
+        self.assertEqual(first.sent, ["메시지"])
+        self.assertEqual(len(outbox.pending_messages()), 1)
+
+        second = FakeSend()
+        self.assertEqual(outbox.flush(second), (0, 0, 0))
+        self.assertEqual(second.sent, [])
+        self.assertEqual(outbox.pending_messages(), [])
+
+    def test_consecutive_failures_pause_until_cooldown_then_retry(self):
+        fake = self._use_send(FakeSend(False, False))
+        with mock.patch.object(outbox, 'OUTBOX_RETRY_COOLDOWN', 0.2):
+            outbox.enqueue("첫 번째")
+            self.assertFalse(outbox.deliver("두 번째"))
+            self.assertEqual(len(fake.sent), 2)
+            self.assertTrue(outbox.delivery_paused())
+
+            # 쉬는 동안에는 기록만 하고 보내지 않음
+            self.assertFalse(outbox.deliver("세 번째"))
+            self.assertEqual(len(fake.sent), 2)
+            outbox.retry_pending()
+            self.assertEqual(len(fake.sent), 2)
+
+            time.sleep(0.3)
+            self.assertFalse(outbox.delivery_paused())
+            outbox.retry_pending()
+
+        self.assertEqual(sorted(fake.sent[2:]), ["두 번째", "세 번째", "첫 번째"])
+        self.assertEqual(outbox.pending_messages(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+"""병렬 필터링이 직렬 필터링과 같은 결과를 같은 순서로 내는지 (PARALLEL_MIN_ENTRIES 이상)
+
+    python -m unittest discover tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('BOT_STATE_DIR', tempfile.mkdtemp(prefix='bot-state-'))
+
+from benchmark import _synthetic_feeds
+from config import NEWS_AI_KEYWORDS, NEWS_QUANTUM_KEYWORDS
+from parallel_filter import filter_news_feeds, PARALLEL_MIN_ENTRIES
+
+CATEGORIES = [('AI', NEWS_AI_KEYWORDS), ('Quantum', NEWS_QUANTUM_KEYWORDS)]
+
+
+def _flatten(result):
+    return [
+        [(category, item.source, item.title, item.link, item.published, item.keyword_ids, item.enhanced_summary)
+         for category, news_list in by_category.items() for item in news_list]
+        for by_category in result
+    ]
+
+
+class ParallelEquivalenceTest(unittest.TestCase):
+    def test_workers_4_matches_workers_1(self):
+        feeds = _synthetic_feeds(PARALLEL_MIN_ENTRIES + 500, 7)
+
+        serial = _flatten(filter_news_feeds(feeds, CATEGORIES, workers=1))
+        parallel = _flatten(filter_news_feeds(feeds, CATEGORIES, workers=4))
+
+        self.assertEqual(len(parallel), len(feeds))
+        self.assertGreater(sum(map(len, serial)), 0)
+        self.assertEqual(parallel, serial)
+
+
+if __name__ == '__main__':
+    unittest.main()